@@ -0,0 +1,532 @@
+"""Background writer for the ``SystemMonitor`` activity log."""
+
+import bisect
+import gzip
+import json
+import mmap
+import os
+import queue
+import shutil
+import struct
+import threading
+import time
+from datetime import date, datetime
+
+from binary_log import MAGIC, BinaryLogEncoder, is_binary_log, iter_binary_frames, read_dictionary
+from snapshot_delta import DeltaEncoder, expand_deltas, is_delta
+
+try:
+    import zstandard
+except Exception:  # noqa: E722 - broadly handle any import problem
+    zstandard = None
+
+_FLUSH = object()
+_CLOSE = object()
+
+# Width of one index bucket in seconds
+INDEX_BUCKET = 60
+_INDEX_ENTRY = struct.Struct("<qq")
+
+
+def record_time(record) -> float | None:
+    """Return the epoch time of a snapshot's ``timestamp`` field."""
+    try:
+        return datetime.fromisoformat(record["timestamp"]).timestamp()
+    except Exception:
+        return None
+
+
+def _as_epoch(value) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def log_segments(path):
+    """Return the closed, rotated segments of the log at ``path``, oldest first."""
+    path = str(path)
+    root, ext = os.path.splitext(path)
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(root) + "."
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and ext in name[len(prefix):]:
+            found.append(os.path.join(directory, name))
+    return sorted(found)
+
+
+def _segment_end(segment) -> float | None:
+    """Return the time of the last record in ``segment`` from its file name."""
+    stamp = os.path.basename(segment).split(".")[1]
+    try:
+        return datetime.strptime(stamp, "%Y%m%d-%H%M%S-%f").timestamp()
+    except ValueError:
+        return None
+
+
+class LogIndex:
+    """Sidecar index mapping time buckets to byte offsets in the live log.
+
+    The index lives next to the log as ``<log>.idx`` and holds fixed-size
+    ``(bucket_start, offset)`` entries, one for the first record of every
+    ``INDEX_BUCKET``-second bucket. The offset is that of the keyframe the
+    record's delta chain starts from, so reading from it can rebuild full
+    snapshots. It is appended as the writer writes and can always be rebuilt
+    from the log itself.
+    """
+
+    def __init__(self, log_path):
+        self.log_path = str(log_path)
+        self.path = self.log_path + ".idx"
+        self.buckets: list[int] = []
+        self.offsets: list[int] = []
+
+    @property
+    def last_bucket(self):
+        return self.buckets[-1] if self.buckets else None
+
+    def load(self) -> bool:
+        """Read the index from disk; returns ``False`` if it is missing or stale."""
+        self.buckets, self.offsets = [], []
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            log_size = os.path.getsize(self.log_path)
+        except OSError:
+            return False
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        for bucket, offset in _INDEX_ENTRY.iter_unpack(data[:usable]):
+            self.buckets.append(bucket)
+            self.offsets.append(offset)
+        return not self.offsets or self.offsets[-1] < log_size
+
+    def add(self, timestamp, offset, f=None):
+        """Record ``offset`` if ``timestamp`` starts a new bucket."""
+        if timestamp is None:
+            return
+        bucket = int(timestamp // INDEX_BUCKET) * INDEX_BUCKET
+        if self.buckets and bucket <= self.buckets[-1]:
+            return
+        self.buckets.append(bucket)
+        self.offsets.append(offset)
+        if f is not None:
+            f.write(_INDEX_ENTRY.pack(bucket, offset))
+
+    def rebuild(self):
+        """Recreate the index by scanning the log."""
+        self.buckets, self.offsets = [], []
+        with open(self.path, "wb") as out:
+            try:
+                f = open(self.log_path, "rb")
+            except OSError:
+                return
+            with f:
+                keyframe = 0
+                if f.read(len(MAGIC)) == MAGIC:
+                    f.seek(0)
+                    for offset, record in iter_binary_frames(f.read()):
+                        if not is_delta(record):
+                            keyframe = offset
+                        self.add(record_time(record), keyframe, out)
+                    return
+                f.seek(0)
+                offset = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    if record is not None:
+                        if not is_delta(record):
+                            keyframe = offset
+                        self.add(record_time(record), keyframe, out)
+                    offset += len(line)
+
+    def reset(self):
+        """Forget all entries, e.g. after the log was rotated."""
+        self.buckets, self.offsets = [], []
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def offset_for(self, start) -> int:
+        """Return a byte offset at or before the first record at ``start``."""
+        i = bisect.bisect_right(self.buckets, start) - 1
+        return self.offsets[i] if i >= 0 else 0
+
+
+def _select(record, fields):
+    if fields is None:
+        return record
+    return {k: record[k] for k in fields if k in record}
+
+
+def _json_records(lines):
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def _data_records(data):
+    if data.startswith(MAGIC):
+        return expand_deltas(record for _, record in iter_binary_frames(data))
+    return expand_deltas(_json_records(data.splitlines()))
+
+
+def _filter(records, start, end, fields):
+    for record in records:
+        ts = record_time(record)
+        if ts is None or ts < start:
+            continue
+        if ts > end:
+            return
+        yield _select(record, fields)
+
+
+def query_log(path, start, end, fields=None):
+    """Yield snapshots logged between ``start`` and ``end`` (inclusive).
+
+    ``start``/``end`` are ``datetime`` objects or epoch seconds. ``fields``
+    optionally limits each yielded dict to those keys. Rotated segments whose
+    time span cannot overlap the range are skipped; the live log is entered
+    through its index with ``mmap`` so only the matching region is read.
+    JSON-lines and binary logs (see ``binary_log``) are both understood, and
+    delta records (see ``snapshot_delta``) are expanded to full snapshots.
+    """
+    path = str(path)
+    start, end = _as_epoch(start), _as_epoch(end)
+
+    previous_end = None
+    for segment in log_segments(path):
+        seg_end = _segment_end(segment)
+        skip = (seg_end is not None and seg_end < start) or (
+            previous_end is not None and previous_end > end
+        )
+        previous_end = seg_end
+        if skip:
+            continue
+        if segment.endswith(".zst"):
+            if zstandard is None:
+                continue
+            with open(segment, "rb") as raw:
+                data = zstandard.ZstdDecompressor().stream_reader(raw).read()
+        else:
+            opener = gzip.open if segment.endswith(".gz") else open
+            with opener(segment, "rb") as f:
+                data = f.read()
+        yield from _filter(_data_records(data), start, end, fields)
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    index = LogIndex(path)
+    if not index.load():
+        index.rebuild()
+    records = expand_deltas(_live_records(path, index.offset_for(start)))
+    yield from _filter(records, start, end, fields)
+
+
+def _live_records(path, offset):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] == MAGIC:
+                for _, record in iter_binary_frames(mm, offset):
+                    yield record
+            else:
+                mm.seek(offset)
+                yield from _json_records(iter(mm.readline, b""))
+
+
+def _last_logged_time(path) -> float | None:
+    """Return the time of the last record in the live log at ``path``."""
+    index = LogIndex(path)
+    if not index.load():
+        index.rebuild()
+    last = None
+    for record in _live_records(path, index.offsets[-1] if index.offsets else 0):
+        last = record_time(record) or last
+    return last
+
+
+class ActivityLogWriter:
+    """Append snapshots to a JSON-lines log from a background thread.
+
+    ``write`` only puts the record on an in-memory queue, so the monitor tick
+    never waits for the disk. The writer thread flushes a batch once
+    ``batch_size`` records are queued or ``flush_interval`` seconds have
+    passed. ``fsync`` is ``"never"`` (leave it to the OS), ``"batch"`` (after
+    every flush) or ``"interval"`` (at most every ``fsync_interval`` seconds).
+
+    The live file is rotated once it exceeds ``max_bytes`` or a new day
+    starts. Closed segments are renamed with a timestamp and compressed with
+    ``compress`` (``"gzip"``, ``"zstd"`` when ``zstandard`` is installed, or
+    ``None``). Only the newest ``keep_segments`` segments are kept.
+
+    ``format`` is ``"jsonl"`` or ``"binary"``; a binary log keeps one string
+    dictionary per segment (see ``binary_log``). An existing live file in the
+    other format is rotated away before writing.
+
+    Snapshots are stored as a keyframe every ``keyframe_every`` records with
+    field-level deltas in between (see ``snapshot_delta``), so an idle
+    machine only adds a timestamp per tick. Every segment, and every reopen
+    of the live file, starts with a keyframe. ``keyframe_every=0`` writes
+    every snapshot in full.
+    """
+
+    def __init__(
+        self,
+        path="activity_log.jsonl",
+        batch_size=50,
+        flush_interval=5.0,
+        fsync="never",
+        fsync_interval=30.0,
+        max_bytes=10 * 1024 * 1024,
+        rotate_daily=True,
+        compress="gzip",
+        keep_segments=30,
+        max_queue=10000,
+        format="jsonl",
+        keyframe_every=360,
+    ):
+        if format not in ("jsonl", "binary"):
+            raise ValueError(f"unknown log format: {format!r}")
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.keep_segments = keep_segments
+        self.format = format
+        self._encoder = BinaryLogEncoder() if format == "binary" else None
+        self._deltas = DeltaEncoder(keyframe_every)
+        self._keyframe_offset = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._started = time.monotonic()
+        self._last_fsync = time.monotonic()
+        self._file = None
+        self._day = None
+        self._index = LogIndex(self.path)
+        self._index_file = None
+        self._last_record_time = None
+        self.records_written = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.last_flush_ms = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, record) -> bool:
+        """Queue ``record`` for writing; returns ``False`` if it was dropped."""
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=5.0) -> bool:
+        """Write everything queued so far and wait until it is on disk."""
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flush pending records and stop the writer thread."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_CLOSE, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+
+    def metrics(self) -> dict:
+        """Return queue depth, throughput and rotation counters."""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "bytes_per_sec": self.bytes_written / elapsed,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _CLOSE:
+                self._write_batch(batch)
+                self._close_file()
+                return
+            if isinstance(item, tuple) and item and item[0] is _FLUSH:
+                self._write_batch(batch)
+                batch = []
+                item[1].set()
+                deadline = time.monotonic() + self.flush_interval
+                continue
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write_batch(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _encode(self, batch):
+        stored = [self._deltas.encode(r) for r in batch]
+        if self._encoder is not None:
+            encoded = [self._encoder.encode(r) for r in stored]
+        else:
+            encoded = [(json.dumps(r) + "\n").encode("utf-8") for r in stored]
+        return stored, encoded
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            self._open()
+            stored, encoded = self._encode(batch)
+            payload = b"".join(encoded)
+            rotated = self._maybe_rotate(len(payload))
+            f = self._open()
+            if rotated:
+                # The new segment starts with a keyframe and an empty dictionary
+                stored, encoded = self._encode(batch)
+                payload = b"".join(encoded)
+            offset = f.tell()
+            f.write(payload)
+            f.flush()
+            for record, line in zip(stored, encoded):
+                if not is_delta(record):
+                    self._keyframe_offset = offset
+                ts = record_time(record)
+                self._index.add(ts, self._keyframe_offset, self._index_file)
+                if ts is not None:
+                    self._last_record_time = ts
+                offset += len(line)
+            self._index_file.flush()
+            if self.fsync == "batch" or (
+                self.fsync == "interval"
+                and time.monotonic() - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(f.fileno())
+                self._last_fsync = time.monotonic()
+            self.records_written += len(batch)
+            self.bytes_written += len(payload)
+        except Exception:
+            self.dropped += len(batch)
+            # Reopen so the dictionary and delta base match what is on disk
+            self._close_file()
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path):
+                if is_binary_log(self.path) != (self._encoder is not None):
+                    self._rotate()
+                elif self._encoder is not None:
+                    strings, size = read_dictionary(self.path)
+                    os.truncate(self.path, size)
+                    self._encoder.load(strings)
+            self._file = open(self.path, "ab")
+            self._deltas.reset()
+            if self._encoder is not None and self._file.tell() == 0:
+                self._file.write(MAGIC)
+                self._encoder.reset()
+            try:
+                self._day = date.fromtimestamp(os.path.getmtime(self.path))
+            except OSError:
+                self._day = date.today()
+            if self._file.tell() <= len(MAGIC):
+                self._day = date.today()
+            if not self._index.load():
+                self._index.rebuild()
+            self._index_file = open(self._index.path, "ab")
+        return self._file
+
+    def _close_file(self):
+        for f in (self._file, self._index_file):
+            if f is not None:
+                try:
+                    f.close()
+                except Exception:
+                    pass
+        self._file = None
+        self._index_file = None
+
+    def _maybe_rotate(self, incoming) -> bool:
+        self._open()
+        size = self._file.tell()
+        if size <= (len(MAGIC) if self._encoder is not None else 0):
+            return False
+        new_day = self.rotate_daily and self._day != date.today()
+        if not new_day and size + incoming <= self.max_bytes:
+            return False
+        self._rotate()
+        return True
+
+    def _rotate(self):
+        self._close_file()
+        root, ext = os.path.splitext(self.path)
+        # Segments are named after their last record so queries can skip them
+        last = self._last_record_time
+        if last is None:
+            last = _last_logged_time(self.path) or time.time()
+        stamp = datetime.fromtimestamp(last).strftime("%Y%m%d-%H%M%S-%f")
+        segment = f"{root}.{stamp}{ext}"
+        n = 1
+        while any(os.path.exists(segment + sfx) for sfx in ("", ".gz", ".zst")):
+            segment = f"{root}.{stamp}-{n}{ext}"
+            n += 1
+        os.replace(self.path, segment)
+        self._index.reset()
+        self.rotations += 1
+        self._compress(segment)
+        self._prune_segments()
+
+    def _compress(self, segment):
+        try:
+            if self.compress == "zstd" and zstandard is not None:
+                target = segment + ".zst"
+                with open(segment, "rb") as src, open(target, "wb") as dst:
+                    zstandard.ZstdCompressor().copy_stream(src, dst)
+            elif self.compress in ("gzip", "zstd"):
+                target = segment + ".gz"
+                with open(segment, "rb") as src, gzip.open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                return
+            os.remove(segment)
+        except Exception:
+            pass
+
+    def segments(self):
+        """Return closed log segments, oldest first."""
+        return log_segments(self.path)
+
+    def _prune_segments(self):
+        if not self.keep_segments:
+            return
+        for old in self.segments()[:-self.keep_segments]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
@@ -0,0 +1,219 @@
+"""Per-second activity counters kept for hours, days and months in constant memory."""
+
+import threading
+import time
+from array import array
+
+from event_store import EventKind
+from input_ring import MouseMoves
+
+try:
+    import numpy as np
+except Exception:  # noqa: E722 - broadly handle any import problem
+    np = None
+
+CHANNELS = ("keys", "mouse", "clipboard", "files", "focus")
+
+_KIND_CHANNELS = {
+    EventKind.KEY: "keys",
+    EventKind.MOUSE: "mouse",
+    EventKind.MOUSE_MOVE: "mouse",
+    EventKind.CLIPBOARD: "clipboard",
+    EventKind.FILE_MODIFIED: "files",
+    EventKind.FILE_CREATED: "files",
+    EventKind.FILES_CHANGED: "files",
+}
+
+# (seconds per bucket, buckets): an hour of seconds, a day of minutes and
+# 90 days of hours
+DEFAULT_TIERS = ((1, 3600), (60, 1440), (3600, 90 * 24))
+
+
+class _Tier:
+    """Ring of ``size`` buckets of ``resolution`` seconds, one counter per channel.
+
+    Each row remembers the absolute bucket number it holds, so a row left
+    over from an earlier lap of the ring reads as zero and is cleared when
+    reused. Counters live in flat ``array`` buffers: cheap to update one
+    element at a time and viewable as NumPy arrays without copying.
+    """
+
+    def __init__(self, resolution, size, channels):
+        self.resolution = resolution
+        self.size = size
+        self.channels = channels
+        self.stamps = array("q", [-1]) * size
+        self.counts = array("q", [0]) * (size * channels)
+
+    @property
+    def span(self):
+        return self.resolution * self.size
+
+    def add(self, bucket, channel, count):
+        row = bucket % self.size
+        held = self.stamps[row]
+        if held != bucket:
+            if held > bucket:
+                return  # older than the ring reaches back
+            self.stamps[row] = bucket
+            base = row * self.channels
+            for c in range(self.channels):
+                self.counts[base + c] = 0
+        self.counts[row * self.channels + channel] += count
+
+    def column(self, channels, first, last):
+        """Return summed counts of ``channels`` for buckets ``first..last``."""
+        if np is not None:
+            ids = np.arange(first, last + 1, dtype=np.int64)
+            rows = ids % self.size
+            stamps = np.frombuffer(self.stamps, dtype=np.int64)
+            counts = np.frombuffer(self.counts, dtype=np.int64).reshape(self.size, self.channels)
+            values = counts[rows][:, list(channels)].sum(axis=1)
+            return np.where(stamps[rows] == ids, values, 0)
+        out = []
+        for bucket in range(first, last + 1):
+            row = bucket % self.size
+            if self.stamps[row] != bucket:
+                out.append(0)
+            else:
+                base = row * self.channels
+                out.append(sum(self.counts[base + c] for c in channels))
+        return out
+
+
+class ActivityTimeline:
+    """Rolling counts of keys, mouse, clipboard, file and focus activity.
+
+    Every observation increments one counter in each tier (per second, per
+    minute and per hour by default), which is constant work however long
+    the monitor runs; memory is fixed by the tier sizes. Queries pick the
+    finest tier that still reaches back to ``start`` and operate on whole
+    bucket ranges, vectorized with NumPy when it is installed.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, channels=CHANNELS):
+        self.channels = tuple(channels)
+        self._index = {name: i for i, name in enumerate(self.channels)}
+        self.tiers = [_Tier(res, size, len(self.channels)) for res, size in tiers]
+        self._last_focus = None
+        self._lock = threading.Lock()
+        # Total of all counts added; ``wait_for_activity`` waits for it to move
+        self.activity = 0
+        self._changed = threading.Condition(self._lock)
+
+    def add(self, channel, timestamp=None, count=1):
+        """Count ``count`` occurrences of ``channel`` at ``timestamp``."""
+        if timestamp is None:
+            timestamp = time.time()
+        index = self._index[channel]
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(int(timestamp // tier.resolution), index, count)
+            self.activity += count
+            self._changed.notify_all()
+
+    def wait_for_activity(self, seen, timeout=None) -> int:
+        """Wait until ``activity`` differs from ``seen`` or ``timeout`` passes; return it."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.activity != seen, timeout)
+            return self.activity
+
+    def observe(self, kind, payload, timestamp=None):
+        """Count a monitor event; ``ACTIVE_WINDOW`` counts only when it changes."""
+        if kind == EventKind.ACTIVE_WINDOW:
+            previous, self._last_focus = self._last_focus, payload
+            if previous is not None and payload != previous:
+                self.add("focus", timestamp)
+            return
+        channel = _KIND_CHANNELS.get(kind)
+        if channel is None:
+            return
+        count = 1
+        if isinstance(payload, MouseMoves):
+            count = payload.count
+        elif kind == EventKind.FILES_CHANGED:
+            # "12 files changed under src/"
+            head = str(payload).split(" ", 1)[0]
+            count = int(head) if head.isdigit() else 1
+        self.add(channel, timestamp, count)
+
+    def _tier_for(self, start, end, resolution):
+        if resolution is not None:
+            for tier in self.tiers:
+                if tier.resolution == resolution:
+                    return tier
+            raise ValueError(f"no tier with {resolution}s buckets")
+        for tier in self.tiers:
+            if end - start <= tier.span and time.time() - start <= tier.span:
+                return tier
+        return self.tiers[-1]
+
+    def _channels(self, channels):
+        if isinstance(channels, str):
+            channels = (channels,)
+        return [self._index[c] for c in (channels or self.channels)]
+
+    def series(self, channels, start, end=None, resolution=None):
+        """Return ``(bucket_starts, counts)`` for ``channels`` between ``start`` and ``end``.
+
+        ``channels`` is a name or several names whose counts are added up.
+        ``resolution`` (1, 60 or 3600 by default) picks a tier explicitly.
+        The results are NumPy arrays when NumPy is installed, else lists.
+        """
+        if end is None:
+            end = time.time()
+        tier = self._tier_for(start, end, resolution)
+        first = int(start // tier.resolution)
+        last = int(end // tier.resolution)
+        with self._lock:
+            counts = tier.column(self._channels(channels), first, last)
+        if np is not None:
+            starts = np.arange(first, last + 1, dtype=np.int64) * tier.resolution
+        else:
+            starts = [b * tier.resolution for b in range(first, last + 1)]
+        return starts, counts
+
+    def total(self, channels, start, end=None) -> int:
+        """Return the number of events in ``channels`` between ``start`` and ``end``."""
+        counts = self.series(channels, start, end)[1]
+        return int(counts.sum() if np is not None else sum(counts))
+
+    def rate(self, channels, start, end=None, per=60.0) -> float:
+        """Return events per ``per`` seconds, e.g. keys per minute over the last hour."""
+        if end is None:
+            end = time.time()
+        return self.total(channels, start, end) * per / max(end - start, 1e-9)
+
+    def idle_periods(self, start, end=None, min_idle=300.0, channels=("keys", "mouse")):
+        """Return ``(idle_start, idle_end)`` runs of at least ``min_idle`` seconds."""
+        if end is None:
+            end = time.time()
+        resolution = self._tier_for(start, end, None).resolution
+        starts, counts = self.series(channels, start, end, resolution)
+        if not len(counts):
+            return []
+        if np is not None:
+            idle = np.concatenate(([False], np.asarray(counts) == 0, [False]))
+            edges = np.flatnonzero(np.diff(idle.astype(np.int8)))
+            runs = zip(edges[::2], edges[1::2])
+        else:
+            runs, run_start = [], None
+            for i, c in enumerate(list(counts) + [1]):
+                if c == 0 and run_start is None:
+                    run_start = i
+                elif c != 0 and run_start is not None:
+                    runs.append((run_start, i))
+                    run_start = None
+        periods = []
+        for a, b in runs:
+            begin = max(float(starts[a]), start)
+            finish = min(float(starts[b - 1] + resolution), end)
+            if finish - begin >= min_idle:
+                periods.append((begin, finish))
+        return periods
+
+    def nbytes(self) -> int:
+        """Return the memory used by the counters, which never grows."""
+        return sum(
+            t.stamps.itemsize * len(t.stamps) + t.counts.itemsize * len(t.counts) for t in self.tiers
+        )
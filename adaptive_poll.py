@@ -0,0 +1,66 @@
+"""Pace periodic snapshots by how active the user is."""
+
+import time
+
+
+class AdaptivePoller:
+    """Wait between snapshots: briefly while the user is active, longer when idle.
+
+    Activity is read from an ``ActivityTimeline`` (keys, mouse, clipboard,
+    file changes and focus switches). If anything happened since the last
+    poll the next one follows after ``min_interval`` seconds. Otherwise the
+    wait starts at ``idle_interval`` and is multiplied by ``backoff`` after
+    each quiet poll, up to ``max_interval``. A long wait ends early on the
+    next activity, so polling snaps back as soon as the user returns.
+    Without a timeline every wait is ``idle_interval``.
+    """
+
+    def __init__(self, timeline=None, min_interval=2.0, idle_interval=10.0, max_interval=300.0, backoff=2.0):
+        self.timeline = timeline
+        self.min_interval = min(min_interval, idle_interval)
+        self.idle_interval = idle_interval
+        self.max_interval = max(max_interval, idle_interval)
+        self.backoff = backoff
+        self.interval = self.min_interval
+        self._seen = timeline.activity if timeline is not None else 0
+        self.polls = 0
+        self.woken = 0
+
+    def next_interval(self) -> float:
+        """Return the wait before the next poll given the activity since the last one."""
+        self.polls += 1
+        if self.timeline is None:
+            return self.idle_interval
+        seen = self.timeline.activity
+        if seen != self._seen:
+            self.interval = self.min_interval
+        elif self.interval < self.idle_interval:
+            self.interval = self.idle_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        self._seen = seen
+        return self.interval
+
+    def wait(self, stop) -> bool:
+        """Sleep until the next poll is due; return ``False`` once ``stop`` is set.
+
+        ``stop`` is a ``threading.Event`` and is checked at least once a
+        second. Activity cuts a wait short, but never below ``min_interval``.
+        """
+        interval = self.next_interval()
+        deadline = time.monotonic() + interval
+        if stop.wait(min(self.min_interval, interval)):
+            return False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return not stop.is_set()
+            if self.timeline is None:
+                if stop.wait(min(remaining, 1.0)):
+                    return False
+                continue
+            if self.timeline.wait_for_activity(self._seen, min(remaining, 1.0)) != self._seen:
+                self.woken += 1
+                return not stop.is_set()
+            if stop.is_set():
+                return False
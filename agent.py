@@ -1,9 +1,9 @@
 import threading
-import time
 import json
 import sys
 import traceback
 
+from adaptive_poll import AdaptivePoller
 from system_monitor import SystemMonitor
 from llm_client import OllamaClient
 from error_handler import ErrorReporter
@@ -17,6 +17,8 @@ class ClippyAgent:
         poll_interval: int = 10,
         error_reporter: ErrorReporter | None = None,
         notify_interval: int | None = None,
+        min_poll_interval: float = 2.0,
+        max_poll_interval: float = 300.0,
     ) -> None:
         self.window = window
         # Monitor the current directory for file changes as an example
@@ -27,7 +29,13 @@ class ClippyAgent:
                 "Offer advice grudgingly in one or two sentences."
             )
         )
+        # Snapshots come every ``min_poll_interval`` seconds while the user
+        # is active and back off from ``poll_interval`` up to
+        # ``max_poll_interval`` while idle
         self.poll_interval = poll_interval
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.poller = None
         self.notify_interval = notify_interval
         self._last_snapshot: dict | None = None
         self._last_message_time = 0.0
@@ -53,6 +61,12 @@ class ClippyAgent:
         self.thread.join()
 
     def _loop(self):
+        self.poller = AdaptivePoller(
+            getattr(self.monitor, "timeline", None),
+            min_interval=self.min_poll_interval,
+            idle_interval=self.poll_interval,
+            max_interval=self.max_poll_interval,
+        )
         while not self._stop.is_set():
             try:
                 snapshot = self.monitor.capture_snapshot()
@@ -68,10 +82,7 @@ class ClippyAgent:
                 self._last_snapshot = snapshot
             except Exception:  # noqa: E722 - broad catch to keep thread alive
                 self._report_exception()
-            for _ in range(self.poll_interval):
-                if self._stop.is_set():
-                    break
-                time.sleep(1)
+            self.poller.wait(self._stop)
 
     def handle_text(self, text):
         """Process text input by querying the LLM and showing the reply."""
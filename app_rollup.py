@@ -0,0 +1,98 @@
+"""Group sampled processes into applications and rank them."""
+
+import heapq
+import os
+
+
+class AppUsage:
+    """Combined CPU and memory of the processes that make up one application."""
+
+    __slots__ = ("name", "exe", "count", "cpu_percent", "rss")
+
+    def __init__(self, name, exe=""):
+        self.name = name
+        self.exe = exe
+        self.count = 0
+        self.cpu_percent = 0.0
+        self.rss = 0
+
+    def add(self, info):
+        self.count += 1
+        self.cpu_percent += info.cpu_percent or 0.0
+        self.rss += info.rss or 0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "exe": self.exe,
+            "processes": self.count,
+            "cpu_percent": round(self.cpu_percent, 1),
+            "rss": self.rss,
+        }
+
+    def __repr__(self):
+        return f"AppUsage({self.name!r}, x{self.count}, cpu={self.cpu_percent:.1f}, rss={self.rss})"
+
+
+def _stem(name):
+    stem = name.lower()
+    return stem[:-4] if stem.endswith(".exe") else stem
+
+
+def _belongs_to(child, parent):
+    """Return ``True`` if ``child`` is a helper process of ``parent``'s app."""
+    if child.exe and child.exe == parent.exe:
+        return True
+    # Helpers named after their app, e.g. ``chrome_crashpad_handler`` or
+    # ``Code Helper (Renderer)``; short names such as ``sh`` are too generic
+    parent_stem = _stem(parent.name)
+    return len(parent_stem) >= 3 and _stem(child.name).startswith(parent_stem)
+
+
+def group_processes(processes, ignored=()) -> list[AppUsage]:
+    """Return one ``AppUsage`` per application, in order of first appearance.
+
+    A process is attributed to its parent's application when it runs the
+    same executable or is named after the parent, following the parent
+    chain upwards. The remaining roots are grouped by executable path (or
+    by name when the path is unknown), so the 40 processes of a browser
+    become one entry however they were launched. Processes whose name is
+    in ``ignored`` are skipped.
+    """
+    by_pid = {p.pid: p for p in processes if p.name not in ignored}
+    roots = {}
+
+    def root_of(info):
+        chain = []
+        current = info
+        while current.pid not in roots:
+            chain.append(current)
+            parent = by_pid.get(current.ppid)
+            if parent is None or parent is current or parent in chain or not _belongs_to(current, parent):
+                roots[current.pid] = current
+                break
+            current = parent
+        root = roots[current.pid]
+        for p in chain:
+            roots[p.pid] = root
+        return root
+
+    apps = {}
+    for info in by_pid.values():
+        root = root_of(info)
+        key = root.exe or root.name
+        app = apps.get(key)
+        if app is None:
+            app = apps[key] = AppUsage(root.name or os.path.basename(root.exe), root.exe)
+        app.add(info)
+    return list(apps.values())
+
+
+def top_apps(apps, k=5, by="cpu") -> list[AppUsage]:
+    """Return the ``k`` largest ``apps`` by ``"cpu"`` or ``"memory"`` without a full sort.
+
+    CPU ranks break ties by memory and vice versa.
+    """
+    if by == "memory":
+        return heapq.nlargest(k, apps, key=lambda a: (a.rss, a.cpu_percent))
+    return heapq.nlargest(k, apps, key=lambda a: (a.cpu_percent, a.rss))
@@ -0,0 +1,117 @@
+"""Measure hook-thread cost and buffer growth for synthetic input.
+
+Usage::
+
+    python benchmarks/bench_input_hooks.py --rate 2000 --seconds 3
+
+Synthetic mouse moves (with a key press every 20 events) are fed to the
+hooks at ``--rate`` events per second. The old path formats and stores every
+event on the hook thread; the new path only pushes a tuple to the input ring
+and a consumer coalesces moves once per second.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_store import EventKind, EventStore  # noqa: E402
+from input_ring import InputRing, coalesce_input  # noqa: E402
+
+
+class MoveEvent:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class KeyEvent:
+    name = "a"
+
+
+def old_hooks(store):
+    # The previous ``SystemMonitor._on_mouse``
+    def on_mouse(event):
+        event_type = getattr(event, "event_type", None) or event.__class__.__name__
+        if event_type == "move":
+            store.append(EventKind.MOUSE_MOVE, event_type)
+            return
+        payload = event_type
+        if hasattr(event, "delta"):
+            payload = f"{event_type} delta={event.delta}"
+        store.append(EventKind.MOUSE, payload)
+
+    def on_key(event):
+        store.append(EventKind.KEY, event.name)
+
+    return on_mouse, on_key, lambda: None
+
+
+def new_hooks(store):
+    ring = InputRing()
+    lock = threading.Lock()
+
+    def drain():
+        with lock:
+            for ts, kind, payload in coalesce_input(ring.drain(), 1.0):
+                store.append(kind, payload, timestamp=ts)
+
+    def on_mouse(event):
+        ring.push((EventKind.MOUSE, time.time(), event))
+
+    def on_key(event):
+        ring.push((EventKind.KEY, time.time(), event))
+
+    return on_mouse, on_key, drain
+
+
+def run(label, factory, rate, seconds):
+    store = EventStore()
+    on_mouse, on_key, drain = factory(store)
+    stop = threading.Event()
+
+    def consumer():
+        while not stop.wait(1.0):
+            drain()
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    hook_time = 0.0
+    worst = 0.0
+    total = int(rate * seconds)
+    key = KeyEvent()
+    start = time.perf_counter()
+    for i in range(total):
+        # Pace the synthetic input at ``rate`` events per second
+        target = start + i / rate
+        while time.perf_counter() < target:
+            pass
+        t0 = time.perf_counter()
+        if i % 20 == 0:
+            on_key(key)
+        else:
+            on_mouse(MoveEvent(i % 1920, i % 1080))
+        spent = time.perf_counter() - t0
+        hook_time += spent
+        worst = max(worst, spent)
+    stop.set()
+    thread.join()
+    drain()
+    print(f"{label}: {total} events, hook avg {hook_time / total * 1e6:6.2f} us, "
+          f"worst {worst * 1e6:7.1f} us, {len(store)} stored events")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    run("format on hook   ", old_hooks, args.rate, args.seconds)
+    run("ring + coalescing", new_hooks, args.rate, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
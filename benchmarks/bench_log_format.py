@@ -0,0 +1,75 @@
+"""Compare the size and parse speed of JSON-lines and binary activity logs.
+
+Usage::
+
+    python benchmarks/bench_log_format.py --records 100000
+
+Synthetic snapshots shaped like ``SystemMonitor.to_json()`` are written as
+``.jsonl``, converted with ``binary_log.convert_jsonl`` and both files are
+read back in full.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_log import convert_jsonl, iter_binary_log  # noqa: E402
+
+
+def write_jsonl(path, records, base):
+    apps = ["editor", "browser", "terminal", "chat"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            app = apps[(i // 30) % len(apps)]
+            f.write(json.dumps({
+                "timestamp": datetime.fromtimestamp(base + i * 10).isoformat(),
+                "active_window": {"title": f"{app} - Document {(i // 30) % 20}", "app": app},
+                "clipboard": ["Copied text: 'some copied text'"] if i % 7 == 0 else [],
+                "input_events": ["Pressed key: a", "Mouse move"] * (i % 5),
+                "ocr_snippets": [],
+                "running_apps": ["editor", "browser", "terminal", "chat", "python3"],
+                "open_windows": [f"{a} - Document {n}" for a in apps for n in range(3)],
+            }))
+            f.write("\n")
+
+
+def read_jsonl(path):
+    with open(path, "rb") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = os.path.join(tmp, "activity_log.jsonl")
+        binary = os.path.join(tmp, "activity_log.alog")
+        write_jsonl(jsonl, args.records, 1_700_000_000)
+
+        start = time.perf_counter()
+        convert_jsonl(jsonl, binary)
+        print(f"convert: {time.perf_counter() - start:.2f} s")
+
+        for label, path, reader in (
+            ("jsonl ", jsonl, read_jsonl),
+            ("binary", binary, iter_binary_log),
+        ):
+            size = os.path.getsize(path)
+            start = time.perf_counter()
+            count = sum(1 for _ in reader(path))
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {size / 1e6:8.2f} MB, {size / count:7.1f} B/record, "
+                  f"parse {count / elapsed:10.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
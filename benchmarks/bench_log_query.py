@@ -0,0 +1,82 @@
+"""Compare indexed range queries with full scans of ``activity_log.jsonl``.
+
+Usage::
+
+    python benchmarks/bench_log_query.py --records 2000000
+
+A synthetic log with one snapshot every second is written to a temporary
+directory, indexed, and then a one-hour range in the middle of it is read
+with ``query_log`` and with a plain line-by-line scan.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activity_log import LogIndex, query_log, record_time  # noqa: E402
+
+
+def write_log(path, records, base):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            f.write(json.dumps({
+                "timestamp": datetime.fromtimestamp(base + i).isoformat(),
+                "active_window": {"title": f"Document {i % 50}", "app": "editor"},
+                "clipboard": [],
+                "input_events": ["Pressed key: a"] * (i % 5),
+                "ocr_snippets": [],
+                "open_windows": ["Document", "Terminal", "Browser"],
+            }))
+            f.write("\n")
+
+
+def full_scan(path, start, end):
+    with open(path, "rb") as f:
+        for line in f:
+            record = json.loads(line)
+            ts = record_time(record)
+            if start <= ts <= end:
+                yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    base = 1_700_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "activity_log.jsonl")
+        start = time.perf_counter()
+        write_log(path, args.records, base)
+        print(f"wrote {args.records} records ({os.path.getsize(path) / 1e6:.1f} MB) "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        LogIndex(path).rebuild()
+        print(f"index rebuild: {time.perf_counter() - start:.2f} s, "
+              f"{os.path.getsize(path + '.idx')} bytes")
+
+        q_start = base + args.records // 2
+        q_end = q_start + 3600
+
+        start = time.perf_counter()
+        indexed = sum(1 for _ in query_log(path, q_start, q_end))
+        indexed_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = sum(1 for _ in full_scan(path, q_start, q_end))
+        scan_s = time.perf_counter() - start
+
+        print(f"1 hour range, indexed query: {indexed_s * 1000:10.1f} ms ({indexed} records)")
+        print(f"1 hour range, full scan:     {scan_s * 1000:10.1f} ms ({scanned} records)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare per-image OCR latency of the available OCR engines.
+
+Usage::
+
+    python benchmarks/bench_ocr_engines.py --repeat 5 [screenshot.png ...]
+
+Without image arguments, fixture screenshots are rendered with Pillow: a
+full-HD desktop-like frame and a small window-sized region, since the model
+load dominates for small regions.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from screen_ocr import PytesseractEngine, TesserocrEngine  # noqa: E402
+
+
+def fixture_images():
+    lines = [
+        "def capture_snapshot(self, sort_by=None):",
+        "    frame = self.current_frame()",
+        "Inbox (3) - Mail",
+        "Build succeeded in 4.2s",
+    ]
+    images = {}
+    for name, size in (("region 640x200", (640, 200)), ("desktop 1920x1080", (1920, 1080))):
+        img = Image.new("RGB", size, "white")
+        draw = ImageDraw.Draw(img)
+        y = 10
+        while y < size[1] - 20:
+            for line in lines:
+                draw.text((10, y), line, fill="black")
+                y += 20
+        images[name] = img
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="*", help="screenshots to OCR")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.images:
+        images = {path: Image.open(path) for path in args.images}
+    else:
+        images = fixture_images()
+
+    for engine_cls in (PytesseractEngine, TesserocrEngine):
+        try:
+            engine = engine_cls()
+        except Exception as exc:
+            print(f"{engine_cls.name}: unavailable ({exc})")
+            continue
+        try:
+            for label, img in images.items():
+                durations = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    engine.image_to_string(img)
+                    durations.append(time.perf_counter() - start)
+                print(
+                    f"{engine.name:12} {label:20} "
+                    f"best {min(durations) * 1000:8.1f} ms  "
+                    f"mean {sum(durations) / len(durations) * 1000:8.1f} ms"
+                )
+        finally:
+            engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compare the ``/proc`` and ``psutil`` backends of ``ProcessSampler``.
+
+Usage::
+
+    python benchmarks/bench_proc_sampler.py --spawn 2000 --rounds 20
+
+``--spawn`` starts that many sleeping child processes first so the host has
+thousands of processes to sample; they are killed when the run ends.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_sampler import ProcessSampler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spawn", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    children = [subprocess.Popen(["sleep", "600"]) for _ in range(args.spawn)]
+    try:
+        results = {}
+        for backend in ("psutil", "proc"):
+            sampler = ProcessSampler(backend=backend)
+            count = len(sampler.refresh())
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                sampler.refresh()
+            results[backend] = (time.perf_counter() - start) / args.rounds
+            print(f"{backend:7s}: {results[backend] * 1000:8.2f} ms per pass ({count} processes)")
+        print(f"speed-up: {results['psutil'] / results['proc']:.1f}x")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
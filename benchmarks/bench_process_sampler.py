@@ -0,0 +1,104 @@
+"""Compare process-table cost of one ``!status`` before and after ``ProcessSampler``.
+
+Before the shared sampler, a Discord ``!status`` ran three independent
+``psutil.process_iter`` passes: ``capture_snapshot``, ``summarize`` and
+``scan_processes``. Afterwards all three read the same sample.
+
+Usage::
+
+    python benchmarks/bench_process_sampler.py --spawn 1000 --ticks 5
+
+``--spawn`` starts that many idle child processes first so the process table
+is large enough to be representative of a busy workstation.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil  # noqa: E402
+
+from process_sampler import ProcessSampler  # noqa: E402
+
+
+def _snapshot_pass():
+    rows = []
+    for proc in psutil.process_iter(["name"]):
+        try:
+            rows.append((proc.info.get("name") or "", proc.cpu_percent(interval=None)))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rows
+
+
+def _summarize_pass():
+    rows = []
+    for proc in psutil.process_iter(["name"]):
+        try:
+            rows.append((proc.info.get("name") or "", proc.cpu_percent(interval=None), proc.memory_info().rss))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rows
+
+
+def _scan_pass():
+    return [proc.info for proc in psutil.process_iter(["pid", "name", "exe"])]
+
+
+def separate_passes():
+    """One ``!status`` as it used to run: three full process-table passes."""
+    _snapshot_pass()
+    _summarize_pass()
+    _scan_pass()
+
+
+def shared_sample(sampler):
+    """One ``!status`` with a shared sampler: one pass, three readers."""
+    sampler.sample(max_age=0)
+    sampler.sample()
+    sampler.sample()
+
+
+def time_ticks(fn, ticks):
+    durations = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spawn", type=int, default=0, help="idle child processes to start")
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    children = [
+        subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+        for _ in range(args.spawn)
+    ]
+    try:
+        print(f"processes: {len(psutil.pids())}")
+        separate_passes()  # let psutil warm its own handle cache
+        before = time_ticks(separate_passes, args.ticks)
+
+        sampler = ProcessSampler(max_age=1.0)
+        sampler.refresh()  # warm the handle and exe cache
+        after = time_ticks(lambda: shared_sample(sampler), args.ticks)
+
+        print(f"3 separate passes per status: {min(before) * 1000:8.1f} ms (best of {args.ticks})")
+        print(f"1 shared sample per status:   {min(after) * 1000:8.1f} ms (best of {args.ticks})")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare the full keyword scan with the incremental ``ProcessScanner``.
+
+Usage::
+
+    python benchmarks/bench_process_scan.py --processes 600 --keywords 300
+
+Both scanners see the same synthetic process list on every round; one new
+process is launched every ten rounds.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_sampler import ProcessInfo  # noqa: E402
+from process_scan import DEFAULT_KEYWORDS, ProcessScanner, SignatureMatcher  # noqa: E402
+
+
+def full_scan(processes, keywords):
+    # The previous ``SystemMonitor.scan_processes``
+    suspicious = []
+    for info in processes:
+        name = info.name.lower()
+        exe = info.exe.lower()
+        if any(k in name or k in exe for k in keywords):
+            suspicious.append({"pid": info.pid, "name": info.name, "exe": info.exe})
+    return suspicious
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=600)
+    parser.add_argument("--keywords", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    keywords = list(DEFAULT_KEYWORDS) + [f"sig{i:04d}x" for i in range(args.keywords)]
+    processes = [
+        ProcessInfo(i, f"proc{i}", f"/usr/lib/app{i % 40}/proc{i}") for i in range(args.processes)
+    ]
+
+    results = {}
+    for label in ("full", "incremental"):
+        procs = list(processes)
+        scanner = ProcessScanner(SignatureMatcher(keywords))
+        start = time.perf_counter()
+        for r in range(args.rounds):
+            if r % 10 == 0:
+                procs.append(ProcessInfo(100_000 + r, f"new{r}", f"/tmp/new{r}"))
+            if label == "full":
+                full_scan(procs, keywords)
+            else:
+                scanner.scan(procs)
+        results[label] = (time.perf_counter() - start) / args.rounds
+        print(f"{label:12s}: {results[label] * 1000:8.3f} ms per scan")
+    print(f"speed-up: {results['full'] / results['incremental']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Compact binary encoding for activity-log snapshots.
+
+A binary log starts with ``MAGIC`` and is followed by length-prefixed frames.
+A ``S`` frame adds a string to the segment's dictionary and a ``R`` frame
+holds one snapshot. Short strings (window titles, app names, dict keys) are
+written once per segment and referenced by id afterwards; long strings such
+as clipboard text are stored inline. Reading a segment from the start yields
+the same dicts that were written.
+"""
+
+import json
+import struct
+from datetime import datetime, timedelta
+
+from snapshot_delta import expand_deltas
+
+MAGIC = b"ALOG\x01"
+
+# Strings up to this length are added to the dictionary
+INTERN_MAX = 256
+
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _REF, _LIST, _DICT, _TIME = range(10)
+_DOUBLE = struct.Struct("<d")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf, pos):
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(n):
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n):
+    return n >> 1 if not n & 1 else -(n >> 1) - 1
+
+
+def _naive_micros(text):
+    """Return microseconds for a naive ISO timestamp that round-trips exactly."""
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if dt.tzinfo is not None or dt.isoformat() != text:
+        return None
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class BinaryLogEncoder:
+    """Encode snapshots into frames, tracking one segment's dictionary."""
+
+    def __init__(self):
+        self._ids = {}
+
+    def load(self, strings):
+        """Continue a segment whose dictionary already holds ``strings``."""
+        self._ids = {s: i for i, s in enumerate(strings)}
+
+    def reset(self):
+        """Start a new segment with an empty dictionary."""
+        self._ids = {}
+
+    def encode(self, record) -> bytes:
+        """Return the frames for ``record``, including any new dictionary entries."""
+        out = bytearray()
+        body = bytearray([ord("R")])
+        self._value(record, body, out, key=None)
+        _write_varint(out, len(body))
+        out += body
+        return bytes(out)
+
+    def _ref(self, text, out):
+        ref = self._ids.get(text)
+        if ref is None:
+            ref = self._ids[text] = len(self._ids)
+            data = b"S" + text.encode("utf-8")
+            _write_varint(out, len(data))
+            out += data
+        return ref
+
+    def _value(self, value, body, out, key):
+        if value is None:
+            body.append(_NONE)
+        elif value is True:
+            body.append(_TRUE)
+        elif value is False:
+            body.append(_FALSE)
+        elif isinstance(value, int):
+            body.append(_INT)
+            _write_varint(body, _zigzag(value))
+        elif isinstance(value, float):
+            body.append(_FLOAT)
+            body += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            micros = _naive_micros(value) if key == "timestamp" else None
+            if micros is not None:
+                body.append(_TIME)
+                _write_varint(body, _zigzag(micros))
+            elif len(value) <= INTERN_MAX:
+                body.append(_REF)
+                _write_varint(body, self._ref(value, out))
+            else:
+                data = value.encode("utf-8")
+                body.append(_STR)
+                _write_varint(body, len(data))
+                body += data
+        elif isinstance(value, (list, tuple)):
+            body.append(_LIST)
+            _write_varint(body, len(value))
+            for item in value:
+                self._value(item, body, out, key=None)
+        elif isinstance(value, dict):
+            body.append(_DICT)
+            _write_varint(body, len(value))
+            for k, v in value.items():
+                _write_varint(body, self._ref(str(k), out))
+                self._value(v, body, out, key=k)
+        else:
+            self._value(str(value), body, out, key=None)
+
+
+def _decode(buf, pos, strings):
+    tag = buf[pos]
+    pos += 1
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        n, pos = _read_varint(buf, pos)
+        return _unzigzag(n), pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(buf, pos)[0], pos + 8
+    if tag == _REF:
+        n, pos = _read_varint(buf, pos)
+        return strings[n], pos
+    if tag == _STR:
+        n, pos = _read_varint(buf, pos)
+        return bytes(buf[pos:pos + n]).decode("utf-8"), pos + n
+    if tag == _TIME:
+        n, pos = _read_varint(buf, pos)
+        return (_EPOCH + timedelta(microseconds=_unzigzag(n))).isoformat(), pos
+    if tag == _LIST:
+        n, pos = _read_varint(buf, pos)
+        items = []
+        for _ in range(n):
+            item, pos = _decode(buf, pos, strings)
+            items.append(item)
+        return items, pos
+    if tag == _DICT:
+        n, pos = _read_varint(buf, pos)
+        result = {}
+        for _ in range(n):
+            k, pos = _read_varint(buf, pos)
+            result[strings[k]], pos = _decode(buf, pos, strings)
+        return result, pos
+    raise ValueError(f"unknown tag {tag}")
+
+
+def is_binary_log(path) -> bool:
+    """Return ``True`` if the file at ``path`` starts with the binary header."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def iter_binary_frames(buf, start_offset=0, strings=None):
+    """Yield ``(offset, record)`` for records at or after ``start_offset``.
+
+    ``buf`` is any bytes-like object (``bytes``, ``mmap``). Records before
+    ``start_offset`` are skipped by length without being decoded; only their
+    dictionary frames are read. ``strings`` receives the dictionary.
+    """
+    if strings is None:
+        strings = []
+    if bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise ValueError("not a binary activity log")
+    pos = len(MAGIC)
+    end = len(buf)
+    while pos < end:
+        frame_start = pos
+        try:
+            length, pos = _read_varint(buf, pos)
+        except IndexError:
+            return
+        if pos + length > end:
+            return  # truncated tail from an interrupted write
+        kind = buf[pos]
+        if kind == ord("S"):
+            strings.append(bytes(buf[pos + 1:pos + length]).decode("utf-8"))
+        elif kind == ord("R") and frame_start >= start_offset:
+            record, _ = _decode(buf, pos + 1, strings)
+            yield frame_start, record
+        pos += length
+
+
+def read_dictionary(path):
+    """Return ``(strings, size)`` for the binary log at ``path``.
+
+    ``strings`` is the segment's dictionary and ``size`` the length of the
+    complete frames, so a writer can cut off a partially written tail.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError("not a binary activity log")
+    strings = []
+    pos = len(MAGIC)
+    while pos < len(data):
+        try:
+            length, body = _read_varint(data, pos)
+        except IndexError:
+            break
+        if body + length > len(data):
+            break
+        if data[body] == ord("S"):
+            strings.append(data[body + 1:body + length].decode("utf-8"))
+        pos = body + length
+    return strings, pos
+
+
+def iter_binary_log(path):
+    """Yield every snapshot stored in the binary log at ``path``.
+
+    Delta records are expanded, so full snapshots are always yielded.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    yield from expand_deltas(record for _, record in iter_binary_frames(data))
+
+
+def convert_jsonl(src, dst):
+    """Convert a ``.jsonl`` activity log to the binary format; return record count."""
+    encoder = BinaryLogEncoder()
+    count = 0
+    with open(src, "r", encoding="utf-8") as fin, open(dst, "wb") as fout:
+        fout.write(MAGIC)
+        for line in fin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            fout.write(encoder.encode(record))
+            count += 1
+    return count
@@ -0,0 +1,139 @@
+"""Watch the clipboard off the snapshot path and keep only a digest of it."""
+
+import hashlib
+import os
+import select
+import sys
+import threading
+
+try:
+    from Xlib import display as xdisplay
+    from Xlib.ext import xfixes
+except Exception:  # noqa: E722 - broadly handle any import problem
+    xdisplay = None
+    xfixes = None
+
+try:
+    import pyperclip
+except Exception:  # noqa: E722 - broadly handle any import problem
+    pyperclip = None
+
+
+class ClipEntry:
+    """A clipboard change: content hash, length and a short preview."""
+
+    __slots__ = ("digest", "length", "preview")
+
+    def __init__(self, text, preview_chars=200):
+        self.digest = hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=8).hexdigest()
+        self.length = len(text)
+        self.preview = text if len(text) <= preview_chars else text[:preview_chars] + "…"
+
+    def __str__(self):
+        return self.preview
+
+    def __repr__(self):
+        return f"ClipEntry({self.digest}, {self.length} chars)"
+
+
+class ClipboardWatcher:
+    """Report clipboard changes to ``callback`` from a background thread.
+
+    On X11 with the XFIXES extension the thread sleeps until the clipboard
+    owner changes; otherwise it reads the clipboard every ``interval``
+    seconds. Either way the (possibly subprocess-backed) read happens on the
+    watcher thread, so callers only ever look at ``latest``. Consecutive
+    copies of the same content are reported once.
+    """
+
+    def __init__(self, callback=None, interval=1.0, preview_chars=200, reader=None):
+        self.callback = callback
+        self.interval = interval
+        self.preview_chars = preview_chars
+        self.reader = reader or (pyperclip.paste if pyperclip else None)
+        self.latest = None
+        self.mode = None
+        self.reads = 0
+        self.changes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        # The content present at start-up is not a change
+        self._last_digest = None
+        self.check(notify=False)
+
+    def check(self, notify=True):
+        """Read the clipboard once; return a ``ClipEntry`` if it changed."""
+        if self.reader is None:
+            return None
+        try:
+            text = self.reader()
+        except Exception:
+            return None
+        self.reads += 1
+        if not isinstance(text, str):
+            return None
+        entry = ClipEntry(text, self.preview_chars)
+        if entry.digest == self._last_digest:
+            return None
+        self._last_digest = entry.digest
+        self.latest = entry
+        if not notify or not text:
+            return None
+        self.changes += 1
+        if self.callback:
+            try:
+                self.callback(entry)
+            except Exception:
+                pass
+        return entry
+
+    def start(self):
+        """Start watching in a daemon thread."""
+        if self.reader is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        if sys.platform.startswith("linux") and xfixes is not None and os.getenv("DISPLAY"):
+            try:
+                self._run_xfixes()
+                return
+            except Exception:
+                pass
+        self.mode = "poll"
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def _run_xfixes(self):
+        conn = xdisplay.Display()
+        try:
+            if not conn.has_extension("XFIXES"):
+                raise RuntimeError("XFIXES is not available")
+            conn.xfixes_query_version()
+            root = conn.screen().root
+            for name in ("CLIPBOARD", "PRIMARY"):
+                conn.xfixes_select_selection_input(
+                    root, conn.intern_atom(name), xfixes.XFixesSetSelectionOwnerNotifyMask
+                )
+            self.mode = "xfixes"
+            while not self._stop.is_set():
+                if not conn.pending_events():
+                    select.select([conn.fileno()], [], [], 0.5)
+                    if not conn.pending_events():
+                        continue
+                changed = False
+                while conn.pending_events():
+                    conn.next_event()
+                    changed = True
+                if changed:
+                    self.check()
+        finally:
+            conn.close()
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
@@ -0,0 +1,132 @@
+"""Measure the monitor's own CPU use and slow its collectors to fit a budget."""
+
+import os
+import threading
+import time
+
+# Collectors slowed down first when over budget, and sped up last
+THROTTLE_ORDER = ("ocr", "processes", "windows")
+
+
+def own_cpu_seconds() -> float:
+    """Return CPU seconds used by this process and its exited children."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class _Measure:
+    __slots__ = ("governor", "name", "start")
+
+    def __init__(self, governor, name):
+        self.governor = governor
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.governor.charge(self.name, time.thread_time() - self.start)
+        return False
+
+
+class CpuGovernor:
+    """Keep the monitor's CPU use under ``budget`` (a fraction of one core).
+
+    Collectors report their cost with ``measure(name)``, which charges the
+    CPU time of the calling thread (``time.thread_time``), or ``charge``
+    for work done elsewhere such as OCR worker processes. Every ``period``
+    seconds ``update`` compares the whole process's CPU use (``cpu``) with
+    the budget. Over budget, the first collector in ``order`` not yet at
+    ``max_scale`` has its interval doubled: OCR, then process scans, then
+    window probes. Below half the budget the most recently slowed collector
+    is sped up again. ``scale(name)`` is the factor collectors multiply
+    their interval by.
+    """
+
+    def __init__(self, budget=0.02, period=10.0, max_scale=16, order=THROTTLE_ORDER,
+                 cpu=own_cpu_seconds, clock=time.monotonic):
+        self.budget = budget
+        self.period = period
+        self.max_scale = max_scale
+        self.order = tuple(order)
+        self.cpu = cpu
+        self.clock = clock
+        self.scales = {name: 1 for name in self.order}
+        self.usage = 0.0
+        self._costs = {}
+        self._lock = threading.Lock()
+        self._started = (clock(), cpu())
+        self._last = self._started
+
+    def measure(self, name) -> _Measure:
+        """Return a context manager charging its thread's CPU time to ``name``."""
+        return _Measure(self, name)
+
+    def charge(self, name, seconds, calls=1):
+        """Add ``seconds`` of CPU time and ``calls`` runs to collector ``name``."""
+        with self._lock:
+            cost = self._costs.get(name)
+            if cost is None:
+                cost = self._costs[name] = [0.0, 0]
+            cost[0] += max(seconds, 0.0)
+            cost[1] += calls
+
+    def scale(self, name) -> int:
+        """Return the factor by which ``name`` should stretch its interval."""
+        return self.scales.get(name, 1)
+
+    def update(self) -> bool:
+        """Re-evaluate usage once per ``period``; return ``True`` if a scale changed."""
+        now = self.clock()
+        if now - self._last[0] < self.period:
+            return False
+        cpu = self.cpu()
+        with self._lock:
+            last_time, last_cpu = self._last
+            if now - last_time < self.period:
+                return False
+            self._last = (now, cpu)
+            self.usage = max(cpu - last_cpu, 0.0) / (now - last_time)
+            if self.budget is None:
+                return False
+            if self.usage > self.budget:
+                for name in self.order:
+                    if self.scales[name] < self.max_scale:
+                        self.scales[name] *= 2
+                        return True
+            elif self.usage < self.budget / 2:
+                for name in reversed(self.order):
+                    if self.scales[name] > 1:
+                        self.scales[name] //= 2
+                        return True
+        return False
+
+    def breakdown(self) -> dict:
+        """Return usage, budget, scales and CPU time per collector.
+
+        ``share`` is each collector's part of the process CPU used since the
+        governor started; CPU not charged to any collector (input hooks,
+        interpreter overhead) is reported as ``other_cpu_s``.
+        """
+        now, cpu = self.clock(), self.cpu()
+        with self._lock:
+            total = max(cpu - self._started[1], 0.0)
+            elapsed = max(now - self._started[0], 1e-9)
+            collectors = {}
+            for name, (seconds, calls) in sorted(self._costs.items()):
+                collectors[name] = {
+                    "cpu_s": round(seconds, 4),
+                    "calls": calls,
+                    "avg_ms": round(seconds * 1000 / calls, 3) if calls else 0.0,
+                    "share": round(seconds / total, 3) if total else 0.0,
+                }
+            charged = sum(seconds for seconds, _ in self._costs.values())
+            return {
+                "budget": self.budget,
+                "usage": round(self.usage, 4),
+                "average": round(total / elapsed, 4),
+                "scales": dict(self.scales),
+                "collectors": collectors,
+                "other_cpu_s": round(max(total - charged, 0.0), 4),
+            }
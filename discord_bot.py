@@ -4,12 +4,12 @@
 
 import os
 import threading
-import time
 import asyncio
 import re
 import logging
 
 import discord
+from adaptive_poll import AdaptivePoller
 from system_monitor import SystemMonitor
 import discord_agent
 import system_controller
@@ -42,15 +42,14 @@ async def send_split_message(channel: discord.abc.Messageable, text: str, limit:
 
 
 def _monitor_loop():
+    # Every 2 s while the user is active, backing off from 10 s when idle
+    poller = AdaptivePoller(getattr(monitor, "timeline", None))
     while not _stop_event.is_set():
         try:
             monitor.capture_snapshot()
         except Exception:
             pass
-        for _ in range(10):
-            if _stop_event.is_set():
-                break
-            time.sleep(1)
+        poller.wait(_stop_event)
 
 
 def start_monitor_thread():
@@ -0,0 +1,103 @@
+"""On-disk overflow for events evicted from a capped ``EventStore``."""
+
+import os
+import threading
+
+from binary_log import MAGIC, BinaryLogEncoder, is_binary_log, iter_binary_frames, read_dictionary
+from event_store import Event, EventKind
+
+
+class EventSpill:
+    """Append evicted events to a compact binary file that can be queried.
+
+    Events are stored with the ``binary_log`` encoding as ``{"t", "k", "p"}``
+    records, so repeated payloads such as key names cost a dictionary
+    reference. The file is created on the first write. Once it exceeds
+    ``max_bytes`` it is moved to ``<path>.1`` (replacing the previous one)
+    and a new file is started, bounding the spill to about twice that size.
+    """
+
+    def __init__(self, path="event_spill.alog", max_bytes=50 * 1024 * 1024):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.records = 0
+        self._encoder = BinaryLogEncoder()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._file is None:
+            if os.path.exists(self.path) and os.path.getsize(self.path):
+                if is_binary_log(self.path):
+                    strings, size = read_dictionary(self.path)
+                    os.truncate(self.path, size)
+                    self._encoder.load(strings)
+                else:
+                    os.remove(self.path)
+            self._file = open(self.path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(MAGIC)
+                self._encoder.reset()
+        return self._file
+
+    def write(self, events):
+        """Append ``events`` to the spill file."""
+        if not events:
+            return
+        with self._lock:
+            try:
+                f = self._open()
+                if f.tell() > self.max_bytes:
+                    f.close()
+                    self._file = None
+                    os.replace(self.path, self.path + ".1")
+                    f = self._open()
+                f.write(b"".join(
+                    self._encoder.encode({"t": e.timestamp, "k": int(e.kind), "p": str(e.payload)})
+                    for e in events
+                ))
+                f.flush()
+                self.records += len(events)
+            except Exception:
+                # Reopen next time so the dictionary matches the file again
+                self.close()
+
+    def query(self, start=None, end=None, kinds=()) -> list[Event]:
+        """Return spilled events between ``start`` and ``end``, oldest first."""
+        kinds = {int(k) for k in kinds}
+        events = []
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            for path in (self.path + ".1", self.path):
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    for _, record in iter_binary_frames(data):
+                        ts = record["t"]
+                        if kinds and record["k"] not in kinds:
+                            continue
+                        if (start is None or ts >= start) and (end is None or ts <= end):
+                            events.append(Event(ts, EventKind(record["k"]), record["p"]))
+                except (OSError, ValueError):
+                    continue
+        return events
+
+    def size(self) -> int:
+        """Return the bytes used on disk."""
+        total = 0
+        for path in (self.path, self.path + ".1"):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def close(self):
+        """Close the spill file."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
@@ -0,0 +1,402 @@
+"""Compact, typed storage for ``SystemMonitor`` events."""
+
+import enum
+import heapq
+import itertools
+import sys
+import threading
+import time
+
+
+class EventKind(enum.IntEnum):
+    """Categories of events recorded by the monitor."""
+
+    KEY = 0
+    MOUSE_MOVE = 1
+    MOUSE = 2
+    CLIPBOARD = 3
+    OCR = 4
+    ACTIVE_WINDOW = 5
+    UI_TEXT = 6
+    RUNNING_APPS = 7
+    OPEN_WINDOWS = 8
+    FILE_MODIFIED = 9
+    FILE_CREATED = 10
+    FILES_CHANGED = 11
+
+
+# Human readable message templates, applied only when a message is requested
+_FORMATS = {
+    EventKind.KEY: "Pressed key: {}",
+    EventKind.MOUSE_MOVE: "Mouse {}",
+    EventKind.MOUSE: "Mouse {}",
+    EventKind.CLIPBOARD: "Copied text: '{}'",
+    EventKind.OCR: "Screen OCR: {}",
+    EventKind.ACTIVE_WINDOW: "Active window: {}",
+    EventKind.UI_TEXT: "Visible elements: {}",
+    EventKind.RUNNING_APPS: "Running apps: {}",
+    EventKind.OPEN_WINDOWS: "Open windows: {}",
+    EventKind.FILE_MODIFIED: "Modified file: {}",
+    EventKind.FILE_CREATED: "Created file: {}",
+    EventKind.FILES_CHANGED: "{}",
+}
+
+INPUT_KINDS = (EventKind.KEY, EventKind.MOUSE_MOVE, EventKind.MOUSE)
+
+# Short payloads (key names, mouse actions) repeat constantly and are interned
+_INTERN_MAX = 64
+
+
+class Event:
+    """A single timestamped event."""
+
+    __slots__ = ("timestamp", "kind", "payload")
+
+    def __init__(self, timestamp: float, kind: EventKind, payload: str = ""):
+        self.timestamp = timestamp
+        self.kind = kind
+        self.payload = payload
+
+    @property
+    def message(self) -> str:
+        """Return the event formatted as a human readable message."""
+        return _FORMATS[self.kind].format(self.payload)
+
+    def __repr__(self):
+        return f"Event({self.timestamp!r}, {self.kind.name}, {self.payload!r})"
+
+
+# Events per segment; a writer takes the roll-over lock once per segment
+SEGMENT_SIZE = 256
+
+
+class EventView:
+    """Immutable, point-in-time view of stored events.
+
+    A view records which slice of each segment was visible when it was taken.
+    Segments are append-only, so later writes and pruning never change what
+    the view yields, and taking it does not copy any events.
+    """
+
+    __slots__ = ("_parts", "_len")
+
+    def __init__(self, parts):
+        self._parts = parts
+        self._len = sum(stop - start for _, start, stop in parts)
+
+    def __iter__(self):
+        for segment, start, stop in self._parts:
+            yield from itertools.islice(segment, start, stop)
+
+    def __len__(self):
+        return self._len
+
+    def __bool__(self):
+        return self._len > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("event index out of range")
+        for segment, start, stop in self._parts:
+            if index < stop - start:
+                return segment[start + index]
+            index -= stop - start
+        raise IndexError("event index out of range")
+
+
+def payload_size(payload) -> int:
+    """Return the size charged to ``payload`` against ``EventStore.max_bytes``."""
+    if isinstance(payload, str):
+        return len(payload)
+    return sys.getsizeof(payload)
+
+
+# Payloads this large (e.g. a huge paste) check the limits straight away
+_LARGE_PAYLOAD = 4096
+
+
+class _Segments:
+    """Append-only event list split into fixed-size segments.
+
+    Writers append to the tail segment with ``list.append``, which is atomic
+    in CPython. The published state is an immutable ``(segments, head)``
+    pair that is only replaced, under ``_lock``, when a segment fills up or
+    old events are dropped, so readers never lock and writers only contend
+    once per ``size`` appends.
+
+    With ``weigh``, the payload size of each full segment is summed once when
+    it rolls over so ``weight`` stays cheap. ``on_roll`` is called after a
+    segment fills up.
+    """
+
+    def __init__(self, size=SEGMENT_SIZE, weigh=None, on_roll=None):
+        self._size = size
+        self._weigh = weigh
+        self._on_roll = on_roll
+        self._lock = threading.Lock()
+        self._tail = []
+        self._state = ((self._tail,), 0)
+        self._weights = {}
+        self._head_weight = 0
+
+    def append(self, event):
+        tail = self._tail
+        tail.append(event)
+        if len(tail) >= self._size and self._roll(tail) and self._on_roll:
+            self._on_roll()
+
+    def _roll(self, tail) -> bool:
+        with self._lock:
+            if self._tail is not tail:
+                return False
+            if self._weigh:
+                self._weights[id(tail)] = sum(map(self._weigh, tail))
+            new = []
+            segments, head = self._state
+            # Publish the segment before writers can append to it
+            self._state = (segments + (new,), head)
+            self._tail = new
+            return True
+
+    def view(self) -> EventView:
+        segments, head = self._state
+        parts = [(segments[0], head, len(segments[0]))]
+        parts.extend((segment, 0, len(segment)) for segment in segments[1:])
+        return EventView(parts)
+
+    def last(self):
+        segments, head = self._state
+        for i in range(len(segments) - 1, -1, -1):
+            segment = segments[i]
+            if len(segment) > (head if i == 0 else 0):
+                return segment[-1]
+        return None
+
+    def __len__(self):
+        segments, head = self._state
+        return sum(len(segment) for segment in segments) - head
+
+    def segment_count(self) -> int:
+        return len(self._state[0])
+
+    def weight(self) -> int:
+        """Return the summed payload size of the stored events."""
+        if not self._weigh:
+            return 0
+        with self._lock:
+            segments, _ = self._state
+            full = sum(self._weights.get(id(segment), 0) for segment in segments[:-1])
+            return full + sum(map(self._weigh, segments[-1])) - self._head_weight
+
+    def drop(self, stop, removed=None) -> int:
+        """Drop head events until ``stop(event, dropped)`` is true.
+
+        Dropped events are appended to ``removed`` when it is given.
+        """
+        dropped = 0
+        with self._lock:
+            segments, head = self._state
+            head_weight = self._head_weight
+            first = 0
+            while True:
+                segment = segments[first]
+                size = len(segment)
+                while head < size and not stop(segment[head], dropped):
+                    if removed is not None:
+                        removed.append(segment[head])
+                    if self._weigh:
+                        head_weight += self._weigh(segment[head])
+                    head += 1
+                    dropped += 1
+                if head < size or segment is self._tail:
+                    break
+                self._weights.pop(id(segment), None)
+                first += 1
+                head = 0
+                head_weight = 0
+            self._state = (segments[first:], head)
+            self._head_weight = head_weight
+        return dropped
+
+    def prune(self, cutoff) -> int:
+        return self.drop(lambda event, _: event.timestamp >= cutoff)
+
+    def clear(self):
+        with self._lock:
+            self._tail = []
+            self._state = ((self._tail,), 0)
+            self._weights = {}
+            self._head_weight = 0
+
+
+# Approximate memory per stored event besides its payload: the ``Event``
+# object and one reference in each of the two logs
+_EVENT_OVERHEAD = sys.getsizeof(Event(0.0, EventKind.KEY, "")) + 16
+
+
+class EventStore:
+    """Time-ordered event buffer with per-kind indexes.
+
+    Every event is kept in a single chronological log and additionally in a
+    log for its kind, so per-kind counts and listings only touch matching
+    events.
+
+    Hook, watchdog and screenshot threads append while the monitor thread
+    prunes and reads. The logs are append-only segment lists (``_Segments``):
+    appends never wait on readers, and readers such as ``snapshot`` get an
+    immutable ``EventView`` without locking or copying the buffer. Each log
+    is pruned from its head, so an event appended out of time order can
+    outlive older ones in one log for a prune or two.
+
+    ``max_events`` and ``max_bytes`` (summed ``payload_size``) cap the buffer
+    regardless of age. They are enforced whenever a segment fills up, a large
+    payload arrives or ``prune`` runs; the oldest events are evicted and, if
+    ``spill`` (an ``event_spill.EventSpill``) is given, written to disk where
+    ``history`` can still find them.
+    """
+
+    def __init__(self, segment_size=SEGMENT_SIZE, max_events=None, max_bytes=None, spill=None):
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.spill = spill
+        self.evicted = 0
+        self._limit_lock = threading.Lock()
+        self._events = _Segments(segment_size, weigh=lambda e: payload_size(e.payload),
+                                 on_roll=self.enforce_limits)
+        self._by_kind = {kind: _Segments(segment_size) for kind in EventKind}
+
+    def append(self, kind: EventKind, payload: str = "", timestamp: float | None = None) -> Event:
+        """Store a new event and return it."""
+        if timestamp is None:
+            timestamp = time.time()
+        if isinstance(payload, str) and len(payload) <= _INTERN_MAX:
+            payload = sys.intern(payload)
+        event = Event(timestamp, kind, payload)
+        self._events.append(event)
+        self._by_kind[kind].append(event)
+        if self.max_bytes is not None and payload_size(payload) >= _LARGE_PAYLOAD:
+            self.enforce_limits()
+        return event
+
+    def prune(self, cutoff: float) -> int:
+        """Drop events older than ``cutoff`` and return how many were removed."""
+        removed = self._events.prune(cutoff)
+        for events in self._by_kind.values():
+            events.prune(cutoff)
+        self.enforce_limits()
+        return removed
+
+    def enforce_limits(self) -> int:
+        """Evict the oldest events beyond the caps; return how many were evicted.
+
+        Only one thread evicts at a time; others return immediately rather
+        than wait.
+        """
+        if self.max_events is None and self.max_bytes is None:
+            return 0
+        if not self._limit_lock.acquire(blocking=False):
+            return 0
+        try:
+            excess_events = 0
+            if self.max_events is not None:
+                excess_events = len(self._events) - self.max_events
+            excess_bytes = 0
+            if self.max_bytes is not None:
+                excess_bytes = self._events.weight() - self.max_bytes
+            if excess_events <= 0 and excess_bytes <= 0:
+                return 0
+
+            freed = 0
+
+            def stop(event, dropped):
+                nonlocal freed
+                if dropped < excess_events or freed < excess_bytes:
+                    freed += payload_size(event.payload)
+                    return False
+                return True
+
+            removed = []
+            self._events.drop(stop, removed)
+            per_kind = {}
+            for event in removed:
+                per_kind[event.kind] = per_kind.get(event.kind, 0) + 1
+            for kind, n in per_kind.items():
+                self._by_kind[kind].drop(lambda _, dropped, n=n: dropped >= n)
+            self.evicted += len(removed)
+            if self.spill is not None:
+                self.spill.write(removed)
+            return len(removed)
+        finally:
+            self._limit_lock.release()
+
+    def count(self, *kinds: EventKind) -> int:
+        """Return the number of stored events of the given kinds."""
+        return sum(len(self._by_kind[k]) for k in kinds)
+
+    def latest(self, kind: EventKind) -> Event | None:
+        """Return the most recent event of ``kind`` if any."""
+        return self._by_kind[kind].last()
+
+    def of_kind(self, *kinds: EventKind) -> list[Event]:
+        """Return events of the given kinds in chronological order."""
+        views = [view for view in (self._by_kind[k].view() for k in kinds) if view]
+        if not views:
+            return []
+        if len(views) == 1:
+            return list(views[0])
+        return list(heapq.merge(*views, key=lambda e: e.timestamp))
+
+    def history(self, start: float | None = None, end: float | None = None, kinds=()) -> list[Event]:
+        """Return spilled and stored events between ``start`` and ``end``.
+
+        ``kinds`` limits the result to those kinds. Spilled events carry
+        their payload as text.
+        """
+        events = self.spill.query(start, end, kinds) if self.spill is not None else []
+        kinds = set(kinds)
+        for event in self.snapshot():
+            if kinds and event.kind not in kinds:
+                continue
+            if (start is None or event.timestamp >= start) and (end is None or event.timestamp <= end):
+                events.append(event)
+        events.sort(key=lambda e: e.timestamp)
+        return events
+
+    def metrics(self) -> dict:
+        """Return event counts, payload bytes and eviction counters."""
+        events = len(self._events)
+        payload = self._events.weight()
+        return {
+            "events": events,
+            "payload_bytes": payload,
+            "approx_bytes": events * _EVENT_OVERHEAD + payload,
+            "segments": self._events.segment_count(),
+            "max_events": self.max_events,
+            "max_bytes": self.max_bytes,
+            "evicted": self.evicted,
+            "spilled": self.spill.records if self.spill is not None else 0,
+            "spill_bytes": self.spill.size() if self.spill is not None else 0,
+        }
+
+    def snapshot(self) -> EventView:
+        """Return an immutable view of all stored events."""
+        return self._events.view()
+
+    def clear(self) -> None:
+        """Remove all stored events."""
+        self._events.clear()
+        for events in self._by_kind.values():
+            events.clear()
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __len__(self):
+        return len(self._events)
+
+    def __getitem__(self, index):
+        return self.snapshot()[index]
@@ -0,0 +1,210 @@
+"""Filtering, debouncing and watch budgeting for ``SystemMonitor`` file events."""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from event_store import EventKind
+
+# The assistant's own outputs and common noise; ``**`` spans directories
+DEFAULT_EXCLUDES = (
+    "activity_log*",
+    "event_spill.alog*",
+    "focus_time.db*",
+    "error_report.txt",
+    "ai_memos/**",
+    ".git/**",
+    "__pycache__/**",
+    "node_modules/**",
+    ".venv/**",
+    "*.pyc",
+    "*.swp",
+    "*.tmp",
+    "*~",
+    ".#*",
+)
+
+# Directories never descended into when counting or scheduling watches
+_SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "ai_memos"}
+
+
+def _glob_to_regex(pattern):
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class PathFilter:
+    """Match paths against include/exclude globs compiled into one regex each.
+
+    Patterns use ``/`` separators and may match at any directory level, so
+    ``ai_memos/**`` also excludes ``sub/ai_memos/x``. ``*`` stays within one
+    path component and ``**`` spans several.
+    """
+
+    def __init__(self, include=None, exclude=DEFAULT_EXCLUDES, roots=()):
+        self.include = self._compile(include) if include else None
+        self.exclude = self._compile(exclude) if exclude else None
+        self.roots = [os.path.abspath(r) for r in roots]
+
+    @staticmethod
+    def _compile(patterns):
+        body = "|".join(_glob_to_regex(p) for p in patterns)
+        return re.compile(f"(?:^|/)(?:{body})$")
+
+    def relative(self, path):
+        path = os.path.abspath(path)
+        for root in self.roots:
+            if path == root or path.startswith(root + os.sep):
+                path = os.path.relpath(path, root)
+                break
+        return path.replace(os.sep, "/")
+
+    def allows(self, path) -> bool:
+        """Return ``True`` if events for ``path`` should be kept."""
+        rel = self.relative(path)
+        if self.exclude is not None and self.exclude.search(rel):
+            return False
+        return self.include is None or bool(self.include.search(rel))
+
+
+class FileChangeBatcher:
+    """Debounce file events per path and summarise bursts per directory.
+
+    ``add`` is called from the watchdog thread. A path is reported by
+    ``flush`` once it has been quiet for ``debounce`` seconds, however many
+    events it produced. When more than ``group_threshold`` paths of one
+    directory are reported together they become a single ``FILES_CHANGED``
+    event such as ``"12 files changed under src/"``.
+    """
+
+    def __init__(self, path_filter=None, debounce=2.0, group_threshold=3):
+        self.filter = path_filter or PathFilter()
+        self.debounce = debounce
+        self.group_threshold = group_threshold
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.received = 0
+        self.filtered = 0
+        self.coalesced = 0
+        self.reported = 0
+
+    def add(self, kind, path, now=None):
+        """Note a change to ``path``; ``kind`` is ``FILE_CREATED`` or ``FILE_MODIFIED``."""
+        self.received += 1
+        if not self.filter.allows(path):
+            self.filtered += 1
+            return
+        if now is None:
+            now = time.time()
+        with self._lock:
+            previous = self._pending.get(path)
+            if previous is not None:
+                self.coalesced += 1
+                # A file created in this window stays "created"
+                if previous[0] == EventKind.FILE_CREATED:
+                    kind = EventKind.FILE_CREATED
+            self._pending[path] = (kind, now)
+
+    def flush(self, now=None, force=False):
+        """Return ``(timestamp, kind, payload)`` events for settled paths."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            ready = [
+                (path, kind, ts) for path, (kind, ts) in self._pending.items()
+                if force or now - ts >= self.debounce
+            ]
+            for path, _, _ in ready:
+                del self._pending[path]
+        by_dir = {}
+        for path, kind, ts in ready:
+            by_dir.setdefault(os.path.dirname(path), []).append((path, kind, ts))
+        events = []
+        for directory, changes in by_dir.items():
+            if len(changes) > self.group_threshold:
+                rel = self.filter.relative(directory)
+                rel = "" if rel == "." else rel.rstrip("/") + "/"
+                ts = max(ts for _, _, ts in changes)
+                events.append((ts, EventKind.FILES_CHANGED, f"{len(changes)} files changed under {rel or './'}"))
+            else:
+                events.extend((ts, kind, path) for path, kind, ts in changes)
+        events.sort(key=lambda e: e[0])
+        self.reported += len(events)
+        return events
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        """Return counts of received, filtered, coalesced and reported events."""
+        return {
+            "received": self.received,
+            "filtered": self.filtered,
+            "coalesced": self.coalesced,
+            "reported": self.reported,
+            "pending": self.pending(),
+        }
+
+
+def _walk_dirs(root, limit, keep=None):
+    """Return up to ``limit + 1`` directories under ``root``, breadth-first."""
+    dirs = []
+    queue = deque([root])
+    while queue and len(dirs) <= limit:
+        current = queue.popleft()
+        dirs.append(current)
+        try:
+            entries = sorted(os.scandir(current), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and (keep is None or keep(entry)):
+                queue.append(entry.path)
+    return dirs
+
+
+def plan_watches(paths, max_watches=4096, path_filter=None):
+    """Return ``(path, recursive)`` pairs that fit in ``max_watches``.
+
+    inotify needs one watch per directory. A tree with no more directories
+    than the budget is watched recursively. A larger tree is watched one
+    directory at a time, breadth-first from the root and skipping excluded
+    directories such as ``.git`` or ``node_modules``, until the budget is
+    used up; directories created later in such a tree are not watched.
+    """
+
+    def keep(entry):
+        if entry.name in _SKIP_DIRS:
+            return False
+        return path_filter is None or path_filter.allows(entry.path + "/x")
+
+    plans = []
+    budget = max_watches
+    for root in paths:
+        if budget <= 0:
+            break
+        everything = _walk_dirs(root, budget)
+        if len(everything) <= budget:
+            plans.append((root, True))
+            budget -= len(everything)
+            continue
+        for directory in _walk_dirs(root, budget, keep)[:budget]:
+            plans.append((directory, False))
+            budget -= 1
+    return plans
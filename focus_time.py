@@ -0,0 +1,207 @@
+"""Time spent per application and window, rolled up into hour and day buckets."""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS focus_hour (
+    hour REAL NOT NULL, app TEXT NOT NULL, title TEXT NOT NULL, seconds REAL NOT NULL,
+    PRIMARY KEY (hour, app, title)
+);
+CREATE TABLE IF NOT EXISTS focus_day (
+    day TEXT NOT NULL, app TEXT NOT NULL, title TEXT NOT NULL, seconds REAL NOT NULL,
+    PRIMARY KEY (day, app, title)
+);
+"""
+
+_UPSERT = (
+    "INSERT INTO {table} VALUES (?, ?, ?, ?) "
+    "ON CONFLICT ({key}, app, title) DO UPDATE SET seconds = seconds + excluded.seconds"
+)
+
+
+def _hour_start(ts):
+    return datetime.fromtimestamp(ts).replace(minute=0, second=0, microsecond=0)
+
+
+def _midnight(ts):
+    return datetime.fromtimestamp(ts).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def split_by_hour(start, end):
+    """Yield ``(hour, day, seconds)`` pieces of ``start..end`` per local hour.
+
+    ``hour`` is the epoch time the local hour starts and ``day`` the local
+    date as ``YYYY-MM-DD``.
+    """
+    while start < end:
+        hour = _hour_start(start)
+        boundary = min((hour + timedelta(hours=1)).timestamp(), end)
+        if boundary <= start:  # clocks turned back; never loop forever
+            boundary = end
+        yield hour.timestamp(), hour.date().isoformat(), boundary - start
+        start = boundary
+
+
+class FocusTracker:
+    """Accumulate how long each window stays focused.
+
+    ``focus`` is called with the active app and title whenever they may
+    have changed; a change closes the running interval, which is split at
+    local hour boundaries and added to per-hour and per-day totals for its
+    ``(app, title)``. Totals are buffered in memory and upserted into a
+    small SQLite file every ``flush_interval`` seconds, so reports read a
+    few rollup rows instead of replaying the activity log. When ``focus``
+    has not been called for more than ``max_gap`` seconds (the monitor was
+    stopped or the machine slept) the interval ends at the last call. The
+    database is created on the first flush.
+    """
+
+    def __init__(self, path="focus_time.db", flush_interval=60.0, max_gap=300.0):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.max_gap = max_gap
+        self.current = None
+        self._since = None
+        self._seen = None
+        self._hours = {}
+        self._days = {}
+        self._last_flush = time.time()
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _end(self, timestamp):
+        """Return where the running interval ends if it is closed at ``timestamp``."""
+        return timestamp if timestamp - self._seen <= self.max_gap else self._seen
+
+    def _add(self, key, start, end):
+        app, title = key
+        for hour, day, seconds in split_by_hour(start, end):
+            k = (hour, app, title)
+            self._hours[k] = self._hours.get(k, 0.0) + seconds
+            k = (day, app, title)
+            self._days[k] = self._days.get(k, 0.0) + seconds
+
+    def focus(self, app, title, timestamp=None):
+        """Note that ``app``/``title`` is focused at ``timestamp``."""
+        if timestamp is None:
+            timestamp = time.time()
+        key = (app or "", title or "")
+        with self._lock:
+            if self.current is not None and timestamp - self._seen > self.max_gap:
+                self._add(self.current, self._since, self._seen)
+                self.current = None
+            self._seen = timestamp
+            if key == self.current:
+                if timestamp - self._since >= self.flush_interval:
+                    # Checkpoint a long interval so it reaches the database
+                    self._add(key, self._since, timestamp)
+                    self._since = timestamp
+                    self._flush_locked()
+                return
+            if self.current is not None:
+                self._add(self.current, self._since, timestamp)
+            self.current, self._since = key, timestamp
+            if timestamp - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.time()
+        if not self._hours and not self._days:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    _UPSERT.format(table="focus_hour", key="hour"),
+                    [(h, a, t, s) for (h, a, t), s in self._hours.items()],
+                )
+                conn.executemany(
+                    _UPSERT.format(table="focus_day", key="day"),
+                    [(d, a, t, s) for (d, a, t), s in self._days.items()],
+                )
+        except sqlite3.Error:
+            return  # keep the totals and try again next time
+        self._hours.clear()
+        self._days.clear()
+
+    def flush(self, timestamp=None):
+        """Add the running interval up to ``timestamp`` and write all totals."""
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if self.current is not None:
+                end = self._end(timestamp)
+                if end > self._since:
+                    self._add(self.current, self._since, end)
+                    self._since = end
+            self._flush_locked()
+
+    def top(self, start, end=None, by="app", k=10):
+        """Return ``[(name, seconds)]`` for the ``k`` most focused apps or titles.
+
+        ``by`` is ``"app"``, ``"title"`` or ``"window"`` (app and title).
+        Whole local days inside ``start..end`` are read from the day
+        rollups and the remaining edges from the hour rollups, so ``start``
+        and ``end`` are effectively rounded to the hour. The running
+        interval is included up to now without being closed.
+        """
+        now = time.time()
+        if end is None:
+            end = now
+        columns = {"app": "app", "title": "title", "window": "app, title"}[by]
+        first_day = _midnight(start)
+        if first_day.timestamp() < start:
+            first_day += timedelta(days=1)
+        last_day = _midnight(end)
+        queries = []
+        if first_day < last_day:
+            queries.append(("focus_day", "day", first_day.date().isoformat(), last_day.date().isoformat()))
+            edges = ((start, first_day.timestamp()), (last_day.timestamp(), end))
+        else:
+            edges = ((start, end),)
+        for lo, hi in edges:
+            if hi > lo:
+                queries.append(("focus_hour", "hour", _hour_start(lo).timestamp(), hi))
+        totals = {}
+        with self._lock:
+            self._flush_locked()
+            if self.current is not None:
+                lo = max(self._since, start)
+                hi = min(self._end(now), end)
+                if hi > lo:
+                    app, title = self.current
+                    name = {"app": app, "title": title, "window": self.current}[by]
+                    totals[name] = hi - lo
+            if self._conn is None:
+                try:
+                    self._connect()
+                except sqlite3.Error:
+                    return []
+            for table, column, lo, hi in queries:
+                rows = self._conn.execute(
+                    f"SELECT {columns}, SUM(seconds) FROM {table} "
+                    f"WHERE {column} >= ? AND {column} < ? GROUP BY {columns}",
+                    (lo, hi),
+                )
+                for *name, seconds in rows:
+                    name = tuple(name) if len(name) > 1 else name[0]
+                    totals[name] = totals.get(name, 0.0) + seconds
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+    def close(self, timestamp=None):
+        """Write the running interval up to ``timestamp`` and close the database."""
+        self.flush(timestamp)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
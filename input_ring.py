@@ -0,0 +1,128 @@
+"""Hand raw input events from hook threads to the monitor without blocking.
+
+``keyboard`` and ``mouse`` call their hooks on the listener threads, so any
+work done there delays input system-wide. The hooks only append a raw
+``(kind, timestamp, event)`` tuple to an ``InputRing``; a consumer drains it
+and turns the tuples into events with ``coalesce_input``, which folds runs of
+mouse moves into one ``MouseMoves`` aggregate per interval.
+"""
+
+import math
+from collections import deque
+
+from event_store import EventKind
+
+
+class InputRing:
+    """Bounded buffer that hook threads append to without taking a lock.
+
+    ``deque.append`` and ``deque.popleft`` are atomic in CPython, so any
+    number of producers and a consumer can share the ring. When it is full
+    the oldest entries are overwritten and counted in ``dropped``.
+    """
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self._items = deque(maxlen=capacity)
+        self.pushed = 0
+        self.dropped = 0
+
+    def push(self, item):
+        """Append ``item``; called on hook threads, so it does nothing else."""
+        if len(self._items) >= self.capacity:
+            self.dropped += 1
+        self._items.append(item)
+        self.pushed += 1
+
+    def drain(self) -> list:
+        """Remove and return everything pushed so far, oldest first."""
+        items = []
+        pop = self._items.popleft
+        try:
+            while True:
+                items.append(pop())
+        except IndexError:
+            return items
+
+    def __len__(self):
+        return len(self._items)
+
+
+class MouseMoves:
+    """Mouse moves within one interval: count, distance and bounding box."""
+
+    __slots__ = ("count", "distance", "x", "y", "left", "top", "right", "bottom")
+
+    def __init__(self):
+        self.count = 0
+        self.distance = 0.0
+        self.x = self.y = None
+        self.left = self.top = self.right = self.bottom = None
+
+    def add(self, x=None, y=None):
+        self.count += 1
+        if x is None or y is None:
+            return
+        if self.x is None:
+            self.left = self.right = x
+            self.top = self.bottom = y
+        else:
+            self.distance += math.hypot(x - self.x, y - self.y)
+            self.left, self.right = min(self.left, x), max(self.right, x)
+            self.top, self.bottom = min(self.top, y), max(self.bottom, y)
+        self.x, self.y = x, y
+
+    @property
+    def bbox(self):
+        if self.left is None:
+            return None
+        return self.left, self.top, self.right, self.bottom
+
+    def __str__(self):
+        text = f"move x{self.count}"
+        if self.bbox is not None:
+            text += f", {self.distance:.0f}px within {self.bbox}"
+        return text
+
+    def __repr__(self):
+        return f"MouseMoves({self})"
+
+
+def _mouse_type(event):
+    return getattr(event, "event_type", None) or event.__class__.__name__
+
+
+def coalesce_input(items, interval=1.0):
+    """Yield ``(timestamp, kind, payload)`` events for drained ring items.
+
+    Consecutive mouse moves that fall in the same ``interval``-second window
+    become one ``MOUSE_MOVE`` event carrying a ``MouseMoves`` payload and the
+    time of the last move. Other events are passed through in order.
+    """
+    moves = None
+    moves_time = None
+    window = None
+    for kind, timestamp, event in items:
+        if kind == EventKind.MOUSE:
+            event_type = _mouse_type(event)
+            if event_type in ("move", "MoveEvent"):
+                slot = int(timestamp // interval)
+                if moves is not None and slot != window:
+                    yield moves_time, EventKind.MOUSE_MOVE, moves
+                    moves = None
+                if moves is None:
+                    moves, window = MouseMoves(), slot
+                moves.add(getattr(event, "x", None), getattr(event, "y", None))
+                moves_time = timestamp
+                continue
+            payload = event_type
+            if hasattr(event, "delta"):
+                payload = f"{event_type} delta={event.delta}"
+        else:
+            payload = getattr(event, "name", event)
+        if moves is not None:
+            yield moves_time, EventKind.MOUSE_MOVE, moves
+            moves = None
+        yield timestamp, kind, payload
+    if moves is not None:
+        yield moves_time, EventKind.MOUSE_MOVE, moves
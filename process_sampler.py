@@ -0,0 +1,235 @@
+"""Shared, cached sampling of the system process table."""
+
+import os
+import sys
+import threading
+import time
+
+import psutil
+
+try:
+    import numpy as np
+except Exception:  # noqa: E722 - broadly handle any import problem
+    np = None
+
+
+class ProcessInfo:
+    """Attributes of one process captured during a sampling pass."""
+
+    __slots__ = ("pid", "name", "exe", "cpu_percent", "rss", "process", "ppid")
+
+    def __init__(self, pid, name="", exe="", cpu_percent=0.0, rss=0, process=None, ppid=0):
+        self.pid = pid
+        self.name = name
+        self.exe = exe
+        self.cpu_percent = cpu_percent
+        self.rss = rss
+        self.process = process
+        self.ppid = ppid
+
+    def __repr__(self):
+        return f"ProcessInfo(pid={self.pid}, name={self.name!r}, cpu={self.cpu_percent}, rss={self.rss})"
+
+
+def _read(getter, default):
+    try:
+        return getter()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        return default
+
+
+class ProcStatReader:
+    """Read name, CPU ticks and RSS of every process straight from ``/proc``.
+
+    One ``/proc/<pid>/stat`` read per process replaces the several files and
+    syscalls ``psutil`` needs. The fields are collected into NumPy arrays and
+    CPU percentages for all processes are computed at once from the tick
+    deltas since the previous ``read``. Processes are keyed by PID and start
+    time, so a reused PID starts from zero like a fresh ``psutil.Process``.
+    """
+
+    def __init__(self, proc="/proc"):
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+        self.proc = proc
+        self._clk_tck = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._names = {}
+        self._prev_pids = np.empty(0, dtype=np.int64)
+        self._prev_start = np.empty(0, dtype=np.int64)
+        self._prev_ticks = np.empty(0, dtype=np.int64)
+        self._prev_time = None
+
+    def _name_and_exe(self, pid, start, comm):
+        key = (pid, start)
+        cached = self._names.get(key)
+        if cached is None:
+            name = comm
+            # ``comm`` is cut at 15 characters; take the full name from argv[0]
+            if len(comm) >= 15:
+                try:
+                    with open(f"{self.proc}/{pid}/cmdline", "rb") as f:
+                        argv0 = f.read().split(b"\0", 1)[0].decode("utf-8", "replace")
+                    base = os.path.basename(argv0)
+                    if base.startswith(comm):
+                        name = base
+                except OSError:
+                    pass
+            try:
+                exe = os.readlink(f"{self.proc}/{pid}/exe")
+            except OSError:
+                exe = ""
+            cached = self._names[key] = (name, exe)
+        return cached
+
+    def read(self) -> list[ProcessInfo]:
+        """Return one ``ProcessInfo`` per running process."""
+        pids, ppids, starts, ticks, rss, comms = [], [], [], [], [], []
+        for entry in os.listdir(self.proc):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"{self.proc}/{entry}/stat", "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            head, _, rest = data.rpartition(b")")
+            fields = rest.split()
+            if len(fields) < 22:
+                continue
+            pids.append(int(entry))
+            comms.append(head[head.find(b"(") + 1:].decode("utf-8", "replace"))
+            # Fields are numbered from 1 in proc(5); ``fields[0]`` is field 3
+            ppids.append(int(fields[1]))
+            ticks.append(int(fields[11]) + int(fields[12]))
+            starts.append(int(fields[19]))
+            rss.append(int(fields[21]))
+        now = time.monotonic()
+
+        pid_arr = np.array(pids, dtype=np.int64)
+        start_arr = np.array(starts, dtype=np.int64)
+        tick_arr = np.array(ticks, dtype=np.int64)
+        rss_arr = np.array(rss, dtype=np.int64) * self._page_size
+        cpu = np.zeros(len(pid_arr))
+        if self._prev_time is not None and len(self._prev_pids) and len(pid_arr):
+            idx = np.searchsorted(self._prev_pids, pid_arr)
+            idx[idx >= len(self._prev_pids)] = 0
+            same = (self._prev_pids[idx] == pid_arr) & (self._prev_start[idx] == start_arr)
+            elapsed = max(now - self._prev_time, 1e-9)
+            delta = np.where(same, tick_arr - self._prev_ticks[idx], 0)
+            cpu = np.maximum(delta, 0) / self._clk_tck / elapsed * 100.0
+
+        order = np.argsort(pid_arr)
+        self._prev_pids = pid_arr[order]
+        self._prev_start = start_arr[order]
+        self._prev_ticks = tick_arr[order]
+        self._prev_time = now
+
+        live = set(zip(pids, starts))
+        self._names = {k: v for k, v in self._names.items() if k in live}
+        sample = []
+        for i, pid in enumerate(pids):
+            name, exe = self._name_and_exe(pid, starts[i], comms[i])
+            sample.append(ProcessInfo(pid, name, exe, round(float(cpu[i]), 1), int(rss_arr[i]), None, ppids[i]))
+        return sample
+
+
+def default_backend() -> str:
+    """Return ``"proc"`` where the ``/proc`` fast path works, else ``"psutil"``."""
+    if sys.platform.startswith("linux") and np is not None and os.path.exists("/proc/self/stat"):
+        return "proc"
+    return "psutil"
+
+
+class ProcessSampler:
+    """Keep ``psutil.Process`` handles alive across samples.
+
+    ``psutil`` computes ``cpu_percent(interval=None)`` relative to the previous
+    call on the *same* ``Process`` object, so a fresh object always reports
+    ``0.0``. The sampler caches handles by PID and refreshes them in a single
+    pass using ``oneshot()``, which gives meaningful CPU deltas between ticks.
+    Callers reading within ``max_age`` seconds of the last pass share its result.
+
+    ``backend`` is ``"psutil"``, ``"proc"`` (``ProcStatReader``, Linux only;
+    ``ProcessInfo.process`` is then ``None``) or ``"auto"``.
+    """
+
+    def __init__(self, max_age: float = 2.0, backend: str = "auto"):
+        self.max_age = max_age
+        self.backend = default_backend() if backend == "auto" else backend
+        self._reader = ProcStatReader() if self.backend == "proc" else None
+        self._handles: dict[int, tuple[psutil.Process, str]] = {}
+        self._sample: list[ProcessInfo] = []
+        self._sampled_at: float | None = None
+        self._lock = threading.Lock()
+
+    def sample(self, max_age: float | None = None) -> list[ProcessInfo]:
+        """Return the latest sample, refreshing it if older than ``max_age``."""
+        limit = self.max_age if max_age is None else max_age
+        if self._is_fresh(limit):
+            return self._sample
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not self._is_fresh(limit):
+                self._refresh_locked()
+            return self._sample
+
+    def refresh(self) -> list[ProcessInfo]:
+        """Force a new sampling pass and return it."""
+        with self._lock:
+            self._refresh_locked()
+            return self._sample
+
+    def _is_fresh(self, limit):
+        return self._sampled_at is not None and time.monotonic() - self._sampled_at <= limit
+
+    def _refresh_locked(self):
+        if self._reader is not None:
+            self._sample = self._reader.read()
+            self._sampled_at = time.monotonic()
+            return
+        handles = {}
+        sample = []
+        for pid in psutil.pids():
+            cached = self._handles.get(pid)
+            try:
+                if cached is None or not cached[0].is_running():
+                    # New PID, or the PID was reused by a different process
+                    proc = psutil.Process(pid)
+                    exe = None
+                else:
+                    proc, exe = cached
+                with proc.oneshot():
+                    if exe is None:
+                        # The executable never changes for a process, read it once
+                        exe = _read(proc.exe, "")
+                    info = ProcessInfo(
+                        pid,
+                        _read(proc.name, ""),
+                        exe,
+                        _read(lambda: proc.cpu_percent(interval=None), 0.0),
+                        _read(lambda: proc.memory_info().rss, 0),
+                        proc,
+                        _read(proc.ppid, 0),
+                    )
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            handles[pid] = (proc, exe)
+            sample.append(info)
+        self._handles = handles
+        self._sample = sample
+        self._sampled_at = time.monotonic()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_sampler() -> ProcessSampler:
+    """Return the process-wide sampler used by the monitor and controller."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ProcessSampler()
+    return _shared
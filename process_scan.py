@@ -0,0 +1,173 @@
+"""Incremental security scan of running processes."""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_KEYWORDS = ("hack", "malware", "virus", "keylog", "spy", "trojan")
+
+
+class SignatureMatcher:
+    """Match process names and executables against many signatures at once.
+
+    ``keywords`` are compiled into a single case-insensitive regex, so the
+    cost per process barely grows with the size of the list. ``hashes`` is a
+    collection of SHA-256 hex digests of known-bad executables.
+    """
+
+    def __init__(self, keywords=DEFAULT_KEYWORDS, hashes=()):
+        self.keywords = tuple(keywords)
+        self.hashes = frozenset(h.lower() for h in hashes)
+        # Longest first so the reported keyword is the most specific one
+        ordered = sorted(set(self.keywords), key=len, reverse=True)
+        self._regex = re.compile("|".join(map(re.escape, ordered)), re.IGNORECASE) if ordered else None
+
+    def match_text(self, *texts):
+        """Return the first keyword found in ``texts`` or ``None``."""
+        if self._regex is None:
+            return None
+        for text in texts:
+            if text:
+                m = self._regex.search(text)
+                if m:
+                    return m.group(0).lower()
+        return None
+
+    def match_hash(self, digest):
+        return digest is not None and digest in self.hashes
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExeHashCache:
+    """SHA-256 of executables, cached by ``(path, size, mtime)``.
+
+    ``get`` never hashes on the caller's thread: a missing digest is queued
+    on a small thread pool and ``None`` is returned until it is ready. A
+    replaced binary has a new size or mtime and is hashed again.
+    """
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self._executor = None
+        self._digests = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.hashed = 0
+
+    @staticmethod
+    def _key(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return path, st.st_size, st.st_mtime_ns
+
+    def get(self, path):
+        """Return the cached digest of ``path`` or ``None`` while it is pending."""
+        key = self._key(path) if path else None
+        if key is None:
+            return None
+        with self._lock:
+            if key in self._digests:
+                return self._digests[key]
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._executor.submit(self._compute, key)
+        return None
+
+    def _compute(self, key):
+        try:
+            digest = _sha256(key[0])
+        except OSError:
+            digest = None
+        with self._lock:
+            self._pending.discard(key)
+            self._digests[key] = digest
+            self.hashed += 1
+
+    def wait(self, timeout=None) -> bool:
+        """Wait until no digests are pending; returns ``False`` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class ProcessScanner:
+    """Flag suspicious processes, examining each process only once.
+
+    Processes are identified by ``(pid, name, exe)`` so a reused PID counts
+    as new. ``scan`` diffs the sample against the processes already seen:
+    new ones are matched, vanished ones are forgotten and everything else is
+    skipped, so repeated scans cost a set difference between launches.
+    Hash signatures need the executable's digest, which arrives
+    asynchronously; such processes are re-checked on later scans until it
+    does.
+    """
+
+    def __init__(self, matcher=None, hash_cache=None):
+        self.matcher = matcher or SignatureMatcher()
+        self.hash_cache = hash_cache
+        if self.hash_cache is None and self.matcher.hashes:
+            self.hash_cache = ExeHashCache()
+        self._seen = set()
+        self._findings = {}
+        self._awaiting_hash = {}
+        self.examined = 0
+        self.last_scan_ms = 0.0
+
+    def _check_hash(self, key, info):
+        digest = self.hash_cache.get(info.exe)
+        if digest is None:
+            if info.exe and ExeHashCache._key(info.exe) is not None:
+                self._awaiting_hash[key] = info
+            return
+        self._awaiting_hash.pop(key, None)
+        if self.matcher.match_hash(digest):
+            self._findings[key] = {"pid": info.pid, "name": info.name, "exe": info.exe, "reason": f"sha256:{digest}"}
+
+    def scan(self, processes):
+        """Return suspicious processes among ``processes`` (``ProcessInfo``)."""
+        start = time.perf_counter()
+        current = {(p.pid, p.name, p.exe): p for p in processes}
+        keys = current.keys()
+        for key in self._seen - keys:
+            self._findings.pop(key, None)
+            self._awaiting_hash.pop(key, None)
+        new = keys - self._seen
+        self._seen = set(keys)
+
+        for key in new:
+            info = current[key]
+            self.examined += 1
+            keyword = self.matcher.match_text(info.name, info.exe)
+            if keyword:
+                self._findings[key] = {"pid": info.pid, "name": info.name, "exe": info.exe, "reason": keyword}
+            elif self.hash_cache is not None and self.matcher.hashes:
+                self._check_hash(key, info)
+        for key, info in list(self._awaiting_hash.items()):
+            if key not in new:
+                self._check_hash(key, info)
+
+        self.last_scan_ms = (time.perf_counter() - start) * 1000
+        return sorted(self._findings.values(), key=lambda f: f["pid"])
@@ -0,0 +1,383 @@
+"""Helpers that keep screen OCR cheap for ``SystemMonitor``."""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+try:
+    from PIL import ImageChops
+except Exception:  # noqa: E722 - broadly handle any import problem
+    ImageChops = None
+
+
+class ScreenChangeDetector:
+    """Find which parts of the screen changed since the previous frame.
+
+    Frames are reduced to a small grayscale thumbnail and split into a
+    ``cols`` x ``rows`` grid. A tile counts as changed when any thumbnail
+    pixel in it differs by more than ``threshold``. Changed tiles on the same
+    row are merged into one box so OCR never splits a line of text in two.
+    """
+
+    def __init__(self, cols=8, rows=8, scale=8, threshold=24):
+        self.cols = cols
+        self.rows = rows
+        self.scale = scale
+        self.threshold = threshold
+        self._previous = None
+        self._size = None
+
+    def reset(self):
+        """Forget the previous frame so the next one is fully changed."""
+        self._previous = None
+        self._size = None
+
+    def changed_regions(self, img):
+        """Return boxes ``(left, top, right, bottom)`` of ``img`` that changed."""
+        width, height = img.size
+        thumb = img.convert("L").resize(
+            (max(1, width // self.scale), max(1, height // self.scale))
+        )
+        previous, self._previous = self._previous, thumb
+        if previous is None or self._size != img.size or ImageChops is None:
+            self._size = img.size
+            return [(0, 0, width, height)]
+
+        diff = ImageChops.difference(thumb, previous)
+        tw, th = thumb.size
+        boxes = []
+        for row in range(self.rows):
+            top, bottom = row * th // self.rows, (row + 1) * th // self.rows
+            run_start = None
+            for col in range(self.cols + 1):
+                changed = False
+                if col < self.cols:
+                    left, right = col * tw // self.cols, (col + 1) * tw // self.cols
+                    if right > left and bottom > top:
+                        changed = diff.crop((left, top, right, bottom)).getextrema()[1] > self.threshold
+                if changed and run_start is None:
+                    run_start = col
+                elif not changed and run_start is not None:
+                    boxes.append((
+                        run_start * width // self.cols,
+                        row * height // self.rows,
+                        col * width // self.cols,
+                        (row + 1) * height // self.rows,
+                    ))
+                    run_start = None
+        return boxes
+
+
+class OCRPreprocessor:
+    """Shrink screenshots before OCR: crop, grayscale, downscale, binarize.
+
+    ``screen_dpi`` is the DPI of the captured pixels and ``target_dpi`` the
+    resolution to hand Tesseract; images are only ever scaled down, and
+    never wider than ``max_width`` pixels. Per-stage timings are kept so the
+    pipeline can be tuned.
+    """
+
+    STAGES = ("crop", "grayscale", "downscale", "binarize")
+
+    def __init__(self, screen_dpi=96, target_dpi=96, max_width=2560, threshold=128, binarize=True):
+        self.screen_dpi = screen_dpi
+        self.target_dpi = target_dpi
+        self.max_width = max_width
+        self.threshold = threshold
+        self.binarize = binarize
+        self._lock = threading.Lock()
+        self._totals = {stage: 0.0 for stage in self.STAGES}
+        self.last_ms = {stage: 0.0 for stage in self.STAGES}
+        self.runs = 0
+
+    def process(self, img, box=None):
+        """Return ``img`` cropped to ``box`` and prepared for OCR."""
+        timings = {}
+        start = time.perf_counter()
+        if box is not None:
+            left, top, right, bottom = box
+            width, height = img.size
+            box = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+            if box[2] > box[0] and box[3] > box[1]:
+                img = img.crop(box)
+        timings["crop"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        img = img.convert("L")
+        timings["grayscale"] = time.perf_counter() - start
+
+        # Downscale before binarizing: fewer pixels to threshold, and the
+        # result stays strictly black and white
+        start = time.perf_counter()
+        scale = min(1.0, self.target_dpi / self.screen_dpi)
+        if img.width * scale > self.max_width:
+            scale = self.max_width / img.width
+        if scale < 1.0:
+            img = img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))))
+        timings["downscale"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self.binarize:
+            threshold = self.threshold
+            img = img.point(lambda p: 255 if p > threshold else 0)
+        timings["binarize"] = time.perf_counter() - start
+
+        with self._lock:
+            self.runs += 1
+            for stage, seconds in timings.items():
+                self._totals[stage] += seconds
+                self.last_ms[stage] = seconds * 1000
+        return img
+
+    def stats(self) -> dict:
+        """Return last and average per-stage timings in milliseconds."""
+        with self._lock:
+            runs = self.runs or 1
+            return {
+                "runs": self.runs,
+                "last_ms": dict(self.last_ms),
+                "avg_ms": {stage: total * 1000 / runs for stage, total in self._totals.items()},
+            }
+
+
+class SeenLines:
+    """Remember recently recognised text lines to report only new ones."""
+
+    def __init__(self, limit=500):
+        self._order = deque()
+        self._seen = set()
+        self.limit = limit
+
+    def new_lines(self, text):
+        """Return lines of ``text`` not seen before and remember them."""
+        fresh = []
+        for line in text.splitlines():
+            line = " ".join(line.split())
+            if not line or line in self._seen:
+                continue
+            fresh.append(line)
+            self._seen.add(line)
+            self._order.append(line)
+            if len(self._order) > self.limit:
+                self._seen.discard(self._order.popleft())
+        return fresh
+
+
+try:
+    import tesserocr
+except Exception:  # noqa: E722 - broadly handle any import problem
+    tesserocr = None
+
+
+class PytesseractEngine:
+    """OCR by running the ``tesseract`` binary once per image."""
+
+    name = "pytesseract"
+
+    def __init__(self):
+        import pytesseract
+
+        tess_cmd = os.getenv("TESSERACT_CMD")
+        if tess_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tess_cmd
+        self._pytesseract = pytesseract
+
+    def image_to_string(self, img):
+        return self._pytesseract.image_to_string(img)
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine:
+    """OCR through ``tesserocr``, keeping the language model loaded.
+
+    ``pytesseract`` writes a temporary file, forks ``tesseract`` and reloads
+    the model for every image; here one ``PyTessBaseAPI`` is reused, so only
+    the first call pays the model load.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang="eng"):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+        self._lock = threading.Lock()
+
+    def image_to_string(self, img):
+        with self._lock:
+            self._api.SetImage(img)
+            return self._api.GetUTF8Text()
+
+    def close(self):
+        self._api.End()
+
+
+def create_engine(prefer="auto"):
+    """Return a long-lived engine when possible, else ``pytesseract``.
+
+    ``prefer`` may be ``"auto"``, ``"tesserocr"`` or ``"pytesseract"``.
+    """
+    if prefer in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine()
+        except Exception:
+            if prefer == "tesserocr":
+                raise
+    return PytesseractEngine()
+
+
+_worker_engines = {}
+
+
+def tesseract_image_to_string(img, engine="auto"):
+    """OCR ``img`` with this process's engine; used inside OCR workers.
+
+    The engine is created on first use and kept for the life of the worker
+    process, so a persistent backend loads its model once per worker.
+    """
+    if engine not in _worker_engines:
+        _worker_engines[engine] = create_engine(engine)
+    return _worker_engines[engine].image_to_string(img)
+
+
+def _cpu_seconds():
+    t = os.times()
+    # Children cover a ``tesseract`` subprocess run by ``pytesseract``
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _timed_ocr(func, images):
+    start = time.perf_counter()
+    cpu = _cpu_seconds()
+    texts = [func(img) for img in images]
+    return texts, time.perf_counter() - start, _cpu_seconds() - cpu
+
+
+class OCRService:
+    """Run OCR on a small worker pool so callers never block on Tesseract.
+
+    ``submit`` serves on-demand callers such as memos and returns a
+    ``Future``; at most ``max_pending`` of those may be queued. The periodic
+    screenshot loop uses ``submit_latest``: only one such job runs at a time
+    and while it runs, a newer frame replaces any frame still waiting, so a
+    slow OCR pass drops stale frames instead of building a backlog.
+    """
+
+    def __init__(self, ocr_func=tesseract_image_to_string, workers=2, max_pending=4, executor=None):
+        self.ocr_func = ocr_func
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latest_running = False
+        self._latest_waiting = None
+        self.jobs = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        # CPU time used by OCR jobs in the worker processes
+        self.cpu_seconds = 0.0
+        self.total_chars = 0
+        self.last_seconds = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _finish(self, inner):
+        texts, seconds, cpu = inner.result()
+        with self._lock:
+            self.jobs += 1
+            self.total_seconds += seconds
+            self.cpu_seconds += cpu
+            self.last_seconds = seconds
+            self.total_chars += sum(len(t.strip()) for t in texts)
+        return texts
+
+    def submit(self, img) -> Future:
+        """Queue ``img`` for OCR and return a ``Future`` for its text."""
+        outer = Future()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                outer.set_exception(RuntimeError("OCR queue is full"))
+                return outer
+            self._pending += 1
+
+        def done(inner):
+            with self._lock:
+                self._pending -= 1
+            try:
+                outer.set_result(self._finish(inner)[0])
+            except Exception as exc:
+                outer.set_exception(exc)
+
+        try:
+            self._pool().submit(_timed_ocr, self.ocr_func, [img]).add_done_callback(done)
+        except Exception as exc:
+            with self._lock:
+                self._pending -= 1
+            outer.set_exception(exc)
+        return outer
+
+    def submit_latest(self, images, callback):
+        """OCR ``images`` in the background and pass their texts to ``callback``.
+
+        If a previous frame is still being processed, ``images`` waits in a
+        single slot, replacing (and dropping) any frame already waiting there.
+        """
+        with self._lock:
+            if self._latest_running:
+                if self._latest_waiting is not None:
+                    self.dropped += 1
+                self._latest_waiting = (images, callback)
+                return
+            self._latest_running = True
+        self._start_latest(images, callback)
+
+    def _start_latest(self, images, callback):
+        def done(inner):
+            try:
+                callback(self._finish(inner))
+            except Exception:
+                pass
+            with self._lock:
+                waiting, self._latest_waiting = self._latest_waiting, None
+                if waiting is None:
+                    self._latest_running = False
+            if waiting is not None:
+                self._start_latest(*waiting)
+
+        try:
+            self._pool().submit(_timed_ocr, self.ocr_func, list(images)).add_done_callback(done)
+        except Exception:
+            with self._lock:
+                self._latest_running = False
+                self._latest_waiting = None
+
+    def stats(self) -> dict:
+        """Return job counts and timings in milliseconds."""
+        with self._lock:
+            avg = self.total_seconds / self.jobs if self.jobs else 0.0
+            return {
+                "jobs": self.jobs,
+                "pending": self._pending + (1 if self._latest_running else 0),
+                "dropped": self.dropped,
+                "rejected": self.rejected,
+                "avg_ms": avg * 1000,
+                "last_ms": (self.last_seconds or 0.0) * 1000,
+                "cpu_s": self.cpu_seconds,
+                "chars_per_ms": self.total_chars / (self.total_seconds * 1000) if self.total_seconds else 0.0,
+            }
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for queued jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
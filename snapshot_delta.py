@@ -0,0 +1,81 @@
+"""Keyframe and delta encoding for consecutive activity-log snapshots.
+
+Most snapshots repeat the previous one apart from ``timestamp``. A full
+snapshot (a keyframe) is written every ``keyframe_every`` records and the
+records in between only carry the top-level fields that changed::
+
+    {"timestamp": "...", "_delta": {"clipboard": [...]}, "_removed": ["x"]}
+
+A snapshot identical to the previous one becomes ``{"timestamp": ...,
+"_delta": {}}``, a marker meaning "unchanged since the last record".
+``expand_deltas`` turns such a stream back into full snapshots.
+"""
+
+DELTA_KEY = "_delta"
+REMOVED_KEY = "_removed"
+
+_MISSING = object()
+
+
+def is_delta(record) -> bool:
+    """Return ``True`` if ``record`` must be applied to a previous snapshot."""
+    return isinstance(record, dict) and DELTA_KEY in record
+
+
+class DeltaEncoder:
+    """Turn full snapshots into keyframes and deltas for one log segment."""
+
+    def __init__(self, keyframe_every=360):
+        self.keyframe_every = keyframe_every
+        self._base = None
+        self._since_keyframe = 0
+
+    def reset(self):
+        """Make the next snapshot a keyframe, e.g. when a new segment starts."""
+        self._base = None
+        self._since_keyframe = 0
+
+    def encode(self, record):
+        """Return ``record`` itself for a keyframe, else a delta record."""
+        if not isinstance(record, dict) or "timestamp" not in record:
+            # Not a snapshot; the reader takes it as a new base as well
+            self.reset()
+            return record
+        base = self._base
+        if base is None or not self.keyframe_every or self._since_keyframe >= self.keyframe_every:
+            self._base = record
+            self._since_keyframe = 1
+            return record
+        changed = {
+            k: v for k, v in record.items()
+            if k != "timestamp" and base.get(k, _MISSING) != v
+        }
+        delta = {"timestamp": record["timestamp"], DELTA_KEY: changed}
+        removed = [k for k in base if k not in record]
+        if removed:
+            delta[REMOVED_KEY] = removed
+        self._base = record
+        self._since_keyframe += 1
+        return delta
+
+
+def expand_deltas(records):
+    """Yield full snapshots from a stream of keyframes and deltas.
+
+    Deltas seen before any keyframe cannot be reconstructed and are skipped,
+    which happens when reading starts in the middle of a chain.
+    """
+    current = None
+    for record in records:
+        if not is_delta(record):
+            current = record
+            yield record
+            continue
+        if current is None:
+            continue
+        current = dict(current)
+        current.update(record[DELTA_KEY])
+        for key in record.get(REMOVED_KEY, ()):
+            current.pop(key, None)
+        current["timestamp"] = record["timestamp"]
+        yield current
@@ -0,0 +1,123 @@
+"""Run snapshot probes concurrently, each with its own deadline."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+OK = "ok"
+STALE = "stale"
+UNKNOWN = "unknown"
+
+
+class SectionResult:
+    """Outcome of one probe: its value, status, latency and age in seconds.
+
+    ``status`` is ``"ok"``, ``"stale"`` (the probe missed its deadline or
+    failed and ``value`` is the previous result, ``age`` seconds old) or
+    ``"unknown"`` (nothing to fall back on; ``value`` is the fallback).
+    """
+
+    __slots__ = ("value", "status", "latency", "age")
+
+    def __init__(self, value, status=OK, latency=0.0, age=0.0):
+        self.value = value
+        self.status = status
+        self.latency = latency
+        self.age = age
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+    def to_dict(self) -> dict:
+        info = {"status": self.status, "latency_ms": round(self.latency * 1000)}
+        if self.status == STALE:
+            info["age_s"] = round(self.age, 1)
+        return info
+
+    def __repr__(self):
+        return f"SectionResult({self.status}, {self.latency * 1000:.0f} ms)"
+
+
+def _timed(probe):
+    start = time.monotonic()
+    return probe(), time.monotonic() - start
+
+
+class SectionCollector:
+    """Run named probes on a small thread pool and wait for each until its deadline.
+
+    A probe still running when its deadline passes is left to finish in the
+    background and is not started again until it does, so a hung
+    subprocess ties up one worker and never more. Its finished result is
+    kept and served, marked stale, to later collections while it is late.
+    With one worker per section a stuck probe never delays the others.
+    """
+
+    def __init__(self, workers=4, deadlines=None, default_deadline=2.0):
+        self.workers = workers
+        self.deadlines = dict(deadlines or {})
+        self.default_deadline = default_deadline
+        self._executor = None
+        self._running = {}
+        self._last = {}
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.failures = 0
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="snapshot")
+        return self._executor
+
+    def _start(self, name, probe):
+        with self._lock:
+            running = self._running.get(name)
+            if running is not None and not running[0].done():
+                return running
+            entry = self._running[name] = (self._pool().submit(_timed, probe), time.monotonic())
+        entry[0].add_done_callback(lambda fut: self._finished(name, fut))
+        return entry
+
+    def _finished(self, name, fut):
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        with self._lock:
+            self._last[name] = (fut.result()[0], time.monotonic())
+
+    def _fallback(self, name, default, latency):
+        with self._lock:
+            last = self._last.get(name)
+        if last is None:
+            return SectionResult(default, UNKNOWN, latency)
+        return SectionResult(last[0], STALE, latency, time.monotonic() - last[1])
+
+    def collect(self, probes, fallbacks=None) -> dict:
+        """Run ``probes`` (name -> callable) and return name -> ``SectionResult``.
+
+        Returns once every probe has finished or reached its deadline,
+        i.e. after at most the longest deadline.
+        """
+        fallbacks = fallbacks or {}
+        begin = time.monotonic()
+        entries = {name: self._start(name, probe) for name, probe in probes.items()}
+        results = {}
+        for name, (fut, started) in entries.items():
+            deadline = begin + self.deadlines.get(name, self.default_deadline)
+            try:
+                value, seconds = fut.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                self.timeouts += 1
+                results[name] = self._fallback(name, fallbacks.get(name), time.monotonic() - started)
+            except Exception:
+                self.failures += 1
+                results[name] = self._fallback(name, fallbacks.get(name), time.monotonic() - started)
+            else:
+                results[name] = SectionResult(value, OK, seconds)
+        return results
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -2,16 +2,41 @@
 
 import sys
 import time
-from collections import deque
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 import threading
 import os
+import functools
+from concurrent.futures import Future
 
 import importlib
 import psutil
 
+from activity_log import ActivityLogWriter, query_log
+from activity_timeline import ActivityTimeline
+from app_rollup import group_processes, top_apps
+from clipboard_watch import ClipboardWatcher
+from cpu_governor import CpuGovernor, own_cpu_seconds
+from event_spill import EventSpill
+from event_store import EventKind, EventStore, INPUT_KINDS
+from file_watch import DEFAULT_EXCLUDES, FileChangeBatcher, PathFilter, plan_watches
+from focus_time import FocusTracker
+from input_ring import InputRing, MouseMoves, coalesce_input
+from process_sampler import shared_sampler
+from process_scan import DEFAULT_KEYWORDS, ProcessScanner, SignatureMatcher
+from screen_ocr import (
+    OCRPreprocessor,
+    OCRService,
+    ScreenChangeDetector,
+    SeenLines,
+    tesseract_image_to_string,
+)
+from snapshot_sections import SectionCollector
+from window_backends import default_window_backend
+
 # Additional system processes to ignore when summarizing running apps
+# Applications listed in snapshots and running-app events
+TOP_APPS = 5
+
 IGNORED_PROCESSES = {
     "",
     "System",
@@ -61,11 +86,6 @@ except Exception:  # noqa: E722 - broadly handle any import problem
     desktop = None
     Application = None
 
-try:
-    import pyperclip
-except Exception:  # noqa: E722 - broadly handle any import problem
-    pyperclip = None
-
 try:
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
@@ -91,31 +111,166 @@ try:
 except Exception:  # noqa: E722 - broadly handle any import problem
     pytesseract = None
 
+# Seconds each snapshot probe may take before its previous result is used
+SECTION_DEADLINES = {
+    "active_window": 2.5,
+    "open_windows": 2.5,
+    "processes": 2.0,
+    "ui_text": 1.0,
+}
+
+# Values reported for a probe that is late and has never succeeded
+SECTION_FALLBACKS = {
+    "active_window": ("Unknown Window", "Unknown App"),
+    "open_windows": [],
+    "processes": [],
+    "ui_text": [],
+}
+
+
+class SnapshotFrame:
+    """Probe results shared by every report rendered within one tick."""
+
+    __slots__ = (
+        "tick", "created", "title", "app", "open_windows", "processes", "apps", "ui_text", "sections",
+    )
+
+    def __init__(self, tick, created, title, app, open_windows, processes, apps=(), ui_text=(), sections=None):
+        self.tick = tick
+        self.created = created
+        self.title = title
+        self.app = app
+        self.open_windows = open_windows
+        self.processes = processes
+        self.apps = list(apps)
+        self.ui_text = list(ui_text)
+        # Probe name -> ``SectionResult`` with its status and latency
+        self.sections = sections or {}
+
+    @property
+    def stale(self) -> bool:
+        """``True`` if any probe missed its deadline."""
+        return any(not r.ok for r in self.sections.values())
+
+
 class SystemMonitor:
     """Tracks active window, inputs, clipboard, screenshots and optional file events."""
 
-    def __init__(self, history_seconds=30, watch_paths=None, screenshot_interval=5, log_path="activity_log.jsonl"):
+    def __init__(
+        self,
+        history_seconds=30,
+        watch_paths=None,
+        screenshot_interval=5,
+        log_path="activity_log.jsonl",
+        process_sampler=None,
+        frame_ttl=2.0,
+        section_deadlines=None,
+        cpu_budget=0.02,
+        window_backend=None,
+        ocr_workers=2,
+        ocr_timeout=30.0,
+        ocr_engine="auto",
+        ocr_crop="active_window",
+        log_format="jsonl",
+        input_interval=1.0,
+        max_events=100_000,
+        max_event_bytes=16 * 1024 * 1024,
+        event_spill_path="event_spill.alog",
+        focus_db_path="focus_time.db",
+        clipboard_interval=1.0,
+        watch_include=None,
+        watch_exclude=DEFAULT_EXCLUDES,
+        watch_debounce=2.0,
+        max_watches=4096,
+        scan_keywords=DEFAULT_KEYWORDS,
+        scan_hashes=(),
+    ):
         self.history_seconds = history_seconds
-        self.events = deque()
+        # Events beyond the caps spill to disk; see ``events.metrics()``
+        self.events = EventStore(
+            max_events=max_events,
+            max_bytes=max_event_bytes,
+            spill=EventSpill(event_spill_path) if event_spill_path else None,
+        )
+        # Per-second activity counts that outlive ``history_seconds``
+        self.timeline = ActivityTimeline()
+        # Focus dwell time per app and title, rolled up by hour and day
+        self.focus_time = FocusTracker(focus_db_path) if focus_db_path else None
         self.log_path = log_path
+        # Snapshots are queued and written by a background thread
+        self.log_writer = ActivityLogWriter(log_path, format=log_format)
+        self.process_sampler = process_sampler or shared_sampler()
+        # Only processes not seen by a previous scan are examined
+        self.process_scanner = ProcessScanner(SignatureMatcher(scan_keywords, scan_hashes))
+
+        # Window, process and clipboard probes are cached per tick so that
+        # ``capture_snapshot`` followed by ``summarize`` runs them only once
+        self.frame_ttl = frame_ttl
+        self._frame = None
+        self._frame_tick = 0
+        self._frame_lock = threading.Lock()
+        # Collectors charge their CPU time here; over ``cpu_budget`` (a
+        # fraction of one core) OCR, process scans and window probes slow down
+        self.governor = CpuGovernor(cpu_budget, cpu=self._own_cpu_seconds)
+        # Probes run in parallel; a hung one is reported stale, not waited on
+        self.collector = SectionCollector(
+            workers=len(SECTION_DEADLINES),
+            deadlines={**SECTION_DEADLINES, **(section_deadlines or {})},
+        )
+
+        self.window_backend = window_backend or default_window_backend()
+        if hasattr(self.window_backend, "watch"):
+            self.window_backend.watch(self._on_focus_change)
 
         self.screenshot_interval = screenshot_interval
         self._stop = threading.Event()
         self._screenshot_thread = None
-
-        try:
-            self._last_clipboard = pyperclip.paste() if pyperclip else ""
-        except Exception:
-            self._last_clipboard = ""
-
+        self._screen_changes = ScreenChangeDetector()
+        self._seen_ocr = SeenLines()
+        # ``ocr_crop`` is "active_window", None for the full screen, or a box
+        self.ocr_crop = ocr_crop
+        self.ocr_preprocessor = OCRPreprocessor()
+        # Memos and the screenshot loop share one OCR pool. Each worker keeps
+        # its engine (``tesserocr`` when installed) alive between images.
+        self.ocr = None
+        if pytesseract:
+            self.ocr = OCRService(
+                functools.partial(tesseract_image_to_string, engine=ocr_engine),
+                workers=ocr_workers,
+            )
+        self.ocr_timeout = ocr_timeout
+
+        # Clipboard reads may fork xclip/xsel, so they happen on the watcher's
+        # thread; events keep only a hash, the length and a preview
+        self.clipboard = ClipboardWatcher(self._on_clipboard, interval=clipboard_interval)
+        self.clipboard.start()
+
+        # Hooks only push raw tuples; ``_input_loop`` turns them into events
+        # and folds mouse moves into one aggregate per ``input_interval``
+        self.input_ring = InputRing()
+        self.input_interval = input_interval
+        self._input_lock = threading.Lock()
+        self._input_thread = None
         if keyboard:
             keyboard.hook(self._on_keyboard)
         if mouse:
             mouse.hook(self._on_mouse)
+        if keyboard or mouse:
+            self._input_thread = threading.Thread(target=self._input_loop, daemon=True)
+            self._input_thread.start()
 
         self.observer = None
+        self.file_changes = None
         if watch_paths and Observer:
             self.observer = Observer()
+            # Never report the monitor's own log and spill writes
+            own_outputs = tuple(
+                os.path.basename(p) + "*" for p in (log_path, event_spill_path, focus_db_path) if p
+            )
+            self.file_changes = FileChangeBatcher(
+                PathFilter(watch_include, tuple(watch_exclude or ()) + own_outputs, watch_paths),
+                debounce=watch_debounce,
+            )
 
             class _Handler(FileSystemEventHandler):
                 def __init__(self, outer):
@@ -124,19 +279,20 @@ class SystemMonitor:
 
                 def on_modified(self, event):
                     if not event.is_directory:
-                        self.outer._record(
-                            f"Modified file: {event.src_path}"
+                        self.outer.file_changes.add(
+                            EventKind.FILE_MODIFIED, event.src_path
                         )
 
                 def on_created(self, event):
                     if not event.is_directory:
-                        self.outer._record(
-                            f"Created file: {event.src_path}"
+                        self.outer.file_changes.add(
+                            EventKind.FILE_CREATED, event.src_path
                         )
 
             handler = _Handler(self)
-            for path in watch_paths:
-                self.observer.schedule(handler, path, recursive=True)
+            # inotify needs a watch per directory; stay within ``max_watches``
+            for path, recursive in plan_watches(watch_paths, max_watches, self.file_changes.filter):
+                self.observer.schedule(handler, path, recursive=recursive)
             self.observer.start()
 
         if pytesseract and (ImageGrab or pyautogui):
@@ -145,35 +301,111 @@ class SystemMonitor:
             )
             self._screenshot_thread.start()
 
-    def _record(self, message):
-        """Add a timestamped event message."""
-        self.events.append((time.time(), message))
+    def _record(self, kind, payload="", timestamp=None):
+        """Add a timestamped event of ``kind`` and count it in the timeline."""
+        if timestamp is None:
+            timestamp = time.time()
+        self.events.append(kind, payload, timestamp=timestamp)
+        self.timeline.observe(kind, payload, timestamp)
 
     def _on_keyboard(self, event):
-        self._record(f"Pressed key: {event.name}")
+        self.input_ring.push((EventKind.KEY, time.time(), event))
 
     def _on_mouse(self, event):
-        event_type = getattr(event, "event_type", None) or event.__class__.__name__
-        message = f"Mouse {event_type}"
-        if hasattr(event, "delta"):
-            message += f" delta={event.delta}"
-        self._record(message)
+        self.input_ring.push((EventKind.MOUSE, time.time(), event))
+
+    def _drain_input(self):
+        """Move queued hook events into ``self.events``."""
+        with self._input_lock, self.governor.measure("input"):
+            items = self.input_ring.drain()
+            for timestamp, kind, payload in coalesce_input(items, self.input_interval):
+                self._record(kind, payload, timestamp)
+
+    def _input_loop(self):
+        while not self._stop.wait(self.input_interval):
+            self._drain_input()
+            self.governor.update()
+
+    def _mouse_move_count(self):
+        return sum(
+            e.payload.count if isinstance(e.payload, MouseMoves) else 1
+            for e in self.events.of_kind(EventKind.MOUSE_MOVE)
+        )
+
+    def _on_focus_change(self):
+        """Handle a focus change pushed by the window backend."""
+        self.invalidate_frame()
+        title, app = self._get_active_window_info()
+        self._record(EventKind.ACTIVE_WINDOW, f"{title} ({app})")
+        if self.focus_time is not None:
+            self.focus_time.focus(app, title)
+
+    def _drain_files(self):
+        """Record file changes that have settled for the debounce window."""
+        if self.file_changes is None:
+            return
+        with self.governor.measure("files"):
+            for timestamp, kind, payload in self.file_changes.flush():
+                self._record(kind, payload, timestamp)
 
     def _prune_history(self):
-        cutoff = time.time() - self.history_seconds
-        while self.events and self.events[0][0] < cutoff:
-            self.events.popleft()
+        self._drain_input()
+        self._drain_files()
+        self.events.prune(time.time() - self.history_seconds)
 
-    def _check_clipboard(self):
-        if not pyperclip:
-            return
-        try:
-            current = pyperclip.paste()
-        except Exception:
-            return
-        if current != self._last_clipboard:
-            self._last_clipboard = current
-            self._record(f"Copied text: '{current}'")
+    def activity_rate(self, channel="keys", window=3600.0, per=60.0) -> float:
+        """Return ``channel`` events per ``per`` seconds over the last ``window`` seconds.
+
+        ``channel`` is one of ``activity_timeline.CHANNELS``; the default is
+        keys per minute over the last hour.
+        """
+        self._prune_history()
+        now = time.time()
+        return self.timeline.rate(channel, now - window, now, per)
+
+    def idle_periods(self, window=3600.0, min_idle=300.0):
+        """Return ``(start, end)`` spans without keyboard or mouse input."""
+        self._prune_history()
+        now = time.time()
+        return self.timeline.idle_periods(now - window, now, min_idle)
+
+    def focus_report(self, period="today", by="app", k=10):
+        """Return ``[(name, seconds)]`` of the most focused apps or windows.
+
+        ``period`` is ``"today"``, ``"week"`` (since Monday) or a start time
+        in epoch seconds; ``by`` is ``"app"``, ``"title"`` or ``"window"``.
+        """
+        if self.focus_time is None:
+            return []
+        start = period
+        if period in ("today", "week"):
+            day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            if period == "week":
+                day -= timedelta(days=day.weekday())
+            start = day.timestamp()
+        return self.focus_time.top(start, by=by, k=k)
+
+    def _measured(self, name, probe, *args, **kwargs):
+        with self.governor.measure(name):
+            return probe(*args, **kwargs)
+
+    def _own_cpu_seconds(self):
+        ocr = getattr(self, "ocr", None)
+        return own_cpu_seconds() + (ocr.cpu_seconds if ocr is not None else 0.0)
+
+    def cost_breakdown(self) -> dict:
+        """Return the monitor's CPU use per collector and the governor's state.
+
+        ``usage`` and ``average`` are fractions of one core (recent and
+        overall), ``scales`` the factor each throttled collector's interval
+        is stretched by and ``collectors`` the CPU seconds, runs and share
+        of each collector: ``ocr``, ``processes``, ``windows``, ``ui_text``,
+        ``input`` and ``files``.
+        """
+        return self.governor.breakdown()
+
+    def _on_clipboard(self, entry):
+        self._record(EventKind.CLIPBOARD, entry)
 
     def _get_active_window_info(self):
         """Return the active window title and application name.
@@ -221,38 +453,18 @@ class SystemMonitor:
             except Exception:
                 pass
 
-        # On non-Windows systems, attempt native utilities if pywin32 is absent
+        # On non-Windows systems, ask the platform window backend
         if not sys.platform.startswith("win") and title == "Unknown Window":
             try:
-                import subprocess
-                import re
-                if sys.platform.startswith("linux"):
-                    active = subprocess.check_output(
-                        ["xprop", "-root", "_NET_ACTIVE_WINDOW"], text=True
-                    )
-                    m = re.search(r"window id # (0x[0-9a-fA-F]+)", active)
-                    if m:
-                        wid = m.group(1)
-                        pid_out = subprocess.check_output(
-                            ["xprop", "-id", wid, "_NET_WM_PID"], text=True
-                        )
-                        pid = int(pid_out.strip().split()[-1])
-                        title_out = subprocess.check_output(
-                            ["xprop", "-id", wid, "WM_NAME"], text=True
-                        )
-                        title = title_out.split("=", 1)[-1].strip().strip('"') or title
+                info = self.window_backend.active_window()
+                if info:
+                    native_title, native_app, native_pid = info
+                    title = native_title or title
+                    pid = native_pid or pid
+                    if native_app:
+                        app = native_app
+                    elif pid:
                         app = psutil.Process(pid).name()
-                elif sys.platform == "darwin":
-                    script_app = (
-                        'tell application "System Events" to get name of first '
-                        'process whose frontmost is true'
-                    )
-                    app = subprocess.check_output(["osascript", "-e", script_app], text=True).strip() or app
-                    script_title = (
-                        'tell application "System Events" to tell (process 1 whose '
-                        'frontmost is true) to get title of front window'
-                    )
-                    title = subprocess.check_output(["osascript", "-e", script_title], text=True).strip() or title
             except Exception:
                 pass
 
@@ -265,6 +477,44 @@ class SystemMonitor:
 
         return title, app
 
+    def _get_active_window_rect(self):
+        """Return ``(left, top, right, bottom)`` of the active window if known."""
+        if gw:
+            try:
+                win = gw.getActiveWindow()
+                if win and win.width > 0 and win.height > 0:
+                    return win.left, win.top, win.left + win.width, win.top + win.height
+            except Exception:
+                pass
+        if sys.platform.startswith("win") and win32gui:
+            try:
+                hwnd = win32gui.GetForegroundWindow()
+                if hwnd:
+                    return tuple(win32gui.GetWindowRect(hwnd))
+            except Exception:
+                pass
+        backend = getattr(self, "window_backend", None)
+        if hasattr(backend, "active_window_rect"):
+            try:
+                return backend.active_window_rect()
+            except Exception:
+                pass
+        return None
+
+    def _prepare_for_ocr(self, img):
+        """Crop and preprocess a screenshot according to ``ocr_crop``."""
+        box = self.ocr_crop
+        if box == "active_window":
+            box = self._get_active_window_rect()
+        return self.ocr_preprocessor.process(img, box)
+
+    def ocr_metrics(self):
+        """Return preprocessing stage timings and OCR throughput."""
+        return {
+            "preprocess": self.ocr_preprocessor.stats(),
+            "ocr": self.ocr.stats() if self.ocr else {},
+        }
+
     def list_open_windows(self):
         """Return a list of window titles currently open on the system."""
         titles = []
@@ -281,25 +531,11 @@ class SystemMonitor:
             except Exception:
                 titles = []
 
-        if not titles:
+        if not titles and not sys.platform.startswith("win"):
             try:
-                import subprocess
-                if sys.platform.startswith("linux"):
-                    out = subprocess.check_output(["wmctrl", "-l"], text=True)
-                    for line in out.splitlines():
-                        parts = line.split(None, 3)
-                        if len(parts) == 4:
-                            titles.append(parts[3])
-                elif sys.platform == "darwin":
-                    script = (
-                        'tell application "System Events" to get the title of every window of every process whose visible is true'
-                    )
-                    out = subprocess.check_output(["osascript", "-e", script], text=True)
-                    for t in out.strip().split(", "):
-                        if t and t != "missing value":
-                            titles.append(t)
+                titles = self.window_backend.list_windows()
             except Exception:
-                pass
+                titles = []
 
         seen = []
         for t in titles:
@@ -337,20 +573,76 @@ class SystemMonitor:
         return img
 
     def _capture_screen(self):
+        """OCR the parts of the screen that changed and record new text."""
         img = self._take_screenshot()
-        if img and pytesseract:
-            try:
-                text = pytesseract.image_to_string(img)
-            except Exception:
-                text = ""
-            if text.strip():
-                snippet = text.strip().replace("\n", " ")[:200]
-                self._record(f"Screen OCR: {snippet}")
+        if not img or not self.ocr:
+            return
+        img = self._prepare_for_ocr(img)
+        regions = self._screen_changes.changed_regions(img)
+        if regions:
+            self.ocr.submit_latest([img.crop(box) for box in regions], self._on_ocr_result)
+
+    def _on_ocr_result(self, texts):
+        lines = self._seen_ocr.new_lines("\n".join(texts))
+        if lines:
+            self._record(EventKind.OCR, " ".join(lines)[:200])
+
+    def current_frame(self) -> SnapshotFrame:
+        """Return the probe results for this tick, collecting them if stale."""
+        # Window probes are the last collectors the governor slows down
+        ttl = self.frame_ttl * self.governor.scale("windows")
+        frame = self._frame
+        if frame is not None and time.monotonic() - frame.created <= ttl:
+            return frame
+        with self._frame_lock:
+            frame = self._frame
+            if frame is None or time.monotonic() - frame.created > ttl:
+                frame = self._collect_frame()
+                self._frame = frame
+        return frame
+
+    def invalidate_frame(self):
+        """Force the next report to probe the system again."""
+        self._frame = None
+
+    def _collect_frame(self):
+        self.governor.update()
+        # A slowed-down process collector reuses older samples
+        scale = self.governor.scale("processes")
+        max_age = self.frame_ttl * scale if scale > 1 else None
+        sections = self.collector.collect(
+            {
+                "active_window": functools.partial(self._measured, "windows", self._get_active_window_info),
+                "open_windows": functools.partial(self._measured, "windows", self.list_open_windows),
+                "processes": functools.partial(
+                    self._measured, "processes", self.process_sampler.sample, max_age=max_age
+                ),
+                "ui_text": functools.partial(self._measured, "ui_text", self._extract_ui_text),
+            },
+            SECTION_FALLBACKS,
+        )
+        title, app = sections["active_window"].value
+        if self.focus_time is not None and sections["active_window"].ok:
+            self.focus_time.focus(app, title)
+        processes = sections["processes"].value
+        apps = group_processes(processes, IGNORED_PROCESSES)
+        self._frame_tick += 1
+        return SnapshotFrame(
+            self._frame_tick, time.monotonic(), title, app, sections["open_windows"].value,
+            processes, apps, sections["ui_text"].value, sections,
+        )
 
     def _screenshot_loop(self):
+        ocr_cpu = 0.0
         while not self._stop.is_set():
-            self._capture_screen()
-            for _ in range(self.screenshot_interval):
+            with self.governor.measure("ocr"):
+                self._capture_screen()
+            # OCR itself runs in worker processes, which report their CPU time
+            if self.ocr is not None:
+                self.governor.charge("ocr", self.ocr.cpu_seconds - ocr_cpu, calls=0)
+                ocr_cpu = self.ocr.cpu_seconds
+            self.governor.update()
+            for _ in range(self.screenshot_interval * self.governor.scale("ocr")):
                 if self._stop.is_set():
                     break
                 time.sleep(1)
@@ -361,52 +653,26 @@ class SystemMonitor:
         Parameters
         ----------
         sort_by : {"cpu", "memory"}, optional
-            When provided, processes are sorted by the given metric in
-            descending order to better surface active applications.
+            When provided, applications are ranked by the given metric in
+            descending order to better surface active ones.
         """
         self._prune_history()
-        self._check_clipboard()
-
-        title, app = self._get_active_window_info()
-        ui_texts = self._extract_ui_text()
+        frame = self.current_frame()
+        ui_texts = frame.ui_text
 
-        self._record(f"Active window: {title} ({app})")
+        self._record(EventKind.ACTIVE_WINDOW, f"{frame.title} ({frame.app})")
         if ui_texts:
-            snippet = ", ".join(ui_texts[:5])
-            self._record(f"Visible elements: {snippet}")
-
-        metrics: list[tuple[float, str]] = []
-        for proc in psutil.process_iter(["name"]):
-            try:
-                name = proc.info.get("name") or ""
-                if name in IGNORED_PROCESSES:
-                    continue
-                metric = 0.0
-                if sort_by == "cpu":
-                    try:
-                        metric = proc.cpu_percent(interval=None)
-                    except Exception:
-                        metric = 0.0
-                elif sort_by == "memory":
-                    try:
-                        metric = proc.memory_info().rss
-                    except Exception:
-                        metric = 0.0
-                metrics.append((metric, name))
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-            except Exception:
-                continue
+            self._record(EventKind.UI_TEXT, ", ".join(ui_texts[:5]))
 
         if sort_by in {"cpu", "memory"}:
-            metrics.sort(key=lambda x: x[0], reverse=True)
-
-        names = [name for _, name in metrics]
-        self._record(f"Running apps: {names[:5]}")
+            apps = top_apps(frame.apps, TOP_APPS, by=sort_by)
+        else:
+            apps = frame.apps[:TOP_APPS]
+        self._record(EventKind.RUNNING_APPS, str([a.name for a in apps]))
 
-        windows = self.list_open_windows()
+        windows = frame.open_windows
         if windows:
-            self._record(f"Open windows: {windows[:5]}")
+            self._record(EventKind.OPEN_WINDOWS, str(windows[:5]))
 
         snapshot = self.to_json()
         self._append_to_log(snapshot)
@@ -415,60 +681,22 @@ class SystemMonitor:
     def summarize(self):
         """Return a plain-language summary of recent events."""
         self._prune_history()
-        self._check_clipboard()
-
-        title, app = self._get_active_window_info()
-
-        key_count = 0
-        move_count = 0
-        clipboard_text = None
-        for _, msg in self.events:
-            if msg.startswith("Pressed key"):
-                key_count += 1
-            elif msg.startswith("Mouse move"):
-                move_count += 1
-            elif msg.startswith("Copied text:"):
-                clipboard_text = msg[13:-1]
-
-        metrics: list[tuple[float, str]] = []
-        for proc in psutil.process_iter(["name"]):
-            try:
-                name = proc.info.get("name") or ""
-                if name in IGNORED_PROCESSES:
-                    continue
-                cpu = 0.0
-                mem = 0.0
-                try:
-                    cpu = proc.cpu_percent(interval=None)
-                except Exception:
-                    cpu = 0.0
-                if not cpu:
-                    try:
-                        mem = proc.memory_info().rss
-                    except Exception:
-                        mem = 0.0
-                metric = cpu or mem
-                metrics.append((metric, name))
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-            except Exception:
-                continue
-
-        metrics.sort(key=lambda x: x[0], reverse=True)
+        frame = self.current_frame()
 
-        names = []
-        for _, name in metrics:
-            if name not in names:
-                names.append(name)
+        key_count = self.events.count(EventKind.KEY)
+        move_count = self._mouse_move_count()
+        last_copy = self.events.latest(EventKind.CLIPBOARD)
+        clipboard_text = str(last_copy.payload) if last_copy else None
 
-        first = names[:2]
-        remaining = len(names) - len(first)
+        # Rank by CPU; memory only breaks ties between equally busy apps
+        first = [a.name for a in top_apps(frame.apps, 2)]
+        remaining = len(frame.apps) - len(first)
         if remaining > 0:
             apps_summary = f"{', '.join(first)}, and {remaining} other{'s' if remaining != 1 else ''}"
         else:
             apps_summary = ", ".join(first)
 
-        parts = [f"Focused window: {title} ({app})."]
+        parts = [f"Focused window: {frame.title} ({frame.app})."]
 
         events = []
         if key_count:
@@ -481,7 +709,7 @@ class SystemMonitor:
             parts.append(f"Clipboard: '{clipboard_text}'.")
         if apps_summary:
             parts.append(f"Running apps: {apps_summary}.")
-        windows = self.list_open_windows()
+        windows = frame.open_windows
         if windows:
             parts.append(f"Open windows: {', '.join(windows[:3])}.")
 
@@ -490,42 +718,38 @@ class SystemMonitor:
     def to_json(self):
         """Return a structured summary of recent events."""
         self._prune_history()
+        frame = self.current_frame()
 
-        title, app = self._get_active_window_info()
-
-        clipboard = [
-            e[1][13:-1]
-            for e in self.events
-            if e[1].startswith("Copied text:")
-        ]
-        inputs = [
-            e[1]
-            for e in self.events
-            if e[1].startswith("Pressed key") or e[1].startswith("Mouse")
-        ]
-        ocr = [
-            e[1][12:]
-            for e in self.events
-            if e[1].startswith("Screen OCR:")
-        ]
-        windows = self.list_open_windows()
-
+        clipboard = [str(e.payload) for e in self.events.of_kind(EventKind.CLIPBOARD)]
+        inputs = [e.message for e in self.events.of_kind(*INPUT_KINDS)]
+        ocr = [e.payload for e in self.events.of_kind(EventKind.OCR)]
         return {
             "timestamp": datetime.now().isoformat(),
-            "active_window": {"title": title, "app": app},
+            "active_window": {"title": frame.title, "app": frame.app},
             "clipboard": clipboard,
             "input_events": inputs,
             "ocr_snippets": ocr,
-            "open_windows": windows,
+            "open_windows": frame.open_windows,
+            "apps": [a.to_dict() for a in top_apps(frame.apps, TOP_APPS)],
+            "sections": {name: r.to_dict() for name, r in frame.sections.items()},
+            "stale": frame.stale,
         }
 
     def _append_to_log(self, data):
-        try:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                json.dump(data, f)
-                f.write("\n")
-        except Exception:
-            pass
+        self.log_writer.write(data)
+
+    def query_log(self, start, end, fields=None):
+        """Yield logged snapshots between ``start`` and ``end``.
+
+        Parameters
+        ----------
+        start, end : datetime or float
+            Inclusive time range as ``datetime`` objects or epoch seconds.
+        fields : iterable of str, optional
+            Keys to keep in each yielded snapshot; all keys by default.
+        """
+        self.log_writer.flush()
+        return query_log(self.log_writer.path, start, end, fields)
 
     def __del__(self):
         self._stop.set()
@@ -534,17 +758,43 @@ class SystemMonitor:
         if self.observer:
             self.observer.stop()
             self.observer.join()
+        if getattr(self, "log_writer", None):
+            self.log_writer.close(timeout=0.5)
+        if getattr(self, "ocr", None):
+            self.ocr.shutdown()
+        if getattr(self, "clipboard", None):
+            self.clipboard.stop()
+        if getattr(self, "focus_time", None):
+            self.focus_time.close()
+        if getattr(self, "collector", None):
+            self.collector.shutdown()
+        if getattr(getattr(self, "process_scanner", None), "hash_cache", None):
+            self.process_scanner.hash_cache.shutdown()
+        if getattr(getattr(self, "events", None), "spill", None):
+            self.events.spill.close()
+        if hasattr(getattr(self, "window_backend", None), "close"):
+            self.window_backend.close()
 
 
     def capture_screen_text(self):
         """Return OCR text from a screenshot if possible."""
+        try:
+            return self.capture_screen_text_async().result(timeout=self.ocr_timeout).strip()
+        except Exception:
+            return ""
+
+    def capture_screen_text_async(self):
+        """Return a ``Future`` for the OCR text of a new screenshot.
+
+        OCR runs on the shared worker pool, so the caller's thread is free
+        until it asks for the result.
+        """
         img = self._take_screenshot()
-        if img and pytesseract:
-            try:
-                return pytesseract.image_to_string(img).strip()
-            except Exception:
-                return ""
-        return ""
+        if img and self.ocr:
+            return self.ocr.submit(self._prepare_for_ocr(img))
+        fut = Future()
+        fut.set_result("")
+        return fut
 
     def save_screen_memo(self, label=None, directory="ai_memos", allow_empty=False):
         """Capture screen text and save to a memo file.
@@ -568,18 +818,6 @@ class SystemMonitor:
         return False
 
     def scan_processes(self):
-        """Return a list of suspicious processes using simple heuristics."""
-        keywords = ["hack", "malware", "virus", "keylog", "spy", "trojan"]
-        suspicious = []
-        for proc in psutil.process_iter(["pid", "name", "exe"]):
-            try:
-                info = proc.info
-                name = (info.get("name") or "").lower()
-                exe = (info.get("exe") or "").lower()
-                if any(k in name or k in exe for k in keywords):
-                    suspicious.append(info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-            except Exception:
-                continue
-        return suspicious
+        """Return suspicious processes matching the keyword or hash signatures."""
+        with self.governor.measure("processes"):
+            return self.process_scanner.scan(self.process_sampler.sample())
@@ -0,0 +1,137 @@
+import gzip
+import json
+
+from activity_log import ActivityLogWriter
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_write_is_batched_until_flush(tmp_path):
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=100, flush_interval=60)
+    for i in range(3):
+        assert writer.write({"n": i})
+    assert not path.exists()
+
+    assert writer.flush()
+    assert _lines(path) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    metrics = writer.metrics()
+    assert metrics["records_written"] == 3
+    assert metrics["queue_depth"] == 0
+    writer.close()
+
+
+def test_batch_size_triggers_write(tmp_path):
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=2, flush_interval=60, fsync="batch")
+    writer.write({"n": 0})
+    writer.write({"n": 1})
+    writer.close()
+    assert len(_lines(path)) == 2
+
+
+def test_rotates_by_size_and_compresses(tmp_path):
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1, flush_interval=60, max_bytes=40, keep_segments=2)
+    for i in range(5):
+        writer.write({"value": "x" * 20, "n": i})
+        writer.flush()
+    writer.close()
+
+    segments = writer.segments()
+    assert len(segments) == 2
+    assert all(s.endswith(".jsonl.gz") for s in segments)
+    with gzip.open(segments[-1], "rt") as f:
+        assert json.loads(f.readline())["n"] == 3
+    assert _lines(path) == [{"value": "x" * 20, "n": 4}]
+    assert writer.metrics()["rotations"] == 4
+
+
+def test_rotates_on_new_day(tmp_path):
+    import datetime
+
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1, flush_interval=60, compress=None)
+    writer.write({"n": 0})
+    writer.flush()
+    writer._day = datetime.date(2000, 1, 1)
+    writer.write({"n": 1})
+    writer.close()
+
+    assert len(writer.segments()) == 1
+    assert _lines(path) == [{"n": 1}]
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    import queue
+
+    writer = ActivityLogWriter(tmp_path / "log.jsonl", flush_interval=60)
+    live_queue = writer._queue
+    # The writer thread keeps waiting on the live queue, so this one stays full
+    writer._queue = queue.Queue(maxsize=1)
+    assert writer.write({"n": 0})
+    assert not writer.write({"n": 1})
+    assert writer.metrics()["dropped"] == 1
+    writer._queue = live_queue
+    writer.close()
+
+
+def _snapshot(ts, n):
+    from datetime import datetime
+
+    return {"timestamp": datetime.fromtimestamp(ts).isoformat(), "n": n, "active_window": {"title": "t"}}
+
+
+def test_query_uses_index_and_filters_fields(tmp_path):
+    from activity_log import LogIndex, query_log
+
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60)
+    base = 1_700_000_040  # start of an index bucket
+    for i in range(600):
+        writer.write(_snapshot(base + i * 10, i))
+    writer.flush()
+
+    index = LogIndex(path)
+    assert index.load()
+    assert len(index.buckets) == 100
+
+    rows = list(query_log(path, base + 1000, base + 1100, fields=["n"]))
+    assert rows == [{"n": n} for n in range(100, 111)]
+    writer.close()
+
+
+def test_index_rebuilt_when_missing(tmp_path):
+    import os
+
+    from activity_log import query_log
+
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60)
+    base = 1_700_000_000
+    for i in range(50):
+        writer.write(_snapshot(base + i * 30, i))
+    writer.close()
+
+    os.remove(str(path) + ".idx")
+    rows = list(query_log(path, base + 300, base + 360, fields=["n"]))
+    assert [r["n"] for r in rows] == [10, 11, 12]
+    assert os.path.exists(str(path) + ".idx")
+
+
+def test_query_reads_rotated_segments(tmp_path):
+    from activity_log import query_log
+
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1, flush_interval=60, max_bytes=200)
+    base = 1_700_000_000
+    for i in range(10):
+        writer.write(_snapshot(base + i, i))
+        writer.flush()
+    writer.close()
+
+    assert writer.segments()
+    rows = list(query_log(path, base + 2, base + 8, fields=["n"]))
+    assert [r["n"] for r in rows] == list(range(2, 9))
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+import activity_timeline
+from activity_timeline import ActivityTimeline
+from event_store import EventKind
+from input_ring import MouseMoves
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def timeline(request, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(activity_timeline, "np", None)
+    elif activity_timeline.np is None:
+        pytest.skip("numpy is not installed")
+    return ActivityTimeline()
+
+
+def test_counts_per_second_and_rate(timeline):
+    now = time.time()
+    for i in range(120):
+        timeline.add("keys", now - 60 + i * 0.5)
+    starts, counts = timeline.series("keys", now - 60, now)
+    assert list(counts).count(2) >= 58
+    assert timeline.total("keys", now - 61, now) == 120
+    assert timeline.rate("keys", now - 3600, now) == pytest.approx(2.0)
+
+
+def test_tiers_keep_history_beyond_the_second_ring(timeline):
+    now = time.time()
+    timeline.add("keys", now - 2 * 3600, count=30)
+    timeline.add("keys", now, count=1)
+    # The per-second ring no longer holds the old bucket...
+    assert timeline.series("keys", now - 3 * 3600, now, resolution=1)[1][0] == 0
+    # ...but the minute and hour tiers do
+    assert timeline.total("keys", now - 3 * 3600, now) == 31
+    starts, counts = timeline.series("keys", now - 3 * 3600, now, resolution=3600)
+    assert sum(counts) == 31
+
+
+def test_ring_reuse_clears_old_counts(timeline):
+    base = 1_000_000.0
+    timeline.add("mouse", base, count=5)
+    timeline.add("mouse", base + 3600, count=1)  # same row, one lap later
+    assert timeline.series("mouse", base + 3600, base + 3600, resolution=1)[1][0] == 1
+    assert timeline.series("mouse", base, base, resolution=1)[1][0] == 0
+    timeline.add("mouse", base, count=5)  # too old for the second ring now
+    assert timeline.series("mouse", base + 3600, base + 3600, resolution=1)[1][0] == 1
+
+
+def test_observe_maps_event_kinds(timeline):
+    now = time.time()
+    moves = MouseMoves()
+    for i in range(7):
+        moves.add(i, i)
+    timeline.observe(EventKind.MOUSE_MOVE, moves, now)
+    timeline.observe(EventKind.FILES_CHANGED, "12 files changed under src/", now)
+    timeline.observe(EventKind.FILE_MODIFIED, "a.py", now)
+    timeline.observe(EventKind.OCR, "text", now)
+    for title in ("A", "A", "B", "A"):
+        timeline.observe(EventKind.ACTIVE_WINDOW, title, now)
+    assert timeline.total("mouse", now - 1, now) == 7
+    assert timeline.total("files", now - 1, now) == 13
+    assert timeline.total("focus", now - 1, now) == 2
+    assert timeline.total(None, now - 1, now) == 22
+
+
+def test_idle_periods(timeline):
+    now = time.time()
+    timeline.add("keys", now - 1800)
+    timeline.add("mouse", now - 600)
+    periods = timeline.idle_periods(now - 3000, now, min_idle=900)
+    assert len(periods) == 2
+    (a0, a1), (b0, b1) = periods
+    assert a0 == now - 3000 and a1 == pytest.approx(now - 1800, abs=1)
+    assert b0 == pytest.approx(now - 1799, abs=1) and b1 == pytest.approx(now - 600, abs=1)
+
+
+def test_memory_is_constant(timeline):
+    before = timeline.nbytes()
+    for i in range(10_000):
+        timeline.add("keys", 1_000_000 + i * 37)
+    assert timeline.nbytes() == before
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from activity_timeline import ActivityTimeline
+from adaptive_poll import AdaptivePoller
+
+
+def test_backs_off_when_idle_and_snaps_back_on_activity():
+    timeline = ActivityTimeline()
+    poller = AdaptivePoller(timeline, min_interval=1, idle_interval=10, max_interval=60)
+    assert [poller.next_interval() for _ in range(5)] == [10, 20, 40, 60, 60]
+    timeline.add("keys")
+    assert poller.next_interval() == 1
+    assert poller.next_interval() == 10
+    timeline.add("focus")
+    assert poller.next_interval() == 1
+
+
+def test_without_timeline_interval_is_fixed():
+    poller = AdaptivePoller(None, idle_interval=10)
+    assert [poller.next_interval() for _ in range(3)] == [10, 10, 10]
+
+
+def test_wait_ends_early_on_activity():
+    timeline = ActivityTimeline()
+    poller = AdaptivePoller(timeline, min_interval=0.05, idle_interval=30)
+    stop = threading.Event()
+    threading.Timer(0.2, timeline.add, args=("mouse",)).start()
+
+    start = time.monotonic()
+    assert poller.wait(stop)
+    assert 0.15 < time.monotonic() - start < 2
+    assert poller.woken == 1
+    # The activity made the next poll a fast one
+    assert poller.next_interval() == 0.05
+
+
+def test_wait_stops_promptly():
+    poller = AdaptivePoller(ActivityTimeline(), min_interval=0.05, idle_interval=30)
+    stop = threading.Event()
+    threading.Timer(0.1, stop.set).start()
+
+    start = time.monotonic()
+    assert not poller.wait(stop)
+    assert time.monotonic() - start < 1.5
@@ -1,6 +1,5 @@
-from collections import deque
-
 from agent import ClippyAgent
+from event_store import EventStore
 from system_monitor import SystemMonitor
 import time
 import json
@@ -16,7 +15,7 @@ class DummyWindow:
 
 def _make_monitor(tmp_path):
     monitor = SystemMonitor.__new__(SystemMonitor)
-    monitor.events = deque()
+    monitor.events = EventStore()
     monitor.history_seconds = 30
     monitor.log_path = tmp_path / "log.txt"
     import threading
@@ -159,3 +158,26 @@ def test_handle_text_summary(tmp_path):
 
     assert agent.llm.prompt == json.dumps(snapshot)
     assert window.last == "ok"
+
+
+def test_loop_polls_faster_while_active(tmp_path):
+    from activity_timeline import ActivityTimeline
+
+    window = DummyWindow()
+    agent = ClippyAgent(window, poll_interval=30, min_poll_interval=0.02, notify_interval=None)
+    agent.monitor = _make_monitor(tmp_path)
+    agent.monitor.timeline = ActivityTimeline()
+    snapshots = []
+    agent.monitor.capture_snapshot = lambda: snapshots.append(1) or {"n": len(snapshots)}
+    agent.llm = type("LLM", (), {"add_context": lambda self, prompt: None})()
+
+    agent.start()
+    time.sleep(0.1)
+    assert len(snapshots) == 1  # idle: waiting 30 s
+    for _ in range(3):
+        agent.monitor.timeline.add("keys")
+        time.sleep(0.1)
+    agent.stop()
+
+    assert len(snapshots) >= 3
+    assert agent.poller.woken >= 1
@@ -0,0 +1,57 @@
+from app_rollup import group_processes, top_apps
+from process_sampler import ProcessInfo
+
+
+def _by_name(apps):
+    return {a.name: a for a in apps}
+
+
+def test_same_exe_is_one_app():
+    procs = [ProcessInfo(1, "init")]
+    procs += [
+        ProcessInfo(10 + i, "chrome", "/opt/chrome/chrome", cpu_percent=2.0, rss=100, ppid=1)
+        for i in range(40)
+    ]
+    apps = _by_name(group_processes(procs))
+    assert apps["chrome"].count == 40
+    assert apps["chrome"].cpu_percent == 80.0
+    assert apps["chrome"].rss == 4000
+    assert apps["init"].count == 1
+
+
+def test_helpers_follow_parent_tree():
+    procs = [
+        ProcessInfo(1, "bash", "/usr/bin/bash"),
+        ProcessInfo(2, "Code", "/app/code", cpu_percent=1.0, ppid=1),
+        ProcessInfo(3, "Code Helper (Renderer)", "/app/helper", cpu_percent=3.0, ppid=2),
+        ProcessInfo(4, "Code Helper (GPU)", "/app/helper", cpu_percent=5.0, ppid=3),
+        ProcessInfo(5, "python", "/usr/bin/python", ppid=1),
+    ]
+    apps = _by_name(group_processes(procs))
+    assert set(apps) == {"bash", "Code", "python"}
+    assert apps["Code"].count == 3
+    assert apps["Code"].cpu_percent == 9.0
+
+
+def test_ignored_and_cycles():
+    procs = [
+        ProcessInfo(1, "System"),
+        ProcessInfo(2, "loop", ppid=3),
+        ProcessInfo(3, "loop", ppid=2),
+    ]
+    apps = group_processes(procs, ignored={"System"})
+    assert [(a.name, a.count) for a in apps] == [("loop", 2)]
+
+
+def test_top_apps_by_cpu_and_memory():
+    procs = [
+        ProcessInfo(1, "big", rss=900),
+        ProcessInfo(2, "busy", cpu_percent=50.0, rss=10),
+        ProcessInfo(3, "idle", rss=5),
+    ]
+    apps = group_processes(procs)
+    assert [a.name for a in top_apps(apps, 2)] == ["busy", "big"]
+    assert [a.name for a in top_apps(apps, 1, by="memory")] == ["big"]
+    assert top_apps(apps, 1)[0].to_dict() == {
+        "name": "busy", "exe": "", "processes": 1, "cpu_percent": 50.0, "rss": 10,
+    }
@@ -0,0 +1,106 @@
+import json
+import os
+from datetime import datetime
+
+from activity_log import ActivityLogWriter, LogIndex, query_log
+from binary_log import BinaryLogEncoder, MAGIC, convert_jsonl, iter_binary_log, read_dictionary
+
+
+def _snapshot(ts, n):
+    return {
+        "timestamp": datetime.fromtimestamp(ts).isoformat(),
+        "n": n,
+        "cpu": -1.5 * n,
+        "active_window": {"title": f"Doc {n % 3}", "app": "editor", "pid": None},
+        "clipboard": ["x" * 400] if n % 2 else [],
+        "open_windows": ["Doc 0", "Terminal", "Browser – ünïcode"],
+        "idle": n % 2 == 0,
+    }
+
+
+def _write(path, records):
+    encoder = BinaryLogEncoder()
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for record in records:
+            f.write(encoder.encode(record))
+
+
+def test_round_trip_yields_same_dicts(tmp_path):
+    records = [_snapshot(1_700_000_000 + i, i) for i in range(20)]
+    path = tmp_path / "log.alog"
+    _write(path, records)
+    assert list(iter_binary_log(path)) == records
+
+    jsonl = sum(len(json.dumps(r)) + 1 for r in records)
+    assert os.path.getsize(path) < jsonl
+
+
+def test_strings_are_stored_once_per_segment(tmp_path):
+    path = tmp_path / "log.alog"
+    _write(path, [_snapshot(1_700_000_000 + i, 0) for i in range(10)])
+    strings, size = read_dictionary(path)
+    assert strings.count("Terminal") == 1
+    assert "active_window" in strings
+    assert size == os.path.getsize(path)
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    records = [_snapshot(1_700_000_000 + i, i) for i in range(5)]
+    path = tmp_path / "log.alog"
+    _write(path, records)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+    assert list(iter_binary_log(path)) == records[:4]
+
+
+def test_convert_jsonl(tmp_path):
+    records = [_snapshot(1_700_000_000 + i, i) for i in range(8)]
+    src = tmp_path / "log.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in records) + "not json\n")
+    dst = tmp_path / "log.alog"
+    assert convert_jsonl(src, dst) == 8
+    assert list(iter_binary_log(dst)) == records
+
+
+def test_writer_appends_to_existing_binary_segment(tmp_path):
+    path = tmp_path / "log.alog"
+    base = 1_700_000_040
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60, format="binary")
+    for i in range(300):
+        writer.write(_snapshot(base + i * 10, i))
+    writer.close()
+
+    # A second writer continues with the dictionary already on disk
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60, format="binary")
+    for i in range(300, 600):
+        writer.write(_snapshot(base + i * 10, i))
+    writer.close()
+
+    assert [r["n"] for r in iter_binary_log(path)] == list(range(600))
+    strings, _ = read_dictionary(path)
+    assert len(strings) == len(set(strings))
+
+    index = LogIndex(path)
+    assert index.load()
+    assert len(index.buckets) == 100
+    rows = list(query_log(path, base + 1000, base + 1100, fields=["n"]))
+    assert rows == [{"n": n} for n in range(100, 111)]
+
+
+def test_binary_rotation_and_format_switch(tmp_path):
+    path = tmp_path / "log.alog"
+    base = 1_700_000_000
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60)
+    writer.write(_snapshot(base, 0))
+    writer.close()
+
+    writer = ActivityLogWriter(path, batch_size=1, flush_interval=60, max_bytes=600, format="binary")
+    for i in range(1, 10):
+        writer.write(_snapshot(base + i, i))
+        writer.flush()
+    writer.close()
+
+    assert len(writer.segments()) >= 2
+    rows = list(query_log(path, base, base + 9, fields=["n"]))
+    assert [r["n"] for r in rows] == list(range(10))
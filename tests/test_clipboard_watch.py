@@ -0,0 +1,60 @@
+import threading
+
+from clipboard_watch import ClipboardWatcher, ClipEntry
+
+
+class FakeClipboard:
+    def __init__(self, text=""):
+        self.text = text
+        self.reads = 0
+
+    def paste(self):
+        self.reads += 1
+        return self.text
+
+
+def test_entry_keeps_digest_length_and_preview():
+    entry = ClipEntry("x" * 1000, preview_chars=10)
+    assert entry.length == 1000
+    assert str(entry) == "x" * 10 + "…"
+    assert entry.digest == ClipEntry("x" * 1000).digest
+    assert entry.digest != ClipEntry("y" * 1000).digest
+
+
+def test_changes_are_reported_once():
+    clip = FakeClipboard("at start")
+    seen = []
+    watcher = ClipboardWatcher(seen.append, reader=clip.paste)
+
+    assert watcher.check() is None  # start-up content is not a change
+    clip.text = "hello"
+    assert watcher.check().preview == "hello"
+    assert watcher.check() is None
+    clip.text = "world"
+    watcher.check()
+
+    assert [str(e) for e in seen] == ["hello", "world"]
+    assert watcher.latest.preview == "world"
+    assert watcher.changes == 2
+
+
+def test_reader_errors_are_ignored():
+    def broken():
+        raise RuntimeError("no xclip")
+
+    watcher = ClipboardWatcher(reader=broken)
+    assert watcher.check() is None
+    assert watcher.latest is None
+
+
+def test_polling_thread_reports_changes():
+    clip = FakeClipboard()
+    changed = threading.Event()
+    watcher = ClipboardWatcher(lambda entry: changed.set(), interval=0.01, reader=clip.paste)
+    watcher.start()
+    try:
+        clip.text = "copied"
+        assert changed.wait(2)
+    finally:
+        watcher.stop()
+    assert watcher.latest.preview == "copied"
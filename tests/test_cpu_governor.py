@@ -0,0 +1,77 @@
+import time
+
+from cpu_governor import CpuGovernor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.cpu = 0.0
+
+    def tick(self, seconds, cpu):
+        self.now += seconds
+        self.cpu += cpu
+
+
+def _governor(clock, **kwargs):
+    return CpuGovernor(cpu=lambda: clock.cpu, clock=lambda: clock.now, **kwargs)
+
+
+def test_throttles_ocr_then_processes_then_windows():
+    clock = FakeClock()
+    gov = _governor(clock, budget=0.02, period=10, max_scale=4)
+    changes = []
+    for _ in range(7):
+        clock.tick(10, 1.0)  # 10% of a core
+        gov.update()
+        changes.append(dict(gov.scales))
+    assert gov.usage == 0.1
+    assert [c["ocr"] for c in changes] == [2, 4, 4, 4, 4, 4, 4]
+    assert [c["processes"] for c in changes] == [1, 1, 2, 4, 4, 4, 4]
+    assert [c["windows"] for c in changes] == [1, 1, 1, 1, 2, 4, 4]
+
+
+def test_relaxes_in_reverse_order_below_half_budget():
+    clock = FakeClock()
+    gov = _governor(clock, budget=0.02, period=10)
+    gov.scales.update(ocr=2, processes=2, windows=1)
+    clock.tick(10, 0.15)  # 1.5%: within budget, no change
+    assert not gov.update()
+    clock.tick(10, 0.05)  # 0.5%
+    assert gov.update()
+    assert gov.scales == {"ocr": 2, "processes": 1, "windows": 1}
+    clock.tick(10, 0.0)
+    gov.update()
+    assert gov.scales == {"ocr": 1, "processes": 1, "windows": 1}
+
+
+def test_update_waits_for_period_and_budget_none_only_measures():
+    clock = FakeClock()
+    gov = _governor(clock, budget=None, period=10)
+    clock.tick(5, 5.0)
+    assert not gov.update()
+    clock.tick(5, 0.0)
+    assert not gov.update()
+    assert gov.usage == 0.5
+    assert gov.scales["ocr"] == 1
+
+
+def test_measure_charges_thread_cpu_time():
+    clock = FakeClock()
+    gov = _governor(clock)
+    with gov.measure("processes"):
+        end = time.thread_time() + 0.02
+        while time.thread_time() < end:
+            pass
+    with gov.measure("processes"):
+        time.sleep(0.05)  # sleeping costs no CPU
+    gov.charge("ocr", 0.5, calls=0)
+    clock.tick(10, 1.0)
+
+    report = gov.breakdown()
+    procs = report["collectors"]["processes"]
+    assert procs["calls"] == 2
+    assert 0.02 <= procs["cpu_s"] < 0.045
+    assert report["collectors"]["ocr"]["share"] == 0.5
+    assert report["average"] == 0.1
+    assert 0.45 < report["other_cpu_s"] <= 0.48
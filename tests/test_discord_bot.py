@@ -2,6 +2,7 @@ import asyncio
 from types import SimpleNamespace
 
 import discord_bot
+from activity_log import ActivityLogWriter
 
 
 class DummyChannel:
@@ -100,10 +101,13 @@ def test_handle_message_status_synonyms(monkeypatch):
         assert channel.sent == ["summary"]
 
 
-def test_monitor_thread_start_stop():
+def test_monitor_thread_start_stop(monkeypatch, tmp_path):
+    writer = ActivityLogWriter(tmp_path / "activity_log.jsonl")
+    monkeypatch.setattr(discord_bot.monitor, "log_writer", writer)
     t = discord_bot.start_monitor_thread()
     assert t.is_alive()
     discord_bot.stop_monitor_thread()
+    writer.close()
 
 
 def test_handle_message_open_command(monkeypatch):
@@ -0,0 +1,185 @@
+from event_store import Event, EventKind, EventStore, INPUT_KINDS
+
+
+def test_counts_follow_append_and_prune():
+    store = EventStore()
+    store.append(EventKind.KEY, "a", timestamp=1.0)
+    store.append(EventKind.MOUSE_MOVE, "move", timestamp=2.0)
+    store.append(EventKind.KEY, "b", timestamp=3.0)
+
+    assert store.count(EventKind.KEY) == 2
+    assert store.count(*INPUT_KINDS) == 3
+
+    assert store.prune(2.5) == 2
+    assert store.count(EventKind.KEY) == 1
+    assert store.count(EventKind.MOUSE_MOVE) == 0
+    assert len(store) == 1
+    assert store[0].payload == "b"
+
+
+def test_of_kind_merges_in_time_order():
+    store = EventStore()
+    store.append(EventKind.KEY, "a", timestamp=1.0)
+    store.append(EventKind.CLIPBOARD, "text", timestamp=2.0)
+    store.append(EventKind.MOUSE, "wheel delta=1", timestamp=3.0)
+    store.append(EventKind.KEY, "b", timestamp=4.0)
+
+    messages = [e.message for e in store.of_kind(*INPUT_KINDS)]
+    assert messages == [
+        "Pressed key: a",
+        "Mouse wheel delta=1",
+        "Pressed key: b",
+    ]
+    assert store.latest(EventKind.CLIPBOARD).message == "Copied text: 'text'"
+    assert store.latest(EventKind.OCR) is None
+
+
+def test_short_payloads_are_interned():
+    store = EventStore()
+    first = store.append(EventKind.KEY, "".join(["sp", "ace"]))
+    second = store.append(EventKind.KEY, "".join(["spa", "ce"]))
+    assert first.payload is second.payload
+
+
+def test_event_has_no_instance_dict():
+    event = Event(0.0, EventKind.KEY, "a")
+    assert not hasattr(event, "__dict__")
+
+
+def test_indexes_stay_in_step_under_concurrent_writers():
+    import threading
+
+    store = EventStore()
+    kinds = [EventKind.KEY, EventKind.MOUSE_MOVE, EventKind.CLIPBOARD, EventKind.OCR]
+
+    def writer(kind):
+        for i in range(2000):
+            store.append(kind, str(i))
+
+    threads = [threading.Thread(target=writer, args=(k,)) for k in kinds]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        store.of_kind(*kinds)
+        store.prune(0)
+    for t in threads:
+        t.join()
+
+    assert len(store) == 8000
+    assert store.count(*kinds) == 8000
+    assert store.prune(float("inf")) == 8000
+    assert store.count(*kinds) == 0
+
+
+def test_snapshot_is_not_changed_by_later_writes():
+    store = EventStore(segment_size=4)
+    for i in range(10):
+        store.append(EventKind.KEY, str(i), timestamp=float(i))
+    view = store.snapshot()
+
+    store.prune(5.0)
+    for i in range(10, 20):
+        store.append(EventKind.KEY, str(i), timestamp=float(i))
+
+    assert [e.payload for e in view] == [str(i) for i in range(10)]
+    assert len(view) == 10
+    assert view[-1].payload == "9"
+    assert [e.payload for e in store] == [str(i) for i in range(5, 20)]
+    assert store.latest(EventKind.KEY).payload == "19"
+
+
+def test_many_writers_with_concurrent_readers_and_pruning():
+    import threading
+
+    store = EventStore(segment_size=32)
+    kinds = list(EventKind)
+    writers, per_writer = 8, 5000
+    errors = []
+    done = threading.Event()
+
+    def writer(n):
+        kind = kinds[n % len(kinds)]
+        for i in range(per_writer):
+            store.append(kind, str(i), timestamp=float(i))
+
+    def reader():
+        try:
+            while not done.is_set():
+                view = store.snapshot()
+                assert sum(1 for _ in view) == len(view)
+                store.of_kind(*INPUT_KINDS)
+                store.latest(EventKind.KEY)
+                store.count(*kinds)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    readers = [threading.Thread(target=reader) for _ in range(3)]
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in readers + threads:
+        t.start()
+    cutoff = 0.0
+    while any(t.is_alive() for t in threads):
+        store.prune(cutoff)
+        cutoff = min(cutoff + 1, per_writer / 2)
+    for t in threads:
+        t.join()
+    done.set()
+    for t in readers:
+        t.join()
+
+    assert not errors
+    remaining = len(store)
+    assert remaining >= writers * per_writer // 2
+    assert store.prune(float("inf")) == remaining
+    assert len(store) == store.count(*kinds) == 0
+
+
+def test_count_cap_evicts_oldest_to_spill(tmp_path):
+    from event_spill import EventSpill
+
+    spill = EventSpill(tmp_path / "spill.alog")
+    store = EventStore(segment_size=8, max_events=20, spill=spill)
+    for i in range(100):
+        store.append(EventKind.KEY if i % 2 else EventKind.MOUSE, str(i), timestamp=float(i))
+    store.prune(0)
+
+    assert len(store) == 20
+    assert store.count(EventKind.KEY, EventKind.MOUSE) == 20
+    assert store[0].payload == "80"
+    assert store.evicted == 80
+
+    spilled = spill.query(10.0, 19.0, kinds=[EventKind.KEY])
+    assert [(e.timestamp, e.kind, e.payload) for e in spilled] == [
+        (float(i), EventKind.KEY, str(i)) for i in range(11, 20, 2)
+    ]
+    history = store.history(start=75.0, end=85.0)
+    assert [e.payload for e in history] == [str(i) for i in range(75, 86)]
+
+
+def test_byte_cap_evicts_large_payloads_immediately(tmp_path):
+    from event_spill import EventSpill
+
+    store = EventStore(max_bytes=10_000, spill=EventSpill(tmp_path / "spill.alog"))
+    store.append(EventKind.KEY, "a", timestamp=1.0)
+    store.append(EventKind.CLIPBOARD, "x" * 50_000, timestamp=2.0)
+    store.append(EventKind.KEY, "b", timestamp=3.0)
+
+    assert [e.payload for e in store] == ["b"]
+    metrics = store.metrics()
+    assert metrics["payload_bytes"] == 1
+    assert metrics["evicted"] == 2
+    assert metrics["spilled"] == 2
+    assert metrics["spill_bytes"] > 0
+    assert store.history(kinds=[EventKind.CLIPBOARD])[0].payload == "x" * 50_000
+
+
+def test_spill_resumes_existing_file(tmp_path):
+    from event_spill import EventSpill
+
+    path = tmp_path / "spill.alog"
+    first = EventSpill(path)
+    first.write([Event(1.0, EventKind.KEY, "a"), Event(2.0, EventKind.KEY, "b")])
+    first.close()
+    second = EventSpill(path)
+    second.write([Event(3.0, EventKind.KEY, "a")])
+    assert [e.payload for e in second.query()] == ["a", "b", "a"]
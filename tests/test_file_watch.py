@@ -0,0 +1,73 @@
+import os
+
+from event_store import EventKind
+from file_watch import FileChangeBatcher, PathFilter, plan_watches
+
+
+def test_default_filter_skips_the_assistants_own_outputs(tmp_path):
+    f = PathFilter(roots=[tmp_path])
+    assert f.allows(tmp_path / "src" / "main.py")
+    for name in (
+        "activity_log.jsonl",
+        "activity_log.jsonl.idx",
+        "error_report.txt",
+        "ai_memos/memo.txt",
+        "sub/ai_memos/memo.txt",
+        ".git/index",
+        "pkg/__pycache__/x.cpython-311.pyc",
+        "notes.txt.swp",
+    ):
+        assert not f.allows(tmp_path / name), name
+
+
+def test_include_globs_limit_paths(tmp_path):
+    f = PathFilter(include=["*.py", "docs/**"], roots=[tmp_path])
+    assert f.allows(tmp_path / "a" / "b.py")
+    assert f.allows(tmp_path / "docs" / "x" / "y.md")
+    assert not f.allows(tmp_path / "a" / "b.md")
+
+
+def test_changes_are_debounced_per_path(tmp_path):
+    batcher = FileChangeBatcher(PathFilter(roots=[tmp_path]), debounce=2.0)
+    path = str(tmp_path / "a.py")
+    batcher.add(EventKind.FILE_CREATED, path, now=10.0)
+    for i in range(50):
+        batcher.add(EventKind.FILE_MODIFIED, path, now=10.0 + i * 0.01)
+    batcher.add(EventKind.FILE_MODIFIED, str(tmp_path / "activity_log.jsonl"), now=10.0)
+
+    assert batcher.flush(now=11.0) == []
+    assert batcher.flush(now=13.0) == [(10.49, EventKind.FILE_CREATED, path)]
+    stats = batcher.stats()
+    assert stats["coalesced"] == 50
+    assert stats["filtered"] == 1
+    assert stats["pending"] == 0
+
+
+def test_bursts_in_one_directory_are_summarised(tmp_path):
+    batcher = FileChangeBatcher(PathFilter(roots=[tmp_path]), debounce=1.0, group_threshold=3)
+    for i in range(12):
+        batcher.add(EventKind.FILE_MODIFIED, str(tmp_path / "build" / f"{i}.o"), now=5.0)
+    batcher.add(EventKind.FILE_MODIFIED, str(tmp_path / "README.md"), now=5.5)
+
+    events = batcher.flush(now=10.0)
+    assert [(k, p) for _, k, p in events] == [
+        (EventKind.FILES_CHANGED, "12 files changed under build/"),
+        (EventKind.FILE_MODIFIED, str(tmp_path / "README.md")),
+    ]
+
+
+def test_watch_plan_respects_budget(tmp_path):
+    for i in range(5):
+        for j in range(5):
+            os.makedirs(tmp_path / f"d{i}" / f"e{j}")
+    os.makedirs(tmp_path / ".git" / "objects")
+
+    assert plan_watches([str(tmp_path)], max_watches=100) == [(str(tmp_path), True)]
+
+    plans = plan_watches([str(tmp_path)], max_watches=8)
+    assert len(plans) == 8
+    assert plans[0] == (str(tmp_path), False)
+    assert all(not recursive for _, recursive in plans)
+    assert not any(".git" in path for path, _ in plans)
+    # Breadth-first: the top-level directories are covered first
+    assert {os.path.basename(p) for p, _ in plans[1:6]} == {f"d{i}" for i in range(5)}
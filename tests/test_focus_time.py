@@ -0,0 +1,80 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from focus_time import FocusTracker, split_by_hour
+
+
+def _at(day, hour, minute=0):
+    return (datetime(2024, 3, day) + timedelta(hours=hour, minutes=minute)).timestamp()
+
+
+def test_split_by_hour_crosses_midnight():
+    pieces = list(split_by_hour(_at(4, 23, 30), _at(5, 1, 15)))
+    assert [p[2] for p in pieces] == [1800, 3600, 900]
+    assert [p[1] for p in pieces] == ["2024-03-04", "2024-03-05", "2024-03-05"]
+    assert pieces[1][0] == _at(5, 0)
+
+
+def test_intervals_roll_up_per_app_and_title(tmp_path):
+    tracker = FocusTracker(tmp_path / "focus.db", flush_interval=1e9, max_gap=3600)
+    tracker.focus("code", "a.py", _at(4, 9))
+    tracker.focus("code", "b.py", _at(4, 9, 30))
+    tracker.focus("chrome", "docs", _at(4, 10))
+    tracker.focus("code", "a.py", _at(4, 10, 10))
+    tracker.flush(_at(4, 11))
+
+    assert tracker.top(_at(4, 0), _at(5, 0)) == [("code", 6600.0), ("chrome", 600.0)]
+    assert tracker.top(_at(4, 0), _at(5, 0), by="title", k=1) == [("a.py", 4800.0)]
+    assert ("chrome", "docs") in dict(tracker.top(_at(4, 0), _at(5, 0), by="window"))
+    # Hour rollups answer partial days
+    assert tracker.top(_at(4, 10), _at(4, 11)) == [("code", 3000.0), ("chrome", 600.0)]
+    # The interval is still running but the gap since the last call is too long
+    assert tracker.top(_at(4, 11), _at(4, 12)) == []
+    tracker.close()
+
+    rows = sqlite3.connect(tmp_path / "focus.db").execute("SELECT COUNT(*) FROM focus_day").fetchone()
+    assert rows == (3,)
+
+
+def test_multi_day_query_uses_day_rollups(tmp_path):
+    tracker = FocusTracker(tmp_path / "focus.db")
+    for day in (4, 5, 6):
+        for minute in range(0, 60, 5):
+            tracker.focus("code", "x", _at(day, 9, minute))
+        tracker.focus("idle", "", _at(day, 10))
+
+    assert tracker.top(_at(4, 0), _at(7, 0), k=1) == [("code", 3 * 3600.0)]
+    assert tracker.top(_at(4, 9, 30), _at(7, 0), k=1) == [("code", 3 * 3600.0)]
+    assert tracker.top(_at(5, 0), _at(6, 0), k=1) == [("code", 3600.0)]
+    tracker.close()
+
+
+def test_totals_survive_restart_and_stop_at_gaps(tmp_path):
+    path = tmp_path / "focus.db"
+    tracker = FocusTracker(path, max_gap=600)
+    tracker.focus("code", "x", _at(4, 9))
+    tracker.focus("code", "x", _at(4, 9, 10))
+    tracker.focus("code", "y", _at(4, 12))  # slept in between
+    tracker.close(_at(4, 12, 5))
+
+    reopened = FocusTracker(path)
+    assert reopened.top(_at(4, 0), _at(5, 0), by="window") == [
+        (("code", "x"), 600.0), (("code", "y"), 300.0),
+    ]
+    reopened.close()
+
+
+def test_nothing_written_without_focus(tmp_path):
+    FocusTracker(tmp_path / "focus.db").close()
+    assert not (tmp_path / "focus.db").exists()
+
+
+def test_unchanged_focus_checkpoints(tmp_path):
+    tracker = FocusTracker(tmp_path / "focus.db", flush_interval=60)
+    tracker.focus("code", "x", _at(4, 9))
+    tracker.focus("code", "x", _at(4, 9, 5))
+    rows = sqlite3.connect(tmp_path / "focus.db").execute("SELECT SUM(seconds) FROM focus_hour").fetchone()
+    assert rows == (pytest.approx(300.0),)
+    tracker.close()
@@ -0,0 +1,91 @@
+import threading
+
+from event_store import EventKind
+from input_ring import InputRing, MouseMoves, coalesce_input
+
+
+class Move:
+    event_type = "move"
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Click:
+    event_type = "down"
+
+
+class Key:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_moves_are_coalesced_per_interval():
+    items = [
+        (EventKind.MOUSE, 10.1, Move(0, 0)),
+        (EventKind.MOUSE, 10.2, Move(3, 4)),
+        (EventKind.MOUSE, 10.3, Move(3, 10)),
+        (EventKind.MOUSE, 11.5, Move(5, 10)),
+    ]
+    events = list(coalesce_input(items, interval=1.0))
+
+    assert [(t, k) for t, k, _ in events] == [(10.3, EventKind.MOUSE_MOVE), (11.5, EventKind.MOUSE_MOVE)]
+    first = events[0][2]
+    assert isinstance(first, MouseMoves)
+    assert first.count == 3
+    assert first.distance == 11.0
+    assert first.bbox == (0, 0, 3, 10)
+    assert "x3" in str(first)
+
+
+def test_other_events_keep_their_order():
+    items = [
+        (EventKind.MOUSE, 1.0, Move(0, 0)),
+        (EventKind.KEY, 1.1, Key("a")),
+        (EventKind.MOUSE, 1.2, Move(1, 1)),
+        (EventKind.MOUSE, 1.3, Click()),
+    ]
+    kinds = [(k, str(p)) for _, k, p in coalesce_input(items)]
+    assert kinds == [
+        (EventKind.MOUSE_MOVE, "move x1, 0px within (0, 0, 0, 0)"),
+        (EventKind.KEY, "a"),
+        (EventKind.MOUSE_MOVE, "move x1, 0px within (1, 1, 1, 1)"),
+        (EventKind.MOUSE, "down"),
+    ]
+
+
+def test_ring_counts_overwritten_items():
+    ring = InputRing(capacity=3)
+    for i in range(5):
+        ring.push(i)
+    assert ring.drain() == [2, 3, 4]
+    assert ring.dropped == 2
+    assert ring.drain() == []
+
+
+def test_concurrent_producers_lose_nothing():
+    ring = InputRing()
+    drained = []
+    stop = threading.Event()
+
+    def consume():
+        while not stop.is_set():
+            drained.extend(ring.drain())
+        drained.extend(ring.drain())
+
+    def produce(base):
+        for i in range(5000):
+            ring.push(base + i)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    producers = [threading.Thread(target=produce, args=(n * 10000,)) for n in range(4)]
+    for t in producers:
+        t.start()
+    for t in producers:
+        t.join()
+    stop.set()
+    consumer.join()
+
+    assert sorted(drained) == sorted(n * 10000 + i for n in range(4) for i in range(5000))
@@ -0,0 +1,79 @@
+import os
+
+import psutil
+import pytest
+
+from process_sampler import ProcStatReader, ProcessSampler, np, shared_sampler
+
+
+def test_sample_includes_current_process():
+    sampler = ProcessSampler()
+    sample = sampler.sample()
+    me = [p for p in sample if p.pid == os.getpid()]
+    assert me
+    assert me[0].name
+    assert me[0].rss > 0
+
+
+def test_sample_reused_within_max_age():
+    sampler = ProcessSampler(max_age=60)
+    first = sampler.sample()
+    assert sampler.sample() is first
+    assert sampler.sample(max_age=0) is not first
+
+
+def test_handles_cached_across_refreshes():
+    sampler = ProcessSampler(backend="psutil")
+    first = {p.pid: p.process for p in sampler.refresh()}
+    second = {p.pid: p.process for p in sampler.refresh()}
+    assert second[os.getpid()] is first[os.getpid()]
+
+
+def test_cpu_delta_measured_on_second_pass():
+    sampler = ProcessSampler()
+    sampler.refresh()
+    end = psutil.Process().cpu_times().user + 0.05
+    while psutil.Process().cpu_times().user < end:
+        pass
+    me = [p for p in sampler.refresh() if p.pid == os.getpid()][0]
+    assert me.cpu_percent > 0
+
+
+def test_shared_sampler_is_singleton():
+    assert shared_sampler() is shared_sampler()
+
+
+def _fake_proc(root, pid, comm, ticks, start, rss_pages):
+    d = root / str(pid)
+    d.mkdir(exist_ok=True)
+    fields = ["S", "1"] + ["0"] * 9 + [str(ticks), "0"] + ["0"] * 6 + [str(start), "0", str(rss_pages)]
+    (d / "stat").write_text(f"{pid} ({comm}) " + " ".join(fields))
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat") or np is None, reason="needs /proc and numpy")
+def test_proc_reader_matches_psutil():
+    me = [p for p in ProcStatReader().read() if p.pid == os.getpid()][0]
+    proc = psutil.Process()
+    assert me.name == proc.name()
+    assert me.exe == proc.exe()
+    assert abs(me.rss - proc.memory_info().rss) < 16 * 1024 * 1024
+
+
+@pytest.mark.skipif(np is None, reason="needs numpy")
+def test_proc_reader_cpu_delta_and_pid_reuse(tmp_path):
+    reader = ProcStatReader(str(tmp_path))
+    _fake_proc(tmp_path, 10, "a) b", 100, 5, 3)
+    _fake_proc(tmp_path, 11, "old", 100, 5, 1)
+    first = {p.pid: p for p in reader.read()}
+    assert first[10].name == "a) b"
+    assert first[10].rss == 3 * os.sysconf("SC_PAGE_SIZE")
+    assert first[10].cpu_percent == 0.0
+
+    _fake_proc(tmp_path, 10, "a) b", 100 + reader._clk_tck, 5, 3)
+    # PID 11 was reused by a new process with a later start time
+    _fake_proc(tmp_path, 11, "new", 500, 9, 1)
+    reader._prev_time -= 1.0
+    second = {p.pid: p for p in reader.read()}
+    assert 90 < second[10].cpu_percent <= 100
+    assert second[11].name == "new"
+    assert second[11].cpu_percent == 0.0
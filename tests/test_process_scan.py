@@ -0,0 +1,68 @@
+import hashlib
+import os
+
+from process_sampler import ProcessInfo
+from process_scan import ExeHashCache, ProcessScanner, SignatureMatcher
+
+
+def test_matcher_compiles_many_keywords():
+    keywords = [f"badtool{i}" for i in range(500)] + ["spy", "spyware"]
+    matcher = SignatureMatcher(keywords)
+    assert matcher.match_text("ok.exe", "/opt/BadTool417/run") == "badtool417"
+    assert matcher.match_text("SpyWare.exe") == "spyware"
+    assert matcher.match_text("editor", "/usr/bin/editor") is None
+
+
+def test_only_new_processes_are_examined():
+    scanner = ProcessScanner()
+    procs = [ProcessInfo(i, f"app{i}", f"/bin/app{i}") for i in range(100)]
+    procs.append(ProcessInfo(500, "keylogger", "/tmp/k"))
+
+    assert [f["pid"] for f in scanner.scan(procs)] == [500]
+    assert scanner.examined == 101
+    assert [f["reason"] for f in scanner.scan(procs)] == ["keylog"]
+    assert scanner.examined == 101
+
+    procs.append(ProcessInfo(501, "trojan", "/tmp/t"))
+    assert [f["pid"] for f in scanner.scan(procs)] == [500, 501]
+    assert scanner.examined == 102
+
+
+def test_exited_and_reused_pids_are_handled():
+    scanner = ProcessScanner()
+    assert scanner.scan([ProcessInfo(7, "virus", "/tmp/v")])
+    # PID 7 is reused by a harmless program
+    assert scanner.scan([ProcessInfo(7, "editor", "/usr/bin/editor")]) == []
+    assert scanner.examined == 2
+
+
+def test_hash_signatures_are_checked_once_ready(tmp_path):
+    exe = tmp_path / "innocent-name"
+    exe.write_bytes(b"known bad payload")
+    digest = hashlib.sha256(b"known bad payload").hexdigest()
+    cache = ExeHashCache()
+    scanner = ProcessScanner(SignatureMatcher(hashes=[digest]), cache)
+    procs = [ProcessInfo(1, "innocent-name", str(exe))]
+
+    first = scanner.scan(procs)
+    assert cache.wait(5)
+    findings = first or scanner.scan(procs)
+    assert findings[0]["reason"] == f"sha256:{digest}"
+    cache.shutdown()
+
+
+def test_hash_cache_rehashes_changed_files(tmp_path):
+    path = tmp_path / "tool"
+    path.write_bytes(b"one")
+    cache = ExeHashCache()
+    assert cache.get(str(path)) is None
+    assert cache.wait(5)
+    assert cache.get(str(path)) == hashlib.sha256(b"one").hexdigest()
+
+    path.write_bytes(b"second")
+    os.utime(path, ns=(1, 1))
+    cache.get(str(path))
+    assert cache.wait(5)
+    assert cache.get(str(path)) == hashlib.sha256(b"second").hexdigest()
+    assert cache.hashed == 2
+    cache.shutdown()
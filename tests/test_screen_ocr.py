@@ -0,0 +1,210 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from activity_timeline import ActivityTimeline
+from event_store import EventKind, EventStore
+from screen_ocr import OCRPreprocessor, OCRService, ScreenChangeDetector, SeenLines
+from system_monitor import SystemMonitor
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+class InlineExecutor:
+    """Executor that runs jobs immediately on the calling thread."""
+
+    def submit(self, fn, *args):
+        fut = Future()
+        try:
+            fut.set_result(fn(*args))
+        except Exception as exc:
+            fut.set_exception(exc)
+        return fut
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def _frame(box=None):
+    img = Image.new("RGB", (800, 800), "white")
+    if box:
+        ImageDraw.Draw(img).rectangle(box, fill="black")
+    return img
+
+
+def test_unchanged_frame_has_no_regions():
+    detector = ScreenChangeDetector()
+    assert detector.changed_regions(_frame()) == [(0, 0, 800, 800)]
+    assert detector.changed_regions(_frame()) == []
+
+
+def test_changed_tiles_are_merged_per_row():
+    detector = ScreenChangeDetector(cols=8, rows=8)
+    detector.changed_regions(_frame())
+    regions = detector.changed_regions(_frame((110, 110, 290, 180)))
+    assert regions == [(100, 100, 300, 200)]
+
+
+def test_seen_lines_reports_only_new_text():
+    seen = SeenLines(limit=2)
+    assert seen.new_lines("a\n\nb") == ["a", "b"]
+    assert seen.new_lines("a\nc") == ["c"]
+    # "a" was evicted once the limit was exceeded
+    assert seen.new_lines("a") == ["a"]
+
+
+def test_capture_screen_skips_ocr_on_static_screen():
+    calls = []
+
+    def image_to_string(img):
+        calls.append(img.size)
+        return "hello\nworld"
+
+    monitor = SystemMonitor.__new__(SystemMonitor)
+    monitor.ocr = OCRService(image_to_string, executor=InlineExecutor())
+    monitor.events = EventStore()
+    monitor.timeline = ActivityTimeline()
+    monitor._stop = threading.Event()
+    monitor._screenshot_thread = None
+    monitor.observer = None
+    monitor._screen_changes = ScreenChangeDetector()
+    monitor._seen_ocr = SeenLines()
+    monitor.ocr_crop = None
+    monitor.ocr_preprocessor = OCRPreprocessor(binarize=False)
+    frames = iter([_frame(), _frame(), _frame((0, 0, 50, 50))])
+    monitor._take_screenshot = lambda: next(frames)
+
+    monitor._capture_screen()
+    monitor._capture_screen()
+    monitor._capture_screen()
+
+    assert calls == [(800, 800), (100, 100)]
+    assert [e.payload for e in monitor.events.of_kind(EventKind.OCR)] == ["hello world"]
+
+
+def test_submit_returns_future_and_records_timing():
+    service = OCRService(lambda img: f"text {img}", executor=InlineExecutor())
+    assert service.submit(1).result() == "text 1"
+    stats = service.stats()
+    assert stats["jobs"] == 1
+    assert stats["pending"] == 0
+
+
+def test_submit_rejects_when_queue_is_full():
+    gate = threading.Event()
+    service = OCRService(lambda img: gate.wait(5) and img, max_pending=1,
+                         executor=ThreadPoolExecutor(1))
+    first = service.submit("a")
+    second = service.submit("b")
+    with pytest.raises(RuntimeError):
+        second.result()
+    gate.set()
+    assert first.result(timeout=5) == "a"
+    assert service.stats()["rejected"] == 1
+    service.shutdown()
+
+
+def test_latest_frame_wins_while_busy():
+    gate = threading.Event()
+    results = []
+    done = threading.Event()
+
+    def ocr(img):
+        if img == "f1":
+            gate.wait(5)
+        return img
+
+    def callback(texts):
+        results.append(texts)
+        if texts == ["f4"]:
+            done.set()
+
+    service = OCRService(ocr, executor=ThreadPoolExecutor(2))
+    service.submit_latest(["f1"], callback)
+    service.submit_latest(["f2"], callback)
+    service.submit_latest(["f3"], callback)
+    service.submit_latest(["f4"], callback)
+    gate.set()
+    assert done.wait(5)
+
+    assert results == [["f1"], ["f4"]]
+    assert service.stats()["dropped"] == 2
+    service.shutdown()
+
+
+def test_process_pool_runs_ocr_function():
+    service = OCRService(str.upper, workers=1)
+    try:
+        assert service.submit("abc").result(timeout=30) == "ABC"
+    finally:
+        service.shutdown()
+
+
+def test_create_engine_falls_back_to_pytesseract(monkeypatch):
+    import sys
+    import types
+
+    import screen_ocr
+
+    fake = types.ModuleType("pytesseract")
+    fake.pytesseract = types.SimpleNamespace(tesseract_cmd="tesseract")
+    fake.image_to_string = lambda img: f"ocr:{img}"
+    monkeypatch.setitem(sys.modules, "pytesseract", fake)
+    monkeypatch.setattr(screen_ocr, "tesserocr", None)
+
+    engine = screen_ocr.create_engine()
+    assert engine.name == "pytesseract"
+    assert engine.image_to_string("x") == "ocr:x"
+    with pytest.raises(RuntimeError):
+        screen_ocr.create_engine("tesserocr")
+
+
+def test_worker_engine_is_reused(monkeypatch):
+    import screen_ocr
+
+    created = []
+
+    class Engine:
+        def __init__(self):
+            created.append(self)
+
+        def image_to_string(self, img):
+            return img
+
+    monkeypatch.setattr(screen_ocr, "_worker_engines", {})
+    monkeypatch.setattr(screen_ocr, "create_engine", lambda prefer="auto": Engine())
+    assert screen_ocr.tesseract_image_to_string("a") == "a"
+    assert screen_ocr.tesseract_image_to_string("b") == "b"
+    assert len(created) == 1
+
+
+def test_preprocess_crops_grayscales_and_downscales():
+    pre = OCRPreprocessor(screen_dpi=192, target_dpi=96)
+    img = _frame((100, 100, 200, 150))
+    out = pre.process(img, (50, 50, 450, 250))
+    assert out.size == (200, 100)
+    assert out.mode == "L"
+    levels = {i for i, n in enumerate(out.histogram()) if n}
+    assert levels <= {0, 255}
+    stats = pre.stats()
+    assert stats["runs"] == 1
+    assert set(stats["last_ms"]) == set(OCRPreprocessor.STAGES)
+
+
+def test_preprocess_caps_width_and_ignores_empty_box():
+    pre = OCRPreprocessor(max_width=400)
+    out = pre.process(_frame(), (900, 900, 1000, 1000))
+    assert out.size == (400, 400)
+
+
+def test_monitor_crops_to_active_window():
+    monitor = SystemMonitor.__new__(SystemMonitor)
+    monitor._stop = threading.Event()
+    monitor._screenshot_thread = None
+    monitor.observer = None
+    monitor.ocr_crop = "active_window"
+    monitor.ocr_preprocessor = OCRPreprocessor()
+    monitor._get_active_window_rect = lambda: (0, 0, 300, 120)
+    assert monitor._prepare_for_ocr(_frame()).size == (300, 120)
@@ -0,0 +1,80 @@
+import os
+from datetime import datetime
+
+from activity_log import ActivityLogWriter, query_log
+from binary_log import iter_binary_log
+from snapshot_delta import DeltaEncoder, expand_deltas, is_delta
+
+
+def _snapshot(ts, **fields):
+    record = {
+        "timestamp": datetime.fromtimestamp(ts).isoformat(),
+        "active_window": {"title": "Doc", "app": "editor"},
+        "clipboard": [],
+        "open_windows": ["Doc", "Terminal", "Browser"] * 20,
+    }
+    record.update(fields)
+    return record
+
+
+def test_deltas_round_trip():
+    base = 1_700_000_000
+    records = [
+        _snapshot(base),
+        _snapshot(base + 10),
+        _snapshot(base + 20, clipboard=["hello"]),
+        _snapshot(base + 30, clipboard=["hello"], extra=1),
+        _snapshot(base + 40),
+    ]
+    encoder = DeltaEncoder(keyframe_every=3)
+    stored = [encoder.encode(r) for r in records]
+
+    assert [is_delta(r) for r in stored] == [False, True, True, False, True]
+    assert stored[1] == {"timestamp": records[1]["timestamp"], "_delta": {}}
+    assert stored[2]["_delta"] == {"clipboard": ["hello"]}
+    assert stored[4]["_removed"] == ["extra"]
+    assert list(expand_deltas(stored)) == records
+
+
+def test_deltas_before_a_keyframe_are_skipped():
+    encoder = DeltaEncoder()
+    stored = [encoder.encode(_snapshot(1_700_000_000 + i)) for i in range(3)]
+    assert list(expand_deltas(stored[1:])) == []
+
+
+def test_idle_log_stores_only_timestamps(tmp_path):
+    path = tmp_path / "log.alog"
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60, format="binary")
+    base = 1_700_000_000
+    for i in range(360):  # one hour at the default 10 s tick
+        writer.write(_snapshot(base + i * 10))
+    writer.close()
+
+    assert os.path.getsize(path) < 8 * 1024
+    assert list(iter_binary_log(path)) == [_snapshot(base + i * 10) for i in range(360)]
+
+
+def test_query_from_index_rebuilds_full_snapshots(tmp_path):
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1000, flush_interval=60, keyframe_every=100)
+    base = 1_700_000_040
+    for i in range(600):
+        writer.write(_snapshot(base + i * 10, n=i // 7))
+    writer.close()
+
+    rows = list(query_log(path, base + 1000, base + 1100))
+    assert rows == [_snapshot(base + i * 10, n=i // 7) for i in range(100, 111)]
+
+
+def test_each_rotated_segment_starts_with_a_keyframe(tmp_path):
+    path = tmp_path / "log.jsonl"
+    writer = ActivityLogWriter(path, batch_size=1, flush_interval=60, max_bytes=1000, compress=None)
+    base = 1_700_000_000
+    for i in range(30):
+        writer.write(_snapshot(base + i, n=i // 5))
+        writer.flush()
+    writer.close()
+
+    assert len(writer.segments()) >= 2
+    rows = list(query_log(path, base, base + 29, fields=["n"]))
+    assert [r["n"] for r in rows] == [i // 5 for i in range(30)]
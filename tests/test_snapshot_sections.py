@@ -0,0 +1,67 @@
+import threading
+import time
+
+from snapshot_sections import OK, STALE, UNKNOWN, SectionCollector
+
+
+def test_probes_run_in_parallel():
+    collector = SectionCollector(workers=3, default_deadline=2.0)
+
+    def slow(value):
+        def probe():
+            time.sleep(0.2)
+            return value
+        return probe
+
+    start = time.monotonic()
+    results = collector.collect({"a": slow(1), "b": slow(2), "c": slow(3)})
+    assert time.monotonic() - start < 0.5
+    assert {n: r.value for n, r in results.items()} == {"a": 1, "b": 2, "c": 3}
+    assert all(r.status == OK and r.latency >= 0.2 for r in results.values())
+    collector.shutdown()
+
+
+def test_hung_probe_is_unknown_then_stale_and_never_restarted():
+    collector = SectionCollector(workers=2, deadlines={"slow": 0.05})
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+        return "late"
+
+    first = collector.collect({"slow": hung, "fast": lambda: "x"}, {"slow": "?"})
+    assert first["slow"].status == UNKNOWN
+    assert first["slow"].value == "?"
+    assert first["slow"].latency >= 0.04
+    assert first["fast"].status == OK
+
+    second = collector.collect({"slow": hung}, {"slow": "?"})
+    assert second["slow"].status == UNKNOWN
+    assert len(calls) == 1
+    assert collector.timeouts == 2
+
+    release.set()
+    time.sleep(0.05)
+    # The late result is served while the next probe hangs
+    hang_again = threading.Event()
+    third = collector.collect({"slow": lambda: hang_again.wait(5)})
+    hang_again.set()
+    assert third["slow"].status == STALE
+    assert third["slow"].value == "late"
+    assert "age_s" in third["slow"].to_dict()
+    collector.shutdown()
+
+
+def test_failing_probe_falls_back_to_last_result():
+    collector = SectionCollector(workers=1)
+    assert collector.collect({"p": lambda: 5})["p"].value == 5
+
+    def boom():
+        raise OSError("xprop died")
+
+    result = collector.collect({"p": boom})["p"]
+    assert (result.status, result.value) == (STALE, 5)
+    assert collector.failures == 1
+    collector.shutdown()
@@ -1,8 +1,19 @@
+import tempfile
+import threading
+import time
 import unittest
-from collections import deque
 from pathlib import Path
 
+from activity_timeline import ActivityTimeline
+from cpu_governor import CpuGovernor
+from event_store import EventKind, EventStore
+from focus_time import FocusTracker
+from input_ring import InputRing
+from process_sampler import ProcessInfo
+from process_scan import ProcessScanner
+from snapshot_sections import SectionCollector
 from system_monitor import SystemMonitor
+from window_backends import SubprocessWindowBackend
 
 
 class DummyWheelEvent:
@@ -16,31 +27,74 @@ class DummyMoveEvent:
         self.event_type = "move"
 
 
+class FakeSampler:
+    def __init__(self, processes=()):
+        self.processes = list(processes)
+        self.calls = 0
+
+    def sample(self, max_age=None):
+        self.calls += 1
+        return self.processes
+
+
 class SystemMonitorTest(unittest.TestCase):
     def _make_monitor(self):
         monitor = SystemMonitor.__new__(SystemMonitor)
-        monitor.events = deque()
+        monitor.events = EventStore()
+        monitor.timeline = ActivityTimeline()
+        monitor.focus_time = None
+        monitor.collector = SectionCollector()
+        monitor.governor = CpuGovernor()
         monitor.history_seconds = 30
-        import threading
+        monitor.process_sampler = FakeSampler()
+        monitor.frame_ttl = 2.0
+        monitor._frame = None
+        monitor._frame_tick = 0
+        monitor._frame_lock = threading.Lock()
+        monitor.window_backend = SubprocessWindowBackend()
         monitor._stop = threading.Event()
         monitor._screenshot_thread = None
         monitor.observer = None
+        monitor.input_ring = InputRing()
+        monitor.input_interval = 1.0
+        monitor._input_lock = threading.Lock()
+        monitor.file_changes = None
+        monitor.process_scanner = ProcessScanner()
         return monitor
 
     def test_wheel_event_no_exception(self):
         monitor = self._make_monitor()
         event = DummyWheelEvent(delta=5)
         monitor._on_mouse(event)
+        monitor._drain_input()
         self.assertTrue(monitor.events)
-        self.assertIn("wheel", monitor.events[-1][1])
-        self.assertIn("delta=5", monitor.events[-1][1])
+        self.assertIn("wheel", monitor.events[-1].message)
+        self.assertIn("delta=5", monitor.events[-1].message)
 
     def test_move_event_no_exception(self):
         monitor = self._make_monitor()
         event = DummyMoveEvent()
         monitor._on_mouse(event)
+        monitor._drain_input()
         self.assertTrue(monitor.events)
-        self.assertIn("move", monitor.events[-1][1])
+        self.assertIn("move", monitor.events[-1].message)
+        self.assertEqual(monitor.events.count(EventKind.MOUSE_MOVE), 1)
+
+    def test_mouse_moves_are_aggregated(self):
+        monitor = self._make_monitor()
+        monitor.input_interval = 1e9  # keep all moves in one interval
+        for i in range(5):
+            event = DummyMoveEvent()
+            event.x, event.y = i, 0
+            monitor._on_mouse(event)
+        self.assertFalse(monitor.events)
+
+        monitor._get_active_window_info = lambda: ("Win", "app")
+        monitor._check_clipboard = lambda: None
+        summary = monitor.summarize()
+
+        self.assertEqual(len(monitor.events), 1)
+        self.assertIn("5 mouse moves", summary)
 
     def test_list_open_windows_pygetwindow(self):
         monitor = self._make_monitor()
@@ -75,17 +129,14 @@ class SystemMonitorTest(unittest.TestCase):
         monitor._check_clipboard = lambda: None
         monitor._append_to_log = lambda data: None
 
-        class P:
-            def __init__(self, name):
-                self.info = {"name": name}
+        monitor.process_sampler = FakeSampler([ProcessInfo(1, "app.exe")])
 
-        with unittest.mock.patch("psutil.process_iter", return_value=[P("app.exe")]), \
-             unittest.mock.patch.object(monitor, "list_open_windows", return_value=["A", "B"]):
+        with unittest.mock.patch.object(monitor, "list_open_windows", return_value=["A", "B"]):
             snap = monitor.capture_snapshot()
 
         self.assertIn("open_windows", snap)
         self.assertEqual(snap["open_windows"], ["A", "B"])
-        event = [e[1] for e in monitor.events if e[1].startswith("Open windows")][0]
+        event = monitor.events.latest(EventKind.OPEN_WINDOWS).message
         self.assertIn("A", event)
 
     def test_save_screen_memo_allow_empty_creates_file(self):
@@ -103,24 +154,12 @@ class SystemMonitorTest(unittest.TestCase):
     def test_scan_processes_monkeypatch(self):
         monitor = self._make_monitor()
 
-        class P:
-            def __init__(self, pid, name, exe):
-                self.info = {"pid": pid, "name": name, "exe": exe}
+        monitor.process_sampler = FakeSampler([
+            ProcessInfo(1, "good.exe", "/bin/good.exe"),
+            ProcessInfo(2, "bad-virus.exe", "/tmp/bad-virus.exe"),
+        ])
 
-        def fake_iter(attrs):
-            return [
-                P(1, "good.exe", "/bin/good.exe"),
-                P(2, "bad-virus.exe", "/tmp/bad-virus.exe"),
-            ]
-
-        import psutil
-
-        original_iter = psutil.process_iter
-        psutil.process_iter = fake_iter
-        try:
-            suspicious = monitor.scan_processes()
-        finally:
-            psutil.process_iter = original_iter
+        suspicious = monitor.scan_processes()
 
         names = [p["name"] for p in suspicious]
         self.assertIn("bad-virus.exe", names)
@@ -159,55 +198,41 @@ class SystemMonitorTest(unittest.TestCase):
         self.assertIsNotNone(monitor)
         importlib.reload(sm)
 
+    def test_clipboard_events_store_a_preview(self):
+        from clipboard_watch import ClipEntry
+
+        monitor = self._make_monitor()
+        monitor._get_active_window_info = lambda: ("Win", "app")
+        monitor._on_clipboard(ClipEntry("secret " * 1000))
+
+        snap = monitor.to_json()
+        self.assertEqual(len(snap["clipboard"]), 1)
+        self.assertLess(len(snap["clipboard"][0]), 250)
+        self.assertEqual(monitor.events.latest(EventKind.CLIPBOARD).payload.length, 7000)
+
     def test_summarize_high_level(self):
         monitor = self._make_monitor()
 
-        import time
-        now = time.time()
-        monitor.events.append((now, "Pressed key: a"))
-        monitor.events.append((now, "Pressed key: b"))
-        monitor.events.append((now, "Mouse move"))
-        monitor.events.append((now, "Copied text: 'hello'"))
+        monitor._record(EventKind.KEY, "a")
+        monitor._record(EventKind.KEY, "b")
+        monitor._record(EventKind.MOUSE_MOVE, "move")
+        monitor._record(EventKind.CLIPBOARD, "hello")
 
         monitor._get_active_window_info = lambda: ("File.txt - Notepad", "notepad.exe")
         monitor._check_clipboard = lambda: None
 
-        class P:
-            def __init__(self, name, cpu=0, mem=0):
-                self.info = {"name": name}
-                self._cpu = cpu
-                self._mem = mem
-
-            def cpu_percent(self, interval=None):
-                return self._cpu
-
-            class Mem:
-                def __init__(self, rss):
-                    self.rss = rss
-
-            def memory_info(self):
-                return self.Mem(self._mem)
-
-        def fake_iter(attrs=None):
-            return [
-                P("System"),
-                P("smss.exe", cpu=10),
-                P("lsass.exe", cpu=7),
-                P("notepad.exe", cpu=1),
-                P("csrss.exe", cpu=5),
-                P("chrome.exe", cpu=15),
-                P("", cpu=0),
-                P("calc.exe", cpu=20),
-            ]
-
-        import psutil
-
-        original_iter = psutil.process_iter
-        psutil.process_iter = fake_iter
-        try:
-            summary = monitor.summarize()
-        finally:
-            psutil.process_iter = original_iter
+        monitor.process_sampler = FakeSampler([
+            ProcessInfo(1, "System"),
+            ProcessInfo(2, "smss.exe", cpu_percent=10),
+            ProcessInfo(3, "lsass.exe", cpu_percent=7),
+            ProcessInfo(4, "notepad.exe", cpu_percent=1),
+            ProcessInfo(5, "csrss.exe", cpu_percent=5),
+            ProcessInfo(6, "chrome.exe", cpu_percent=15),
+            ProcessInfo(7, "", cpu_percent=0),
+            ProcessInfo(8, "calc.exe", cpu_percent=20),
+        ])
+
+        summary = monitor.summarize()
 
         self.assertIn("File.txt - Notepad", summary)
         self.assertIn("2 keys pressed", summary)
@@ -220,6 +245,63 @@ class SystemMonitorTest(unittest.TestCase):
         self.assertNotIn("csrss.exe", summary)
         self.assertNotIn("lsass.exe", summary)
 
+    def test_summarize_ranks_cpu_above_memory(self):
+        monitor = self._make_monitor()
+        monitor._get_active_window_info = lambda: ("Win", "app.exe")
+        monitor._check_clipboard = lambda: None
+        monitor.list_open_windows = lambda: []
+        monitor.process_sampler = FakeSampler([
+            ProcessInfo(1, "idle-big.exe", cpu_percent=0.0, rss=100 * 1024 * 1024),
+            ProcessInfo(2, "busy.exe", cpu_percent=90.0, rss=1024),
+            ProcessInfo(3, "idle-small.exe", cpu_percent=0.0, rss=2048),
+        ])
+
+        summary = monitor.summarize()
+
+        self.assertIn("Running apps: busy.exe, idle-big.exe, and 1 other.", summary)
+
+    def test_status_probes_once_per_frame(self):
+        monitor = self._make_monitor()
+        calls = {"window": 0, "list": 0}
+
+        def active_window():
+            calls["window"] += 1
+            return ("Win", "app.exe")
+
+        def list_windows():
+            calls["list"] += 1
+            return ["A"]
+
+        monitor._get_active_window_info = active_window
+        monitor.list_open_windows = list_windows
+        monitor._extract_ui_text = lambda: []
+        monitor._check_clipboard = lambda: None
+        monitor._append_to_log = lambda data: None
+
+        snap = monitor.capture_snapshot()
+        summary = monitor.summarize()
+
+        self.assertEqual(snap["open_windows"], ["A"])
+        self.assertIn("Focused window: Win (app.exe).", summary)
+        self.assertEqual(calls, {"window": 1, "list": 1})
+        self.assertEqual(monitor.process_sampler.calls, 1)
+
+        monitor.invalidate_frame()
+        monitor.summarize()
+        self.assertEqual(calls, {"window": 2, "list": 2})
+
+    def test_frame_expires_after_ttl(self):
+        monitor = self._make_monitor()
+        monitor.frame_ttl = 0
+        monitor._get_active_window_info = lambda: ("Win", "app.exe")
+        monitor.list_open_windows = lambda: []
+        monitor._check_clipboard = lambda: None
+
+        first = monitor.current_frame()
+        second = monitor.current_frame()
+
+        self.assertEqual(second.tick, first.tick + 1)
+
     def test_capture_snapshot_filters_and_sorts_processes(self):
         monitor = self._make_monitor()
         monitor._get_active_window_info = lambda: ("Win", "app.exe")
@@ -227,45 +309,119 @@ class SystemMonitorTest(unittest.TestCase):
         monitor._check_clipboard = lambda: None
         monitor._append_to_log = lambda data: None
 
-        import psutil
-
-        class P:
-            def __init__(self, name, cpu=0, mem=0):
-                self.info = {"name": name}
-                self._cpu = cpu
-                self._mem = mem
-
-            def cpu_percent(self, interval=None):
-                return self._cpu
-
-            class Mem:
-                def __init__(self, rss):
-                    self.rss = rss
-
-            def memory_info(self):
-                return self.Mem(self._mem)
-
-        def fake_iter(attrs=None):
-            return [
-                P("System"),
-                P("lsass.exe", cpu=50, mem=500),
-                P("Registry"),
-                P(""),
-                P("chrome.exe", cpu=10, mem=200),
-                P("notes.exe", cpu=20, mem=100),
-            ]
-
-        original_iter = psutil.process_iter
-        psutil.process_iter = fake_iter
-        try:
-            monitor.capture_snapshot(sort_by="cpu")
-        finally:
-            psutil.process_iter = original_iter
-
-        run_event = [e[1] for e in monitor.events if e[1].startswith("Running apps")][0]
+        monitor.process_sampler = FakeSampler([
+            ProcessInfo(1, "System"),
+            ProcessInfo(2, "lsass.exe", cpu_percent=50, rss=500),
+            ProcessInfo(3, "Registry"),
+            ProcessInfo(4, ""),
+            ProcessInfo(5, "chrome.exe", cpu_percent=10, rss=200),
+            ProcessInfo(6, "notes.exe", cpu_percent=20, rss=100),
+        ])
+
+        monitor.capture_snapshot(sort_by="cpu")
+
+        run_event = monitor.events.latest(EventKind.RUNNING_APPS).message
         names_list = eval(run_event[len("Running apps: "):])
         self.assertEqual(names_list, ["notes.exe", "chrome.exe"])
 
+    def test_snapshot_rolls_up_processes_per_app(self):
+        monitor = self._make_monitor()
+        monitor._get_active_window_info = lambda: ("Win", "app.exe")
+        monitor.list_open_windows = lambda: []
+        monitor._extract_ui_text = lambda: []
+        monitor._append_to_log = lambda data: None
+        monitor.process_sampler = FakeSampler(
+            [ProcessInfo(1, "explorer.exe", "C:/explorer.exe", cpu_percent=1)]
+            + [ProcessInfo(10 + i, "chrome.exe", "C:/chrome.exe", cpu_percent=3, rss=10) for i in range(40)]
+        )
+
+        snap = monitor.capture_snapshot(sort_by="cpu")
+        summary = monitor.summarize()
+
+        self.assertEqual(snap["apps"][0], {
+            "name": "chrome.exe", "exe": "C:/chrome.exe", "processes": 40, "cpu_percent": 120.0, "rss": 400,
+        })
+        self.assertEqual(len(snap["apps"]), 2)
+        self.assertIn("Running apps: chrome.exe, explorer.exe.", summary)
+
+    def test_activity_rate_counts_drained_input(self):
+        monitor = self._make_monitor()
+        for name in "hello":
+            monitor._on_keyboard(type("Key", (), {"name": name})())
+        monitor._record(EventKind.ACTIVE_WINDOW, "A (a)")
+        monitor._record(EventKind.ACTIVE_WINDOW, "B (b)")
+
+        self.assertAlmostEqual(monitor.activity_rate("keys", window=60), 5.0)
+        self.assertAlmostEqual(monitor.activity_rate("focus", window=60), 1.0)
+        # Idle until the keys were pressed, active since
+        idle = monitor.idle_periods(window=60, min_idle=30)
+        self.assertEqual(len(idle), 1)
+        self.assertLessEqual(idle[0][1], monitor.events.latest(EventKind.KEY).timestamp)
+
+    def test_focus_report_from_frames(self):
+        monitor = self._make_monitor()
+        monitor.list_open_windows = lambda: []
+        with tempfile.TemporaryDirectory() as tmp:
+            monitor.focus_time = FocusTracker(Path(tmp) / "focus.db")
+            for window in [("a.txt", "editor"), ("b.txt", "editor"), ("Inbox", "mail")]:
+                monitor._get_active_window_info = lambda w=window: w
+                monitor.invalidate_frame()
+                monitor.current_frame()
+                time.sleep(0.01)
+
+            by_app = dict(monitor.focus_report("today"))
+            by_title = dict(monitor.focus_report("week", by="title"))
+            monitor.focus_time.close()
+
+        self.assertEqual(set(by_app), {"editor", "mail"})
+        self.assertGreater(by_app["editor"], 0.015)
+        self.assertEqual(set(by_title), {"a.txt", "b.txt", "Inbox"})
+
+    def test_hung_probe_does_not_stall_snapshot(self):
+        monitor = self._make_monitor()
+        monitor.collector = SectionCollector(workers=4, deadlines={"active_window": 0.1})
+        release = threading.Event()
+
+        def hung_window():
+            release.wait(5)
+            return ("Late", "late.exe")
+
+        monitor._get_active_window_info = hung_window
+        monitor.list_open_windows = lambda: ["A"]
+        monitor._append_to_log = lambda data: None
+
+        start = time.monotonic()
+        snap = monitor.capture_snapshot()
+        release.set()
+        monitor.collector.shutdown()
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(snap["stale"])
+        self.assertEqual(snap["active_window"], {"title": "Unknown Window", "app": "Unknown App"})
+        self.assertEqual(snap["sections"]["active_window"]["status"], "unknown")
+        self.assertEqual(snap["sections"]["open_windows"]["status"], "ok")
+        self.assertEqual(snap["open_windows"], ["A"])
+
+    def test_governor_scales_stretch_collectors(self):
+        monitor = self._make_monitor()
+        monitor._get_active_window_info = lambda: ("Win", "app.exe")
+        monitor.list_open_windows = lambda: []
+        ages = []
+        monitor.process_sampler.sample = lambda max_age=None: ages.append(max_age) or []
+
+        monitor.current_frame()
+        monitor.governor.scales.update(processes=4, windows=8)
+        monitor.invalidate_frame()
+        frame = monitor.current_frame()
+        monitor._frame.created -= monitor.frame_ttl * 2
+        self.assertIs(monitor.current_frame(), frame)
+
+        self.assertEqual(ages, [None, monitor.frame_ttl * 4])
+        report = monitor.cost_breakdown()
+        self.assertEqual(report["collectors"]["windows"]["calls"], 4)
+        self.assertEqual(report["collectors"]["processes"]["calls"], 2)
+        self.assertEqual(report["scales"]["windows"], 8)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+import window_backends
+from activity_timeline import ActivityTimeline
+from cpu_governor import CpuGovernor
+from event_store import EventKind, EventStore
+from snapshot_sections import SectionCollector
+from system_monitor import SystemMonitor
+from window_backends import SubprocessWindowBackend
+
+
+def test_subprocess_backend_parses_xprop_with_timeout(monkeypatch):
+    outputs = {
+        ("xprop", "-root", "_NET_ACTIVE_WINDOW"): "_NET_ACTIVE_WINDOW(WINDOW): window id # 0x3a00007\n",
+        ("xprop", "-id", "0x3a00007", "_NET_WM_PID"): "_NET_WM_PID(CARDINAL) = 4242\n",
+        ("xprop", "-id", "0x3a00007", "WM_NAME"): 'WM_NAME(STRING) = "notes.txt - editor"\n',
+    }
+    timeouts = []
+
+    def fake_check_output(cmd, text=True, timeout=None):
+        timeouts.append(timeout)
+        return outputs[tuple(cmd)]
+
+    monkeypatch.setattr(window_backends.sys, "platform", "linux")
+    monkeypatch.setattr(window_backends.subprocess, "check_output", fake_check_output)
+
+    backend = SubprocessWindowBackend(timeout=0.5)
+    assert backend.active_window() == ("notes.txt - editor", None, 4242)
+    assert timeouts == [0.5, 0.5, 0.5]
+
+
+class FakeBackend:
+    def __init__(self):
+        self.title = "First"
+        self.callback = None
+
+    def active_window(self):
+        return self.title, "editor", None
+
+    def list_windows(self):
+        return [self.title, "Other"]
+
+    def watch(self, callback):
+        self.callback = callback
+
+
+def _make_monitor(backend):
+    monitor = SystemMonitor.__new__(SystemMonitor)
+    monitor.events = EventStore()
+    monitor.timeline = ActivityTimeline()
+    monitor.focus_time = None
+    monitor.collector = SectionCollector()
+    monitor.governor = CpuGovernor()
+    monitor.history_seconds = 30
+    monitor.process_sampler = mock.Mock(sample=lambda max_age=None: [])
+    monitor.frame_ttl = 60
+    monitor._frame = None
+    monitor._frame_tick = 0
+    monitor._frame_lock = threading.Lock()
+    monitor.window_backend = backend
+    monitor._stop = threading.Event()
+    monitor._screenshot_thread = None
+    monitor.observer = None
+    monitor._check_clipboard = lambda: None
+    backend.watch(monitor._on_focus_change)
+    return monitor
+
+
+def test_monitor_reads_backend_and_reacts_to_pushed_focus(monkeypatch):
+    import system_monitor
+
+    monkeypatch.setattr(system_monitor, "gw", None)
+    monkeypatch.setattr(system_monitor.sys, "platform", "linux")
+    backend = FakeBackend()
+    monitor = _make_monitor(backend)
+
+    assert monitor.current_frame().title == "First"
+    assert monitor.list_open_windows() == ["First", "Other"]
+
+    backend.title = "Second"
+    backend.callback()
+
+    assert monitor.current_frame().title == "Second"
+    assert monitor.events.latest(EventKind.ACTIVE_WINDOW).payload == "Second (editor)"
+
+
+@pytest.mark.skipif(
+    window_backends.xdisplay is None or not os.getenv("DISPLAY"),
+    reason="requires python-xlib and an X server (e.g. Xvfb)",
+)
+def test_x11_backend_against_live_display():
+    backend = window_backends.X11WindowBackend()
+    try:
+        assert isinstance(backend.list_windows(), list)
+        info = backend.active_window()
+        assert info is None or len(info) == 3
+    finally:
+        backend.close()
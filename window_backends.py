@@ -0,0 +1,226 @@
+"""Platform backends that report the active window and the window list."""
+
+import os
+import re
+import select
+import subprocess
+import sys
+import threading
+
+try:
+    from Xlib import X, display as xdisplay
+except Exception:  # noqa: E722 - broadly handle any import problem
+    X = None
+    xdisplay = None
+
+# Probes run on every snapshot, so a hung helper must never stall the monitor
+PROBE_TIMEOUT = 2.0
+
+
+class SubprocessWindowBackend:
+    """Query windows by running ``xprop``/``wmctrl`` or ``osascript``."""
+
+    def __init__(self, timeout: float = PROBE_TIMEOUT):
+        self.timeout = timeout
+
+    def _run(self, cmd):
+        return subprocess.check_output(cmd, text=True, timeout=self.timeout)
+
+    def active_window(self):
+        """Return ``(title, app, pid)`` for the focused window or ``None``.
+
+        ``app`` is ``None`` when only the PID is known.
+        """
+        if sys.platform.startswith("linux"):
+            active = self._run(["xprop", "-root", "_NET_ACTIVE_WINDOW"])
+            m = re.search(r"window id # (0x[0-9a-fA-F]+)", active)
+            if not m:
+                return None
+            wid = m.group(1)
+            pid_out = self._run(["xprop", "-id", wid, "_NET_WM_PID"])
+            pid = int(pid_out.strip().split()[-1])
+            title_out = self._run(["xprop", "-id", wid, "WM_NAME"])
+            title = title_out.split("=", 1)[-1].strip().strip('"')
+            return title, None, pid
+        if sys.platform == "darwin":
+            script_app = (
+                'tell application "System Events" to get name of first '
+                'process whose frontmost is true'
+            )
+            app = self._run(["osascript", "-e", script_app]).strip()
+            script_title = (
+                'tell application "System Events" to tell (process 1 whose '
+                'frontmost is true) to get title of front window'
+            )
+            title = self._run(["osascript", "-e", script_title]).strip()
+            return title, app or None, None
+        return None
+
+    def list_windows(self):
+        """Return the titles of all top-level windows."""
+        titles = []
+        if sys.platform.startswith("linux"):
+            out = self._run(["wmctrl", "-l"])
+            for line in out.splitlines():
+                parts = line.split(None, 3)
+                if len(parts) == 4:
+                    titles.append(parts[3])
+        elif sys.platform == "darwin":
+            script = (
+                'tell application "System Events" to get the title of every window of every process whose visible is true'
+            )
+            out = self._run(["osascript", "-e", script])
+            for t in out.strip().split(", "):
+                if t and t != "missing value":
+                    titles.append(t)
+        return titles
+
+
+class X11WindowBackend:
+    """Read EWMH properties over one persistent X connection.
+
+    The connection is opened once and reused for every probe. ``watch`` opens a
+    second connection on a background thread and subscribes to
+    ``PropertyNotify`` on the root window, so focus changes are pushed to the
+    callback instead of being discovered by polling. Any X error falls back to
+    ``fallback`` (the subprocess backend by default).
+    """
+
+    def __init__(self, display_name=None, fallback=None):
+        if xdisplay is None:
+            raise RuntimeError("python-xlib is not installed")
+        self._display_name = display_name
+        self._display = xdisplay.Display(display_name)
+        self._root = self._display.screen().root
+        self._lock = threading.Lock()
+        self.fallback = fallback if fallback is not None else SubprocessWindowBackend()
+        self._atoms = {
+            name: self._display.intern_atom(name)
+            for name in (
+                "_NET_ACTIVE_WINDOW",
+                "_NET_CLIENT_LIST",
+                "_NET_WM_NAME",
+                "_NET_WM_PID",
+                "UTF8_STRING",
+            )
+        }
+        self._stop = threading.Event()
+        self._watch_thread = None
+
+    def _title(self, win):
+        prop = win.get_full_property(self._atoms["_NET_WM_NAME"], self._atoms["UTF8_STRING"])
+        if prop is not None and prop.value:
+            value = prop.value
+            return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+        name = win.get_wm_name()
+        if isinstance(name, bytes):
+            name = name.decode("latin-1", "replace")
+        return name or ""
+
+    def _active_id(self):
+        prop = self._root.get_full_property(self._atoms["_NET_ACTIVE_WINDOW"], X.AnyPropertyType)
+        if prop is None or not prop.value:
+            return None
+        return prop.value[0] or None
+
+    def active_window(self):
+        """Return ``(title, None, pid)`` for the focused window or ``None``."""
+        try:
+            with self._lock:
+                wid = self._active_id()
+                if wid is None:
+                    return None
+                win = self._display.create_resource_object("window", wid)
+                title = self._title(win)
+                prop = win.get_full_property(self._atoms["_NET_WM_PID"], X.AnyPropertyType)
+                pid = int(prop.value[0]) if prop is not None and prop.value else None
+            return title, None, pid
+        except Exception:
+            return self.fallback.active_window()
+
+    def active_window_rect(self):
+        """Return ``(left, top, right, bottom)`` of the focused window or ``None``."""
+        try:
+            with self._lock:
+                wid = self._active_id()
+                if wid is None:
+                    return None
+                win = self._display.create_resource_object("window", wid)
+                geom = win.get_geometry()
+                pos = win.translate_coords(self._root, 0, 0)
+                left, top = -pos.x, -pos.y
+                return left, top, left + geom.width, top + geom.height
+        except Exception:
+            return None
+
+    def list_windows(self):
+        """Return titles of the windows in ``_NET_CLIENT_LIST``."""
+        try:
+            with self._lock:
+                prop = self._root.get_full_property(self._atoms["_NET_CLIENT_LIST"], X.AnyPropertyType)
+                ids = list(prop.value) if prop is not None else []
+                return [
+                    self._title(self._display.create_resource_object("window", wid))
+                    for wid in ids
+                ]
+        except Exception:
+            return self.fallback.list_windows()
+
+    def watch(self, callback):
+        """Call ``callback()`` from a background thread whenever focus changes."""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        self._stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, args=(callback,), daemon=True
+        )
+        self._watch_thread.start()
+
+    def _watch_loop(self, callback):
+        try:
+            conn = xdisplay.Display(self._display_name)
+            root = conn.screen().root
+            active_atom = conn.intern_atom("_NET_ACTIVE_WINDOW")
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+        except Exception:
+            return
+        try:
+            while not self._stop.is_set():
+                # Wait on the socket so ``close`` can stop the thread promptly
+                if not conn.pending_events():
+                    select.select([conn.fileno()], [], [], 0.5)
+                    if not conn.pending_events():
+                        continue
+                event = conn.next_event()
+                if event.type == X.PropertyNotify and event.atom == active_atom:
+                    try:
+                        callback()
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """Stop watching and release the X connection."""
+        self._stop.set()
+        if self._watch_thread:
+            self._watch_thread.join(timeout=1)
+        try:
+            self._display.close()
+        except Exception:
+            pass
+
+
+def default_window_backend():
+    """Return the best available backend for this platform."""
+    if sys.platform.startswith("linux") and xdisplay is not None and os.getenv("DISPLAY"):
+        try:
+            return X11WindowBackend()
+        except Exception:
+            pass
+    return SubprocessWindowBackend()